@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Compares sales analytics computed with GROUP BY queries over covering indexes (analytics.sales_analytics())
+With summing up all sale line items in Python (view_sales_in_period() rows), for every time bucket.
+
+Run from project root folder: python3 -m benchmarks.bench_analytics --sales 200000
+"""
+from coffee_for_me.functions.analytics import sales_analytics
+from coffee_for_me.functions.connection_pool import close_pools
+from coffee_for_me.functions.db_funcs import create_table, record_sales_batch, view_sales_in_period
+import argparse
+import os
+import random
+import tempfile
+import time
+
+
+def fill_database(sales):
+    random.seed(1)
+    batch = []
+    for number in range(sales):
+        items = [('beverage', random.choice(('tea', 'coffee', 'water', 'soda')), random.randint(100, 500))]
+        if random.random() < 0.4:
+            items.append(('addition', random.choice(('sugar', 'milk', 'cinnamon')), random.randint(50, 150)))
+        sold_at = '2020-{:02d}-{:02d} {:02d}:{:02d}:00.000'.format(number % 12 + 1, number % 28 + 1, number % 24,
+                                                                   number % 60)
+        batch.append(('Seller {}'.format(number % 20), items, sold_at))
+        if len(batch) == 10000:
+            record_sales_batch(batch)
+            batch = []
+    record_sales_batch(batch)
+
+
+def python_analytics(period):
+    """Sums up sale line items selected from database in Python, the way it would be done without GROUP BY."""
+    bucket_length = {'hour': 13, 'day': 10}[period]
+    revenue, items, salespeople = {}, {}, {}
+    for name, sold_at, kind, item, price in view_sales_in_period('0000', '9999'):
+        bucket = sold_at[:bucket_length]
+        revenue[bucket] = revenue.get(bucket, 0) + price
+        items[kind, item] = items.get((kind, item), 0) + 1
+        salespeople[name, bucket] = salespeople.get((name, bucket), 0) + price
+    return revenue, items, salespeople
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='sales analytics benchmark')
+    parser.add_argument('--sales', type=int, default=200000, help='number of sales in database')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        create_table()
+        fill_database(args.sales)
+        print('{:>6} | {:>14} | {:>14}'.format('period', 'GROUP BY ms', 'python ms'))
+        for period in ('hour', 'day'):
+            print('{:>6} | {:>14.1f} | {:>14.1f}'.format(period, measure(sales_analytics, period),
+                                                         measure(python_analytics, period)))
+        print('{:>6} | {:>14.1f} | {:>14}'.format('week', measure(sales_analytics, 'week'), '-'))
+        close_pools()
+
+
+if __name__ == '__main__':
+    main()
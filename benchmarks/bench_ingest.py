@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Measures batch sale ingestion throughput (sales per second) of 'python coffee_for_me ingest' command.
+Sales are generated to csv file first, file generation is not measured.
+
+Run from project root folder: python3 -m benchmarks.bench_ingest
+"""
+from coffee_for_me.functions.db_funcs import create_table
+from coffee_for_me.functions.ingest import ingest_file
+import argparse
+import os
+import tempfile
+import time
+
+
+def generate_sales(file_name, sales, salespeople):
+    """Writes csv file with sales: every second sale has an addition."""
+    with open(file_name, 'w') as f:
+        f.write('salesperson,beverage,beverage_price,addition,addition_price,sold_at\n')
+        for i in range(sales):
+            addition = 'sugar,1.5' if i % 2 else ','
+            f.write('Seller{},tea,4.0,{},2020-01-02 10:00:{:06.3f}\n'.format(i % salespeople, addition, i % 60))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='batch sale ingestion benchmark')
+    parser.add_argument('--sales', type=int, default=100000, help='number of ingested sales')
+    parser.add_argument('--salespeople', type=int, default=10, help='number of salespeople')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                        help='batch sizes to measure')
+    args = parser.parse_args()
+
+    print('{:>12} | {:>12} | {:>14}'.format('batch size', 'seconds', 'sales per sec'))
+    for batch_size in args.batch_sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            create_table()
+            generate_sales('sales.csv', args.sales, args.salespeople)
+            start = time.perf_counter()
+            ingest_file('sales.csv', ['Tea'], ['Sugar'], batch_size=batch_size)
+            elapsed = time.perf_counter() - start
+            print('{:>12} | {:>12.3f} | {:>14.0f}'.format(batch_size, elapsed, args.sales / elapsed))
+
+
+if __name__ == '__main__':
+    main()
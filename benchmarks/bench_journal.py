@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Compares summing up salesperson's totals from text records file (regex parsing every line)
+And from binary sales journal (memory-mapped, summed up without unpacking records).
+
+Run from project root folder: python3 -m benchmarks.bench_journal
+"""
+from coffee_for_me.functions.journal import SalesJournal, convert_records_file
+from coffee_for_me.functions.sales_totals import rebuild_totals
+import argparse
+import os
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='text records file vs binary journal totals benchmark')
+    parser.add_argument('--records', type=int, default=1000000, help='number of sale records')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        records_file = os.path.join(tmp_dir, 'records.txt')
+        journal_file = os.path.join(tmp_dir, 'journal.bin')
+        with open(records_file, 'w') as f:
+            for _ in range(args.records // 2):
+                f.write('Beverage: tea. Price: 4.0$\nAddition: sugar. Price: 1.5$\n')
+
+        start = time.perf_counter()
+        convert_records_file(records_file, journal_file)
+        print('converted {} records to journal in {:.3f}s'.format(args.records, time.perf_counter() - start))
+
+        start = time.perf_counter()
+        text_totals = rebuild_totals(records_file)
+        text_time = time.perf_counter() - start
+        start = time.perf_counter()
+        journal_totals = SalesJournal(journal_file).totals()
+        journal_time = time.perf_counter() - start
+
+        print('{:>8} | {:>12} | {:>10} | {:>12}'.format('storage', 'file MB', 'seconds', 'amount $'))
+        print('{:>8} | {:>12.1f} | {:>10.3f} | {:>12}'.format('text', os.path.getsize(records_file) / 2 ** 20,
+                                                            text_time, text_totals['amount_cents'] / 100))
+        print('{:>8} | {:>12.1f} | {:>10.3f} | {:>12}'.format('journal', os.path.getsize(journal_file) / 2 ** 20,
+                                                            journal_time, journal_totals['amount_cents'] / 100))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Compares summing up salesperson's records file the way Salesperson.total_sales_amount() and count_sales() did
+(re.findall() with a pattern string and float prices for every line, plus counting kinds in the whole file text)
+With records_parser pipeline used by rebuild_totals() (precompiled pattern, cached prices in integer cents).
+
+Run from project root folder: python3 -m benchmarks.bench_records_parser
+"""
+from coffee_for_me.functions.functions import match_price
+from coffee_for_me.functions.sales_totals import rebuild_totals
+import argparse
+import os
+import tempfile
+import time
+
+
+def legacy_totals(records_file):
+    """Sums up records file like Salesperson.total_sales_amount() and count_sales() did."""
+    with open(records_file) as f:
+        total_price = []
+        for line in f:
+            match_price(total_price, r'[-+]?\d*\.\d+|\d+', line)
+        amount = round(sum(total_price), 2)
+    with open(records_file) as f:
+        contents = f.read()
+        sales = contents.count('Beverage') + contents.count('Addition')
+    return sales, amount
+
+
+def main():
+    parser = argparse.ArgumentParser(description='records file parsing benchmark')
+    parser.add_argument('--lines', type=int, default=1000000, help='number of lines in records file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        records_file = os.path.join(tmp_dir, 'records.txt')
+        with open(records_file, 'w') as f:
+            for i in range(args.lines // 2):
+                f.write('Beverage: tea. Price: {}.{}$\nAddition: sugar. Price: 0.1$\n'.format(i % 5 + 1, i % 10))
+
+        start = time.perf_counter()
+        sales, amount = legacy_totals(records_file)
+        legacy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        totals = rebuild_totals(records_file)
+        parser_time = time.perf_counter() - start
+
+        print('{:>8} | {:>10} | {:>10} | {:>16}'.format('parser', 'seconds', 'sales', 'amount $'))
+        print('{:>8} | {:>10.3f} | {:>10} | {:>16}'.format('legacy', legacy_time, sales, amount))
+        print('{:>8} | {:>10.3f} | {:>10} | {:>16}'.format('records', parser_time,
+                                                           totals['beverages'] + totals['additions'],
+                                                           totals['amount_cents'] / 100))
+
+
+if __name__ == '__main__':
+    main()
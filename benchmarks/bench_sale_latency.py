@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Measures Salesperson.make_sale() latency while salesperson's records file grows.
+Per-sale latency should stay flat: records file is only appended to and never read back.
+
+Run from project root folder: python3 -m benchmarks.bench_sale_latency
+"""
+from coffee_for_me.employees.salesperson import Salesperson
+from coffee_for_me.functions.db_funcs import create_table
+from contextlib import redirect_stdout
+from unittest import mock
+import argparse
+import io
+import os
+import tempfile
+import time
+
+
+def grow_records_file(file_name, lines):
+    """Appends sale records to salesperson's records file."""
+    with open(file_name, 'a') as f:
+        for _ in range(lines // 2):
+            f.write('Beverage: tea. Price: 4.0$\nAddition: sugar. Price: 1.5$\n')
+
+
+def measure_sales(salesperson, sales):
+    """Returns average make_sale() latency in milliseconds."""
+    answers = [1, 'tea', 4, 'sugar', 1.5] * sales
+    with mock.patch('builtins.input', side_effect=answers), redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(sales):
+            salesperson.make_sale(['Tea'], ['Sugar'])
+        return (time.perf_counter() - start) * 1000 / sales
+
+
+def main():
+    parser = argparse.ArgumentParser(description='make_sale() latency benchmark')
+    parser.add_argument('--sales', type=int, default=200, help='number of measured sales per file size')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 10000, 100000, 1000000],
+                        help='records file sizes (lines) to measure at')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        create_table()
+        salesperson = Salesperson('Bench', 'Salesperson', ['Tea'], ['Sugar'])
+        lines = 0
+        print('{:>12} | {:>18}'.format('file lines', 'ms per sale'))
+        for size in args.sizes:
+            grow_records_file(salesperson.records_file, max(size - lines, 0))
+            lines = max(size, lines)
+            measure_sales(salesperson, 1)  # running totals are rebuilt once after the file was grown
+            latency = measure_sales(salesperson, args.sales)
+            lines += (args.sales + 1) * 2  # beverage and addition record lines per sale
+            print('{:>12} | {:>18.3f}'.format(size, latency))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Load generator for sales server ('serve' command): many clients send sales at the same time,
+Every client waits for its sale to be confirmed before sending the next one. Prints sales per second
+For every number of clients. Without --server a sales server with sqlite store is started in a temporary folder
+For every batch size, so group commit (batch size > 1) can be compared with a transaction per sale (batch size 1).
+
+Run from project root folder: python3 -m benchmarks.bench_server
+Or against a running server: python3 -m benchmarks.bench_server --server 127.0.0.1:8765
+"""
+from coffee_for_me.functions.connection_pool import configure_pools, default_pragmas
+from coffee_for_me.server.sales_server import SalesServer, parse_address, encode_message
+from coffee_for_me.store.sqlite_store import SqliteStore
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+
+sale_records = ['Beverage: tea. Price: 4.0$', 'Addition: sugar. Price: 1.5$']
+
+
+async def client(address, name, sales):
+    host, port = parse_address(address)
+    if port is None:
+        reader, writer = await asyncio.open_unix_connection(host)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    for number in range(sales):
+        writer.write(encode_message({'id': number, 'op': 'record_sale', 'fullname': name, 'records': sale_records}))
+        response = json.loads((await reader.readline()).decode())
+        if 'error' in response:
+            raise IOError(response['error'])
+    writer.close()
+
+
+def measure(address, clients, sales):
+    """float: Get sales per second recorded by sales server for the given number of clients"""
+    loop = asyncio.new_event_loop()
+    start = time.perf_counter()
+    tasks = [loop.create_task(client(address, 'Bench {}'.format(i), sales)) for i in range(clients)]
+    loop.run_until_complete(asyncio.wait(tasks))
+    for task in tasks:
+        task.result()  # raises client error, if any
+    elapsed = time.perf_counter() - start
+    loop.close()
+    return clients * sales / elapsed
+
+
+def start_server(address, batch_size):
+    """Starts sales server with sqlite store in a background thread, returns function stopping it."""
+    loop = asyncio.new_event_loop()
+    server = SalesServer(SqliteStore(), batch_size)
+    loop.run_until_complete(server.start(address))
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+
+    def stop():
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.run_until_complete(server.stop())
+        loop.close()
+    return stop
+
+
+def main():
+    parser = argparse.ArgumentParser(description='sales server throughput benchmark')
+    parser.add_argument('--server', type=str, default=None, help='address of running sales server')
+    parser.add_argument('--clients', type=lambda x: [int(n) for n in x.split(',')], default=[1, 10, 50],
+                        help='comma separated numbers of concurrent clients')
+    parser.add_argument('--sales', type=int, default=200, help='number of sales sent by every client')
+    parser.add_argument('--batch-size', type=lambda x: [int(n) for n in x.split(',')], default=[1, 1000],
+                        help='comma separated server batch sizes')
+    args = parser.parse_args()
+
+    print('{:>10} | {:>8} | {:>14}'.format('batch size', 'clients', 'sales per sec'))
+    if args.server:
+        for clients in args.clients:
+            print('{:>10} | {:>8} | {:>14.0f}'.format('-', clients, measure(args.server, clients, args.sales)))
+        return
+    for batch_size in args.batch_size:
+        for clients in args.clients:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                os.chdir(tmp_dir)
+                configure_pools(pragmas=default_pragmas)
+                stop = start_server(os.path.join(tmp_dir, 'sales.sock'), batch_size)
+                try:
+                    rate = measure(os.path.join(tmp_dir, 'sales.sock'), clients, args.sales)
+                finally:
+                    stop()
+                print('{:>10} | {:>8} | {:>14.0f}'.format(batch_size, clients, rate))
+
+
+if __name__ == '__main__':
+    main()
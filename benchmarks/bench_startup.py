@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Measures cold start time of the app for every role with 'python -X importtime'.
+Every run starts a new interpreter in an empty folder and quits at the first prompt.
+Import time is the sum of top level imports reported by -X importtime, wall time includes interpreter start.
+
+Run from project root folder: python3 -m benchmarks.bench_startup
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# role to command line arguments and user input
+roles = {
+    'salesperson': (['Tony', 'Salesperson', '-bev=Tea', '-add=Sugar'], '2\n'),
+    'manager': (['Anna', 'Manager'], '2\n'),
+    'invalid position': (['Bob', 'Cook'], ''),
+    'report command': (['report'], ''),
+    'help': (['-h'], ''),
+}
+
+
+def parse_importtime(stderr):
+    """Returns total import time in milliseconds and imported app modules from -X importtime output."""
+    total_us = 0
+    app_modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if not name.startswith('  '):  # top level import, its cumulative time includes nested imports
+            total_us += int(cumulative)
+        if name.strip().startswith('coffee_for_me'):
+            app_modules.add(name.strip())
+    return total_us / 1000, app_modules
+
+
+def measure_role(args, user_input, runs):
+    """Returns median wall time, median import time (milliseconds) and imported app modules of a role."""
+    env = dict(os.environ, PYTHONPATH=project_root)
+    walls, imports, app_modules = [], [], set()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'coffee_for_me'] + args,
+                                    input=user_input, cwd=tmp_dir, env=env, universal_newlines=True,
+                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            walls.append((time.perf_counter() - start) * 1000)
+            import_ms, app_modules = parse_importtime(result.stderr)
+            imports.append(import_ms)
+    return statistics.median(walls), statistics.median(imports), app_modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description='app cold start benchmark')
+    parser.add_argument('--runs', type=int, default=5, help='number of runs per role')
+    args = parser.parse_args()
+
+    print('{:>18} | {:>12} | {:>14} | {:>12}'.format('role', 'wall ms', 'imports ms', 'app modules'))
+    for role, (role_args, user_input) in roles.items():
+        wall, imports, app_modules = measure_role(role_args, user_input, args.runs)
+        print('{:>18} | {:>12.1f} | {:>14.1f} | {:>12}'.format(role, wall, imports, len(app_modules)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Compares Salesperson.make_sale() latency with sqlite store (every sale is written at once)
+And buffered store (sales are written in batches) at every durability level.
+
+Run from project root folder: python3 -m benchmarks.bench_write_behind
+"""
+from benchmarks.bench_sale_latency import measure_sales
+from coffee_for_me.employees.salesperson import Salesperson
+from coffee_for_me.functions.connection_pool import configure_pools, default_pragmas
+from coffee_for_me.store.sales_store import get_store
+import argparse
+import os
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='sqlite vs buffered store make_sale() latency benchmark')
+    parser.add_argument('--sales', type=int, default=1000, help='number of measured sales')
+    parser.add_argument('--batch-size', type=int, default=100, help='buffered store batch size')
+    args = parser.parse_args()
+
+    stores = [('sqlite', {})] + [('buffered', {'durability': durability, 'batch_size': args.batch_size})
+                                 for durability in ('full', 'normal', 'off')]
+    print('{:>10} | {:>10} | {:>12} | {:>12}'.format('store', 'durability', 'ms per sale', 'close ms'))
+    for name, options in stores:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            configure_pools(pragmas=default_pragmas)
+            store = get_store(name, **options)
+            store.setup()
+            salesperson = Salesperson('Bench', 'Salesperson', ['Tea'], ['Sugar'], store=store)
+            latency = measure_sales(salesperson, args.sales)
+            start = time.perf_counter()
+            store.close()
+            close_time = (time.perf_counter() - start) * 1000
+            print('{:>10} | {:>10} | {:>12.3f} | {:>12.3f}'.format(name, options.get('durability', '-'), latency,
+                                                                   close_time))
+    configure_pools(pragmas=default_pragmas)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Compares streaming Exporter.export_as_xml() with the previous implementation,
+Which fetched all rows at once and issued five write calls per row.
+
+Run from project root folder: python3 -m benchmarks.bench_xml_export --rows 1000000
+"""
+from coffee_for_me.exporter.exporter import Exporter
+from coffee_for_me.functions.db_funcs import create_table, db_connection, view_db_records
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+
+def legacy_export_as_xml(file_name):
+    """Previous Exporter.export_as_xml() implementation."""
+    with open(file_name, 'w') as f:
+        f.write('<?xml version="1.0" ?>\n')
+        f.write('<employees>\n')
+        for row in view_db_records():
+            f.write('  <row>\n')
+            f.write('    <id>{}</id>\n'.format(row[0]))
+            f.write('    <name>{}</name>\n'.format(row[1]))
+            f.write('    <sales>{}</sales>\n'.format(row[2]))
+            f.write('    <amount>{}</amount>\n'.format(row[3]))
+            f.write('  </row>\n')
+        f.write('</employees>\n')
+
+
+def fill_employees(rows):
+    """Inserts generated salespeople records into employees table."""
+    with db_connection() as conn:
+        conn.executemany('INSERT INTO employees (name, sales, amount) VALUES (?,?,?)',
+                         (('Seller {}'.format(i), i % 100, i % 1000 + 0.5) for i in range(rows)))
+
+
+def measure(export, file_name):
+    """Returns export time in seconds and peak traced memory in MB."""
+    start = time.perf_counter()
+    export(file_name)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    export(file_name)
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='xml export benchmark')
+    parser.add_argument('--rows', type=int, default=1000000, help='number of salespeople records')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        create_table()
+        fill_employees(args.rows)
+        print('{} rows'.format(args.rows))
+        print('{:<12} | {:>10} | {:>16}'.format('exporter', 'seconds', 'peak memory (MB)'))
+        for name, export in (('legacy', legacy_export_as_xml), ('streaming', Exporter.export_as_xml)):
+            elapsed, peak = measure(export, name + '.xml')
+            print('{:<12} | {:>10.2f} | {:>16.1f}'.format(name, elapsed, peak))
+        with open('legacy.xml') as legacy, open('streaming.xml') as streaming:
+            print('identical output: {}'.format(legacy.read() == streaming.read()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,90 +1,187 @@
 #!/usr/bin/env python3
-from coffee_for_me.employees.manager import Manager
-from coffee_for_me.employees.salesperson import Salesperson
+# role specific modules (employees, exporter, db) are imported only when the role or command needs them,
+# so the app starts faster. Run benchmarks.bench_startup to see start time of every role.
 from coffee_for_me.argparser.argument_parser import ArgumentParser
-from coffee_for_me.functions.db_funcs import create_table, is_table_empty
 from coffee_for_me.functions.functions import get_employee_position
 from coffee_for_me.functions.colors import Colors
+from coffee_for_me.functions.log_setup import setup_logging
 import logging
 import sys
 
+# non-interactive commands, passed as the first command line argument
+commands = ('ingest', 'report', 'export', 'serve', 'serve-reports', 'rebuild-rollups')
+
+
+def store_options(args):
+    """
+    Gets sales store constructor arguments from parsed command line arguments.
+
+    Parameters:
+        args (argparse.Namespace): parsed command line arguments.
+
+    Returns:
+        dict: keyword arguments of store class passed via --store argument.
+    """
+    if args.store == 'buffered':
+        return {'records_backend': args.records, 'batch_size': args.batch_size,
+                'flush_interval': args.flush_interval, 'durability': args.durability}
+    if args.store == 'remote':
+        return {'records_backend': args.records, 'address': args.server}
+    return {'records_backend': args.records}
+
+
+def run_command(args):
+    """
+    Runs non-interactive command parsed by ArgumentParser.parse_command_arguments().
+
+    Parameters:
+        args (argparse.Namespace): parsed command line arguments.
+    """
+    from coffee_for_me.functions.db_funcs import create_table, enable_wal
+
+    logger = logging.getLogger('main.command')
+    logger.info('User passed the following command line args: %s', args)
+    if args.wal:
+        enable_wal()
+        logger.info('WAL journal mode enabled')
+    create_table()
+    try:
+        if args.command == 'ingest':
+            from coffee_for_me.functions.ingest import ingest_file
+            from coffee_for_me.store.sqlite_store import SqliteStore
+            ingested, rejected = ingest_file(args.file, args.beverage, args.addition, args.input_format,
+                                             args.batch_size, SqliteStore(args.records))
+            print('Ingested {} sales, rejected {}'.format(ingested, rejected))
+            logger.info('ingested %s sales, rejected %s from %s', ingested, rejected, args.file)
+        elif args.command == 'report':
+            from coffee_for_me.employees.manager import Manager
+            Manager(args.name, 'Manager').view_records(args.order_by, args.descending, args.page_size, args.page,
+                                                       args.top)
+            logger.info('%s viewed salespeople records', args.name)
+        elif args.command == 'export':
+            from coffee_for_me.employees.manager import Manager
+            file_paths = Manager(args.name, 'Manager', args.compress).export(args.formats, args.out_dir)
+            print('\n'.join(file_paths))
+            logger.info('%s exported salespeople records to %s', args.name, ', '.join(file_paths))
+        elif args.command == 'serve':
+            from coffee_for_me.server.sales_server import run_server
+            from coffee_for_me.store.sqlite_store import SqliteStore
+            run_server(SqliteStore(args.records), args.listen, args.batch_size)
+            logger.info('sales server on %s is stopped', args.listen)
+        elif args.command == 'serve-reports':
+            from coffee_for_me.server.report_server import run_report_server
+            from coffee_for_me.store.sqlite_store import SqliteStore
+            run_report_server(SqliteStore(), args.listen)
+        elif args.command == 'rebuild-rollups':
+            from coffee_for_me.functions.db_funcs import rebuild_rollup_tables
+            rows = rebuild_rollup_tables()
+            if rows is None:
+                raise IOError('database is not available, see coffee_for_me.log')
+            print('Rebuilt daily rollups: {} salesperson days'.format(rows))
+            logger.info('rebuilt daily rollups: %s salesperson days', rows)
+    except (IOError, ValueError) as e:
+        logger.error('%s command failed... %s', args.command, e)
+        print(Colors.RED + '{} failed: {}'.format(args.command.capitalize(), e) + Colors.RESET, file=sys.stderr)
+        sys.exit(1)
+
 
 def main():
-    # creating logger
-    logger = logging.getLogger('main')
-    logger.setLevel(logging.INFO)
-    # creating File Handler
-    file_handler = logging.FileHandler('coffee_for_me.log')
-    file_handler.setLevel(logging.INFO)
-    # creating Formatter
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(funcName)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    if len(sys.argv) > 1 and sys.argv[1] in commands:
+        args = ArgumentParser.parse_command_arguments().parse_args()
+        setup_logging()
+        run_command(args)
+        return
 
     salesperson_choice_msg = '''What would you like to do? Enter 1 or 2:
     1 - Sell a beverage
     2 - I am tired... No more sales...\n'''
 
-    manager_choice_msg = '''What would you like to do? Enter 1 or 2:
+    manager_choice_msg = '''What would you like to do? Enter 1, 2 or 3:
         1 - View/export sales records
-        2 - No reports today... Maybe later...\n'''
+        2 - View sales analytics
+        3 - No reports today... Maybe later...\n'''
 
     parser = ArgumentParser.parse_arguments()
     args = parser.parse_args()
-    if str(sys.argv[1]) is not '-h':  # don't print Help if user passed -h arg
+    logger = setup_logging()
+    position = get_employee_position(args)
+    if position is not None:  # Help is printed only for valid employees, -h arg prints it and exits in parse_args()
         print('=' * 76)
         parser.print_help()  # printing Help for user once the app is started
         print('=' * 76 + '\n')
-    logger.info('User passed the following command line args: {}'.format(args))
+    logger.info('User passed the following command line args: %s', args)
+    if args.wal and position is not None:
+        from coffee_for_me.functions.db_funcs import enable_wal
+        enable_wal()
+        logger.info('WAL journal mode enabled')
 
     # detecting if employee is a manager
-    if get_employee_position(args) == 'manager':
+    if position == 'manager':
+        from coffee_for_me.employees.manager import Manager
+        from coffee_for_me.store.sales_store import get_store
+        store = None
         try:
-            manager = Manager(args.name[0], args.position[0])
-            logger.info('Created Manager instance: {}'.format(manager.__str__()))
+            store = get_store(args.store, **store_options(args))
+            manager = Manager(args.name[0], args.position[0], args.compress, store)
+            logger.info('Created Manager instance: %s', manager)
             manager.employee_greeting('\nYou can view and export sales records\n')
-            logger.debug('Greeted {}'.format(manager.__str__()))
-            while manager.user_choice(manager_choice_msg, 3) == 1:
-                create_table()
-                logger.info('DB table created: {}'.format(manager.fullname))
-                if not is_table_empty():
+            logger.debug('Greeted %s', manager)
+            manager.store.setup()  # creating/migrating db schema once at the app start
+            logger.info('%s store is ready', args.store)
+            choice = manager.user_choice(manager_choice_msg, 4)
+            while choice != 3:
+                if choice == 1 and not manager.store.is_empty():
                     manager.view_records()
-                    logger.info('{} viewed salespeople records'.format(manager.fullname))
+                    logger.info('%s viewed salespeople records', manager.fullname)
                     manager.export_records()
-                    logger.info('{} exported salespeople records'.format(manager.fullname))
+                    logger.info('%s exported salespeople records', manager.fullname)
+                elif choice == 2:
+                    manager.view_analytics()
+                    logger.info('%s viewed sales analytics', manager.fullname)
+                choice = manager.user_choice(manager_choice_msg, 4)
             else:
                 print('Bye-Bye, {}! See you next time'.format(args.name[0]))
-                logger.info('Manager {} decided to quit the app'.format(manager.fullname))
+                logger.info('Manager %s decided to quit the app', manager.fullname)
         except NameError:
             logger.error('Non-manager object is trying to access manager stuff...')
+        finally:
+            if store is not None:  # flushing buffered sales and closing connections even if the app failed
+                store.close()
 
     # detecting if employee is a salesperson
-    elif get_employee_position(args) == 'salesperson':
+    elif position == 'salesperson':
+        from coffee_for_me.employees.salesperson import Salesperson
+        from coffee_for_me.store.sales_store import get_store
+        store = None
         try:
             if args.beverage and args.addition:
-                salesperson = Salesperson(args.name[0], args.position[0], args.beverage, args.addition)
-                logger.info('Created Salesperson instance: {}'.format(salesperson.__str__()))
+                store = get_store(args.store, **store_options(args))
+                salesperson = Salesperson(args.name[0], args.position[0], args.beverage, args.addition, store=store)
+                logger.info('Created Salesperson instance: %s', salesperson)
                 salesperson.employee_greeting('\nYou can sell beverages and ingredients\n')
-                logger.debug('Greeted {}'.format(salesperson.__str__()))
+                logger.debug('Greeted %s', salesperson)
+                store.setup()  # creating/migrating db schema once at the app start
+                logger.info('%s store is ready', args.store)
                 while salesperson.user_choice(salesperson_choice_msg, 3) == 1:
-                    create_table()
-                    logger.info('DB table created: {}'.format(salesperson.fullname))
                     salesperson.make_sale(args.beverage, args.addition)
-                    logger.info('{} made a sale'.format(salesperson.fullname))
+                    logger.info('%s made a sale', salesperson.fullname)
                     salesperson.view_records()
-                    logger.info('Salesperson {} is viewing personal sales records'.format(salesperson.fullname))
+                    logger.info('Salesperson %s is viewing personal sales records', salesperson.fullname)
                 else:
                     print('Bye-Bye, {}! See you next time'.format(args.name[0]))
-                    logger.info('Salesperson {} decided to quit the app'.format(salesperson.fullname))
+                    logger.info('Salesperson %s decided to quit the app', salesperson.fullname)
             else:
                 print('Provide both', Colors.GREEN + 'beverage(s)' + Colors.RESET, 'and ' + Colors.GREEN
                       + 'ingredient(s)' + Colors.RESET, 'as command line arguments! See Help above.')
         except NameError:
             logger.error('Non-salesperson object is trying to access salesperson stuff...')
+        finally:
+            if store is not None:
+                store.close()
     else:
         args_positions = ArgumentParser()
         args_positions.quit_msg(args.name[0], args.position[0])
-        logger.error('{} with position {} is not a valid employee...'.format(args.name[0], args.position[0]))
+        logger.error('%s with position %s is not a valid employee...', args.name[0], args.position[0])
 
 
 if __name__ == "__main__":
@@ -6,6 +6,28 @@ from coffee_for_me.functions.colors import Colors
 logger = logging.getLogger('main.argparsing.argparser.argument_parser.ArgumentParser')
 
 
+def positive_int(value):
+    """
+    Converts command line argument to positive integer, used as argparse type, e.g. for --batch-size.
+
+    Parameters:
+        value (str): command line argument.
+
+    Returns:
+        int: positive integer.
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError('{!r} is not a positive integer'.format(value))
+    return number
+
+
 class ArgumentParser(argparse.ArgumentParser):
     """
     Parses positional and optional command-line arguments passed by user.
@@ -36,12 +58,110 @@ class ArgumentParser(argparse.ArgumentParser):
                             help='List of available beverages a Salesperson can sell: tea, coffee, water, soda, etc.')
         parser.add_argument('-add', '--addition', action='append', default=None,
                             help='List of available ingredients a Salesperson can add: sugar, milk, cinnamon, etc.')
+        parser.add_argument('-z', '--compress', choices=['gz', 'bz2', 'xz', 'zip'], default=None,
+                            help='Compression of files exported by a Manager')
+        parser.add_argument('--wal', action='store_true',
+                            help='Use WAL journal mode, so several salespeople and managers can use the database '
+                                 'at the same time')
+        parser.add_argument('--records', choices=['text', 'journal'], default='text',
+                            help='Salesperson sales records storage: text file or binary journal. Existing text '
+                                 'records are converted to journal on first use')
+        parser.add_argument('--store', choices=['sqlite', 'memory', 'buffered', 'remote'], default='sqlite',
+                            help='Sales storage: records files and database, memory only (nothing is saved, e.g. '
+                                 'for load tests), records files and database written in batches or sales server '
+                                 'started with "serve" command')
+        parser.add_argument('--server', type=str, default='127.0.0.1:8765',
+                            help='Sales server address used by remote store: HOST:PORT or unix socket path')
+        parser.add_argument('--batch-size', type=positive_int, default=100,
+                            help='Number of sales written at once by buffered store')
+        parser.add_argument('--flush-ms', type=int, default=1000, dest='flush_interval',
+                            help='Maximum number of milliseconds a sale is kept in memory by buffered store, '
+                                 '0 - until batch is full')
+        parser.add_argument('--durability', choices=['full', 'normal', 'off'], default='normal',
+                            help='Buffered store durability: full - write every sale at once, normal - write in '
+                                 'batches, off - write in batches without syncing database to disk')
 
         print('\n')
         logger.info('parse_arguments(): created args parser')
 
         return parser
 
+    @staticmethod
+    def parse_command_arguments():
+        """
+        Parses non-interactive commands, e.g. 'python coffee_for_me ingest sales.csv -bev tea -add sugar'.
+        Commands: ingest, report, export, serve, serve-reports, rebuild-rollups.
+
+        Returns:
+            ArgumentParser: commands arguments parser.
+        """
+        parser = ArgumentParser(prog='coffee_for_me', description='Non-interactive "CoffeeForMe!" commands')
+        commands = parser.add_subparsers(dest='command', metavar='command')
+        commands.required = True
+
+        ingest = commands.add_parser('ingest', help='Record sales from csv or JSON Lines file in batches')
+        ingest.add_argument('file', type=str,
+                            help='csv or JSON Lines file with sales, "-" to read from standard input')
+        ingest.add_argument('--format', choices=['csv', 'jsonl'], default=None, dest='input_format',
+                            help='Input file format, detected by file extension by default')
+        ingest.add_argument('-bev', '--beverage', action='append', required=True,
+                            help='List of available beverages: sales of other beverages are rejected')
+        ingest.add_argument('-add', '--addition', action='append', default=[],
+                            help='List of available ingredients: sales of other ingredients are rejected')
+        ingest.add_argument('--records', choices=['text', 'journal'], default='text',
+                            help='Salespeople sale records storage: text records files or binary journals')
+        ingest.add_argument('--batch-size', type=positive_int, default=10000,
+                            help='Number of sales recorded in one transaction')
+        ingest.add_argument('--wal', action='store_true', help='Use WAL journal mode')
+
+        report = commands.add_parser('report', help='Print salespeople sales records table')
+        report.add_argument('--name', type=str, default='Manager', help='Manager name')
+        report.add_argument('--sort', choices=['id', 'name', 'sales', 'amount'], default='id', dest='order_by',
+                            help='Column to sort salespeople by. By id by default')
+        report.add_argument('--desc', action='store_true', dest='descending', help='Sort in descending order')
+        report.add_argument('--page-size', type=int, default=None,
+                            help='Number of salespeople per page. All salespeople by default')
+        report.add_argument('--page', type=int, default=1, help='Page number, starting from 1')
+        report.add_argument('--top', type=int, default=None,
+                            help='Show only top N salespeople by sales amount, e.g. --top 10')
+        report.add_argument('--wal', action='store_true', help='Use WAL journal mode')
+
+        export = commands.add_parser('export', help='Export salespeople sales records to files')
+        export.add_argument('--format', type=lambda formats: [x.strip().lower() for x in formats.split(',')],
+                            default=['json', 'xml', 'csv'], dest='formats', metavar='FORMATS',
+                            help='Comma separated export formats: json, jsonl, xml, csv. All but jsonl by default')
+        export.add_argument('--out', type=str, default=None, dest='out_dir',
+                            help='Folder for exported files, "manager_records" by default')
+        export.add_argument('--name', type=str, default='Manager',
+                            help='Manager name, exported files are named after the manager')
+        export.add_argument('-z', '--compress', choices=['gz', 'bz2', 'xz', 'zip'], default=None,
+                            help='Compression of exported files')
+        export.add_argument('--wal', action='store_true', help='Use WAL journal mode')
+
+        serve = commands.add_parser('serve', help='Run sales server, salespeople and managers connect to it with '
+                                                  '"--store remote"')
+        serve.add_argument('--listen', type=str, default='127.0.0.1:8765',
+                           help='Address to listen on: HOST:PORT or unix socket path')
+        serve.add_argument('--batch-size', type=positive_int, default=1000,
+                           help='Maximum number of sales of all clients recorded in one transaction')
+        serve.add_argument('--records', choices=['text', 'journal'], default='text',
+                           help='Salesperson sales records storage: text file or binary journal')
+        serve.add_argument('--wal', action='store_true', help='Use WAL journal mode')
+
+        serve_reports = commands.add_parser('serve-reports', help='Run read-only HTTP server of salespeople records '
+                                                                  'and totals as json or csv, e.g. for dashboards')
+        serve_reports.add_argument('--listen', type=str, default='127.0.0.1:8080', help='HOST:PORT to listen on')
+        serve_reports.add_argument('--wal', action='store_true',
+                                   help='Use WAL journal mode, so reports are read while salespeople sell')
+
+        rebuild_rollups = commands.add_parser('rebuild-rollups', help='Rebuild daily sales rollups used by reports '
+                                                                      'from sale line items')
+        rebuild_rollups.add_argument('--wal', action='store_true', help='Use WAL journal mode')
+
+        logger.info('parse_command_arguments(): created commands args parser')
+
+        return parser
+
     def error(self, message):
         """
         Overrides argparse.ArgumentParser error method to customize error for missing args.
@@ -50,7 +170,7 @@ class ArgumentParser(argparse.ArgumentParser):
         Parameters:
             message (str): message name.
         """
-        logger.error('obligatory args were not supplied bu user: {} - {}'.format(self.prog, message))
+        logger.error('obligatory args were not supplied bu user: %s - %s', self.prog, message)
         self.exit(0, '{}: {}.\nRun "python coffee_for_me -h" to see help.\n'.
                   format(self.prog, Colors.RED + message + Colors.RESET))
 
@@ -61,14 +61,14 @@ class Employee:
                 choice_dict = dict()
                 choice = int(input(choice_msg))
                 value = choice
-                self.logger.debug('Employee {} made a choice: {}'.format(self.__str__(), str(choice)))
+                self.logger.debug('Employee %s made a choice: %s', self, choice)
             except ValueError:
                 print('{}, you can input only numbers. Enter:'.format(self.name))
                 print(' or '.join(str(x) for x in range(1, delta)) + '\n')
                 continue
             if 0 < choice < delta:
-                self.logger.debug('Employee {} choice "{}" is valid according to choice delta "{}"'.
-                                  format(self.__str__(), str(choice), str(delta)))
+                self.logger.debug('Employee %s choice "%s" is valid according to choice delta "%s"',
+                                  self, choice, delta)
                 break
             else:
                 print('{}, that is not:'.format(self.name))
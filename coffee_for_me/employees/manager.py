@@ -1,90 +1,207 @@
 #!/usr/bin/env python3
 from coffee_for_me.employees.employee import Employee
-from coffee_for_me.functions.db_funcs import *
 from coffee_for_me.exporter.exporter import Exporter
+from coffee_for_me.exporter.compression import compressed_filename
 from coffee_for_me.functions.functions import show_sales_table, employee_filename
+from coffee_for_me.functions.analytics import show_sales_analytics
+from coffee_for_me.store.sqlite_store import SqliteStore
 import logging
+import os
 
 
 class Manager(Employee):
     """
     Manager class inherits Employee class.
-    Holds logic for viewing salespeople sales records in formatted table
+    Holds logic for viewing salespeople sales records in formatted table, viewing sales analytics
     And exporting sales records to different formats.
 
     Attributes:
         name (str): Manager first name passed as a command line argument
         position (str): Manager position passed as a command line argument
+        compression (str): exported files compression ('gz', 'bz2', 'xz', 'zip') or None
+        store (SalesStore): sales records storage
         logger (Logger): creating Logger for Manager class
     """
 
-    manager_export_msg = '''Would you like to export sales records? Enter 1, 2, 3 or 4:
+    manager_export_msg = '''Would you like to export sales records? Enter 1, 2, 3, 4 or 5:
         1 - Export as JSON
         2 - Export as XML
         3 - Export as CSV
-        4 - Do not export\n'''
+        4 - Do not export
+        5 - Export as JSON, XML and CSV at once\n'''
 
-    def __init__(self, name, position):
+    manager_period_msg = '''Which sales analytics would you like to see? Enter 1, 2 or 3:
+        1 - Revenue by hour
+        2 - Revenue by day
+        3 - Revenue by week\n'''
+
+    analytics_periods = {1: 'hour', 2: 'day', 3: 'week'}
+
+    def __init__(self, name, position, compression=None, store=None):
         """
         The constructor for Manager class.
 
         Attributes:
             name (str): Manager first name
             position (str): Manager as position
+            compression (str): exported files compression ('gz', 'bz2', 'xz', 'zip'). Not compressed by default.
+            store (SalesStore): sales records storage, e.g. get_store('memory'). SqliteStore by default.
         """
         super().__init__(name, position)
+        self.compression = compression
+        self.store = store or SqliteStore()
         self.logger = logging.getLogger('main.argparsing.employees.Manager')
         self.logger.info('Initialising Manager')
 
-    def view_records(self):
+    def view_records(self, order_by='id', descending=False, page_size=None, page=1, top=None):
         """
-        Printing salespeople sales records stored in database in formatted table.
+        Printing salespeople sales records stored in sales store (database by default) in formatted table.
+        Records are sorted and paged by sales store, totals are always summed up over all salespeople.
         Overrides Employee.view_records() method.
+        Usage example: view_records(top=10) or view_records('name', page_size=20, page=2)
+
+        Parameters:
+            order_by (str): column to sort salespeople by: 'id', 'name', 'sales' or 'amount'.
+            descending (bool): sort in descending order.
+            page_size (int): number of salespeople per page. All salespeople by default.
+            page (int): page number, starting from 1.
+            top (int): show only top salespeople by sales amount, overrides sorting and paging.
 
         Raises:
+            ValueError: If sort column, page or page size is not valid.
             RuntimeWarning: If no records found in database.
         """
+        if top is not None:
+            order_by, descending, page_size, page = 'amount', True, top, 1
+        if page_size is not None and (page_size < 1 or page < 1):
+            raise ValueError('Page and page size must be positive numbers')
+        offset = (page - 1) * page_size if page_size is not None else 0
         try:
-            employees = view_db_records()
-            self.logger.debug('{} printing salespeople sales records table'.format(self.__str__()))
-            show_sales_table(employees)
-            self.logger.info('{} viewed the table with sales records'.format(self.__str__()))
+            employees, totals = self.store.sales_page(order_by, descending, page_size, offset)
+            self.logger.debug('%s printing salespeople sales records table', self)
+            show_sales_table(employees, totals)
+            if top is not None:
+                print('Showing top {} of {} salespeople by sales amount\n'.format(len(employees),
+                                                                                totals['salespeople']))
+            elif page_size is not None and totals['salespeople']:
+                pages = -(-totals['salespeople'] // page_size)
+                if employees:
+                    print('Showing salespeople {}-{} of {} (page {} of {})\n'.format(
+                        offset + 1, offset + len(employees), totals['salespeople'], page, pages))
+                else:
+                    print('There are only {} pages of salespeople records\n'.format(pages))
+            self.logger.info('%s viewed the table with sales records', self)
         except RuntimeWarning:
             print('\nNo sales records yet. Ask your salespeople to sell something.\n')
             self.logger.info('No sales records yet')
+        except IOError as e:
+            print('\nSales records are not available. Try again later.\n')
+            self.logger.error('%s could not view sales records... %s', self, e)
+
+    def view_analytics(self, period=None, start=None, end=None, top=5):
+        """
+        Printing sales analytics: revenue by hour, day or week, top beverages and additions,
+        Attach rate of additions and salespeople trends. Period is asked from user if it is not passed.
+
+        Parameters:
+            period (str): time bucket: 'hour', 'day' or 'week'.
+            start (str): period start UTC timestamp, e.g. '2020-01-01'. All sales by default.
+            end (str): period end UTC timestamp (excluded).
+            top (int): number of best selling beverages and additions.
+
+        Returns:
+            dict: analytics report (see analytics.sales_analytics()) or None if the store has no analytics.
+        """
+        if period is None:
+            period = self.analytics_periods[self.user_choice(self.manager_period_msg, 4)]
+        try:
+            analytics = self.store.sales_analytics(period, start, end, top)
+        except NotImplementedError as e:
+            print('{}, sales analytics are not available: {}\n'.format(self.name, e))
+            self.logger.info('%s store has no sales analytics', self.store.name)
+            return None
+        show_sales_analytics(analytics)
+        self.logger.info('%s viewed sales analytics by %s', self, period)
+        return analytics
 
     def export_records(self):
         """
-        Exporting sales records to json, xml and csv files based on user's choice.
+        Exporting sales records to json, xml and/or csv files based on user's choice.
         Printing file folder to user.
 
         Returns:
-            str: exported file path and name.
+            str: exported file path and name (list of them if all formats were exported),
+                None if nothing was exported.
         """
-        choice = self.user_choice(self.manager_export_msg, 5)
-        if choice == 1:
-            json_file_path = employee_filename('manager_records', self.fullname, '_records.json')
-            self.logger.debug('{} is trying to export json records'.format(self.fullname))
-            Exporter.export_as_json(employee_filename('manager_records', self.fullname, '_records.json'))
-            self.logger.info('{} exported json records to {}'.format(self.fullname, json_file_path))
-            print('{}, your exported json file is in "manager_records" folder\n'.format(self.name))
-            return json_file_path
-        elif choice == 2:
-            xml_file_path = employee_filename('manager_records', self.fullname, '_records.xml')
-            self.logger.debug('{} is trying to export xml records'.format(self.fullname))
-            Exporter.export_as_xml(employee_filename('manager_records', self.fullname, '_records.xml'))
-            self.logger.info('{} exported xml records to {}'.format(self.fullname, xml_file_path))
-            print('{}, your exported xml file is in "manager_records" folder\n'.format(self.name))
-            return xml_file_path
-        elif choice == 3:
-            csv_file_path = employee_filename('manager_records', self.fullname, '_records.csv')
-            self.logger.debug('{} is trying to export csv records'.format(self.fullname))
-            Exporter.export_as_csv(employee_filename('manager_records', self.fullname, '_records.csv'))
-            self.logger.info('{} exported csv records to {}'.format(self.fullname, csv_file_path))
-            print('{}, your exported csv file is in "manager_records" folder\n'.format(self.name))
-            return csv_file_path
+        choice = self.user_choice(self.manager_export_msg, 6)
+        if choice in (1, 2, 3):
+            export_format = ('json', 'xml', 'csv')[choice - 1]
+            self.logger.debug('%s is trying to export %s records', self.fullname, export_format)
+            try:
+                file_path = self.export_file_path(export_format)
+                self.store.export({export_format: file_path})
+            except IOError as e:
+                self.logger.error('File not found or path is incorrect... %s', e)
+                print('{}, sales records could not be exported: {}\n'.format(self.name, e))
+                return None
+            self.logger.info('%s exported %s records to %s', self.fullname, export_format, file_path)
+            print('{}, your exported {} file is in "manager_records" folder\n'.format(self.name, export_format))
+            return file_path
         elif choice == 4:
             print('{}, you can always export sales records later.\n'.format(self.name))
+        elif choice == 5:
+            try:
+                file_paths = self.export(('json', 'xml', 'csv'))
+            except IOError as e:
+                self.logger.error('File not found or path is incorrect... %s', e)
+                print('{}, sales records could not be exported: {}\n'.format(self.name, e))
+                return None
+            print('{}, your exported json, xml and csv files are in "manager_records" folder\n'.format(self.name))
+            return file_paths
+
+    def export_file_path(self, export_format, out_dir=None):
+        """
+        Creates exported file path: <out_dir>/<manager fullname>_records.<format>[.<compression>].
+
+        Parameters:
+            export_format (str): export format, used as file extension: 'json', 'jsonl', 'xml' or 'csv'.
+            out_dir (str): folder for exported files, created if not exists. "manager_records" folder by default.
+
+        Returns:
+            str: exported file path.
+        """
+        file_ending = '_records.' + export_format
+        if out_dir is None:
+            file_path = employee_filename('manager_records', self.fullname, file_ending)
+        else:
+            os.makedirs(out_dir, exist_ok=True)
+            file_path = os.path.join(out_dir, self.fullname + file_ending)
+        return compressed_filename(file_path, self.compression)
+
+    def export(self, formats, out_dir=None):
+        """
+        Exports sales records to files in several formats at once without asking user anything.
+        Usage example: manager.export(['json', 'csv'], 'reports')
+
+        Parameters:
+            formats (list): export formats: 'json', 'jsonl', 'xml' and/or 'csv'.
+            out_dir (str): folder for exported files, created if not exists. "manager_records" folder by default.
+
+        Returns:
+            list: exported files paths.
+
+        Raises:
+            ValueError: If export format is not supported.
+        """
+        unknown_formats = set(formats) - set(Exporter.formats)
+        if unknown_formats:
+            raise ValueError('Unsupported export format(s): {}'.format(', '.join(sorted(unknown_formats))))
+        file_paths = {export_format: self.export_file_path(export_format, out_dir) for export_format in formats}
+        self.logger.debug('%s is trying to export %s records', self.fullname, ', '.join(formats))
+        # compressors release GIL, so compressed files are written in parallel threads
+        self.store.export(file_paths, parallel=self.compression is not None and len(file_paths) > 1)
+        self.logger.info('%s exported records to %s', self.fullname, ', '.join(file_paths.values()))
+        return list(file_paths.values())
 
     def __str__(self):
         return '{} - {}'.format(self.name, self.position)
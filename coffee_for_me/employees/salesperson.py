@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 from coffee_for_me.employees.employee import Employee
-from coffee_for_me.functions.db_funcs import *
-from coffee_for_me.functions.functions import *
+from coffee_for_me.functions.functions import get_item_to_sell, enter_price
+from coffee_for_me.functions.money import format_cents
+from coffee_for_me.functions.colors import Colors
 import logging
 
 
@@ -15,6 +16,7 @@ class Salesperson(Employee):
         position (str): Salesperson position passed as a command line argument
         beverage (str): Beverage name passed as a command line argument
         addition (str): Ingredient name passed as a command line argument
+        store (SalesStore): sales records storage
         logger (Logger): creating Logger for Salesperson class
     """
 
@@ -22,7 +24,10 @@ class Salesperson(Employee):
     1 - Add ingredient
     2 - Don not add ingredient\n'''
 
-    def __init__(self, name, position, beverage, addition):
+    sold_msg = 'You sold {} beverages and {} additions'
+    total_amount_msg = 'Your sales total amount: {}$'
+
+    def __init__(self, name, position, beverage, addition, records_backend='text', store=None):
         """
         The constructor for Salesperson class.
 
@@ -31,10 +36,20 @@ class Salesperson(Employee):
             position (str): Salesperson as position
             beverage (str): Beverage name
             addition (str): Ingredient name
+            records_backend (str): records storage of default SqliteStore: 'text' records file (default)
+                                   Or binary 'journal'. Existing records file is converted to journal on first use.
+            store (SalesStore): sales records storage, e.g. get_store('memory'). SqliteStore by default.
+
+        Raises:
+            ValueError: If records backend is not supported.
         """
         super().__init__(name, position)
         self.beverage = beverage
         self.addition = addition
+        if store is None:  # imported only if needed, it imports database modules
+            from coffee_for_me.store.sqlite_store import SqliteStore
+            store = SqliteStore(records_backend)
+        self.store = store
         self.logger = logging.getLogger('main.argparsing.employees.Salesperson')
         self.logger.info('Initialising Salesperson')
 
@@ -52,12 +67,11 @@ class Salesperson(Employee):
             beverage_to_sell = get_item_to_sell('beverage', available_beverages)
             if beverage_to_sell.lower() in (x.lower() for x in available_beverages):
                 beverage_price = enter_price('beverage')
-                sale_record = 'Beverage: {}. Price: {}$'.format(beverage_to_sell.lower(), str(beverage_price))
-                self.logger.info('{} added a beverage: {} at {}$'.
-                                 format(self.fullname, beverage_to_sell, str(beverage_price)))
+                sale_record = 'Beverage: {}. Price: {}$'.format(beverage_to_sell.lower(), format_cents(beverage_price))
+                self.logger.info('%s added a beverage: %s at %s cents', self.fullname, beverage_to_sell, beverage_price)
                 return sale_record
             else:
-                self.logger.debug('{} entered incorrect beverage name: {}'.format(self.fullname, beverage_to_sell))
+                self.logger.debug('%s entered incorrect beverage name: %s', self.fullname, beverage_to_sell)
                 print('You can sell only:')
                 print(' or '.join(Colors.RED + x + Colors.RESET for x in available_beverages))
                 print(Colors.BLUE + 'Try again!' + Colors.RESET + '\n')
@@ -76,117 +90,122 @@ class Salesperson(Employee):
             addition_to_sell = get_item_to_sell('ingredient', available_additions)
             if addition_to_sell.lower() in (addition.lower() for addition in available_additions):
                 addition_price = enter_price('ingredient')
-                sale_record = 'Addition: {}. Price: {}$'.format(addition_to_sell.lower(), str(addition_price))
-                self.logger.info('{} added addition: {} at {}$'.
-                                 format(self.fullname, addition_to_sell, str(addition_price)))
+                sale_record = 'Addition: {}. Price: {}$'.format(addition_to_sell.lower(), format_cents(addition_price))
+                self.logger.info('%s added addition: %s at %s cents', self.fullname, addition_to_sell, addition_price)
                 return sale_record
             else:
-                self.logger.debug('{} entered incorrect addition name: {}'.format(self.fullname, addition_to_sell))
+                self.logger.debug('%s entered incorrect addition name: %s', self.fullname, addition_to_sell)
                 print('You can add only:')
                 print(' or '.join(Colors.RED + addition + Colors.RESET for addition in available_additions))
                 print(Colors.BLUE + 'Try again!' + Colors.RESET + '\n')
 
+    @property
+    def records_file(self):
+        """str: Get salesperson's sales records file path"""
+        from coffee_for_me.store.sqlite_store import SqliteStore
+        return SqliteStore.records_file(self.fullname)
+
+    @property
+    def totals_file(self):
+        """str: Get salesperson's running totals file path stored next to sales records file"""
+        from coffee_for_me.store.sqlite_store import SqliteStore
+        return SqliteStore.totals_file(self.fullname)
+
+    @property
+    def journal_file(self):
+        """str: Get salesperson's binary sales journal file path"""
+        from coffee_for_me.store.sqlite_store import SqliteStore
+        return SqliteStore.journal_file(self.fullname)
+
     def make_sale(self, available_beverages, available_additions):
         """
-        Adding/updating salesperson sales records (beverages and additions) to/in file/database.
+        Adding salesperson sale records (beverage and addition) to sales store.
+        By default records are appended to file (running totals are updated with them) and recorded in database.
 
         Parameters:
             available_beverages (list): Available beverages to sell passed via command line argument.
             available_additions (list): Available ingredients to sell passed via command line argument.
         """
         if self.user_choice(self.addition_msg, 3) == 2:
-            self.logger.debug('{} decided not to add additions to sale'.format(self.fullname))
-            beverage_to_file(employee_filename('salesperson_records', self.fullname, '_records.txt'),
-                             self.add_beverage(available_beverages))
-            self.logger.info('{} added beverage to file'.format(self.fullname))
-            if is_employee_in_db(self.fullname):
-                update_db_record(self.fullname, self.count_sales(), self.total_sales_amount())
-                self.logger.info('Sales and total amount were updated for {} in db'.format(self.fullname))
-            else:
-                insert_db_record(self.fullname, self.count_sales(), self.total_sales_amount())
-                self.logger.info('{} was added to db'.format(self.fullname))
+            self.logger.debug('%s decided not to add additions to sale', self.fullname)
+            sale_records = [self.add_beverage(available_beverages)]
         else:
-            self.logger.debug('{} decided to add additions to sale'.format(self.fullname))
-            beverage_addition_to_file(employee_filename('salesperson_records', self.fullname, '_records.txt'),
-                                      self.add_beverage(available_beverages), self.add_ingredient(available_additions))
-            self.logger.info('{} added addition to file'.format(self.fullname))
-            if is_employee_in_db(self.fullname):
-                update_db_record(self.fullname, self.count_sales(), self.total_sales_amount())
-                self.logger.info('Sales and total amount were updated for {} in db'.format(self.fullname))
-            else:
-                insert_db_record(self.fullname, self.count_sales(), self.total_sales_amount())
-                self.logger.info('{} was added to db'.format(self.fullname))
+            self.logger.debug('%s decided to add additions to sale', self.fullname)
+            sale_records = [self.add_beverage(available_beverages), self.add_ingredient(available_additions)]
+        try:
+            recorded = self.store.record_sale(self.fullname, sale_records)
+        except IOError as e:  # sales database or sales server is not available, nothing was recorded
+            self.logger.error('Sale of %s was not recorded... %s', self.fullname, e)
+            print(Colors.RED + 'Sale was not recorded: {}'.format(e) + Colors.RESET)
+            return
+        try:
+            self.show_totals(self.store.salesperson_totals(self.fullname))
+        except IOError as e:  # remote store: sales server went down after the sale was recorded
+            self.logger.error('Totals of %s are not available... %s', self.fullname, e)
+            print(Colors.RED + 'Your sales totals are not available: {}'.format(e) + Colors.RESET)
+        if recorded:
+            self.logger.info('Sales and total amount were recorded for %s in %s store', self.fullname, self.store.name)
+        else:
+            self.logger.error('Sale of %s was not fully recorded in %s store', self.fullname, self.store.name)
+            print(Colors.RED + 'Sale was not fully recorded, your sales records may be incomplete.' + Colors.RESET)
+
+    def show_totals(self, totals):
+        """
+        Printing salesperson's number of sold beverages and additions and total sales amount.
+
+        Parameters:
+            totals (dict): salesperson's totals returned by sales store, see SalesStore.salesperson_totals().
+        """
+        print(self.sold_msg.format(totals['beverages'], totals['additions']))
+        print(self.total_amount_msg.format(format_cents(totals['amount_cents'])))
+        self.logger.info('%s sold %s beverages and %s additions for %s cents', self.fullname, totals['beverages'],
+                         totals['additions'], totals['amount_cents'])
 
     def total_sales_amount(self):
         """
-        Calculating salesperson's total sales amount by reading data stored in salesperson's file.
-        Rounding to 2 digits after dot.
+        Getting salesperson's total sales amount from sales store totals, e.g. running totals stored next to
+        Salesperson's file. Records file is read only if running totals are missing or stale.
 
         Returns:
-            float: salesperson's total sales amount.
-
-        Raises:
-            IOError: If invalid filename/directory or no file passed.
-            TypeError: If trying to pass NoneType instead of file.
+            int: salesperson's total sales amount in cents.
         """
-        try:
-            with open(employee_filename('salesperson_records', self.fullname, '_records.txt'), "r") as f:
-                total_price = []
-                for line in f:
-                    try:
-                        match_price(total_price, r'[-+]?\d*\.\d+|\d+', line)
-                    except IndexError as e:
-                        self.logger.error('Sale price is missing in {} line --> {}'.format(line, e))
-                total_price = round(sum(total_price), 2)
-                print('Your sales total amount: {}$'.format(total_price))
-                self.logger.info('Total sales amount calculated: {}'.format(total_price))
-                return total_price
-        except IOError as e:
-            self.logger.error('Invalid filename/directory or no file passed... ', e)
-        except TypeError as e:
-            self.logger.error('Trying to pass NoneType instead of file... {}'.format(e))
+        total_cents = self.store.salesperson_totals(self.fullname)['amount_cents']
+        print(self.total_amount_msg.format(format_cents(total_cents)))
+        self.logger.info('Total sales amount calculated: %s cents', total_cents)
+        return total_cents
 
     def count_sales(self):
         """
         Counting number of sales (both beverage and ingredient) made by salesperson.
+        Records file is read only if running totals are missing or stale.
 
         Returns:
             int: number of sales.
-        Raises:
-            IOError: If invalid filename/directory or no file passed.
-            TypeError: If trying to pass NoneType instead of file.
         """
-        try:
-            with open(employee_filename('salesperson_records', self.fullname, '_records.txt'), 'r') as f:
-                contents = f.read()
-                beverage_counter = contents.count('Beverage')
-                addition_counter = contents.count('Addition')
-                print('You sold {} beverages and {} additions'.format(beverage_counter, addition_counter))
-                self.logger.info('{} beverages and {} additions added to {} sales file'.
-                                 format(str(beverage_counter), str(addition_counter), self.fullname))
-                return beverage_counter + addition_counter
-        except IOError as e:
-            self.logger.error('Invalid filename/directory or no file passed... ', e)
-        except TypeError as e:
-            self.logger.error('Trying to pass NoneType instead of file... {}'.format(e))
+        totals = self.store.salesperson_totals(self.fullname)
+        beverage_counter = totals['beverages']
+        addition_counter = totals['additions']
+        print(self.sold_msg.format(beverage_counter, addition_counter))
+        self.logger.info('%s beverages and %s additions added to %s sales file',
+                         beverage_counter, addition_counter, self.fullname)
+        return beverage_counter + addition_counter
 
     def view_records(self):
         """
-        Printing sold beverages, ingredients and their prices stored in file for salesperson.
+        Printing sold beverages, ingredients and their prices stored in sales store for salesperson.
 
         Raises:
             IOError: If invalid filename/directory or no file passed.
             TypeError: If trying to pass NoneType instead of file.
         """
         try:
-            with open(employee_filename('salesperson_records', self.fullname, '_records.txt'), "r") as f:
-                self.logger.debug('Printing {} sales records'.format(self.fullname))
-                for line in f:
-                    print(line)
+            self.logger.debug('Printing %s sales records', self.fullname)
+            for record in self.store.salesperson_records(self.fullname):
+                print(record + '\n')
         except IOError as e:
-            self.logger.error('Invalid filename/directory or no file passed... ', e)
+            self.logger.error('Invalid filename/directory or no file passed... %s', e)
         except TypeError as e:
-            self.logger.error('Trying to pass NoneType instead of file... {}'.format(e))
+            self.logger.error('Trying to pass NoneType instead of file... %s', e)
 
     def __str__(self):
         return '{} - {} - beverages: {}, additions: {}'.format(self.name, self.position, self.beverage, self.addition)
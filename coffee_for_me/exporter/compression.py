@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+from contextlib import contextmanager
+import importlib
+import io
+import logging
+import os
+
+logger = logging.getLogger('main.argparsing.exporter.compression')
+
+# compression name to file extension
+compressions = {'gz': '.gz', 'bz2': '.bz2', 'xz': '.xz', 'zip': '.zip'}
+
+# compression name to module opening compressed stream, modules are imported on first use
+_stream_openers = {'gz': 'gzip', 'bz2': 'bz2', 'xz': 'lzma'}
+
+
+def compression_from_filename(file_name):
+    """
+    Detects compression by file extension, e.g. 'records.json.gz' -> 'gz'.
+
+    Parameters:
+        file_name (str): name of the file.
+
+    Returns:
+        str: compression name ('gz', 'bz2', 'xz' or 'zip') or None for not compressed file.
+    """
+    for compression, extension in compressions.items():
+        if file_name.lower().endswith(extension):
+            return compression
+    return None
+
+
+def compressed_filename(file_name, compression=None):
+    """
+    Adds compression extension to file name if it is not there already.
+    Usage example: compressed_filename('records.json', 'gz') returns 'records.json.gz'
+
+    Parameters:
+        file_name (str): name of the file.
+        compression (str): 'gz', 'bz2', 'xz', 'zip' or None for not compressed file.
+
+    Returns:
+        str: file name.
+
+    Raises:
+        ValueError: If compression is not supported.
+    """
+    if compression is None or compression_from_filename(file_name) == compression:
+        return file_name
+    if compression not in compressions:
+        raise ValueError('Unsupported compression "{}", use one of: {}'.format(compression, ', '.join(compressions)))
+    return file_name + compressions[compression]
+
+
+@contextmanager
+def open_export_file(file_name, compression=None):
+    """
+    Opens text file for writing. Text is streamed through compressor straight to the file,
+    No temporary not compressed copy is created. Zip archive gets one member named as the file without '.zip'.
+
+    Parameters:
+        file_name (str): name of the file.
+        compression (str): 'gz', 'bz2', 'xz', 'zip' or None. Detected by file extension if None.
+
+    Yields:
+        _io.TextIOWrapper: text file object.
+
+    Raises:
+        ValueError: If compression is not supported.
+    """
+    compression = compression or compression_from_filename(file_name)
+    if compression is None:
+        with open(file_name, 'w') as f:
+            yield f
+    elif compression == 'zip':
+        member = os.path.basename(file_name)[:-len(compressions['zip'])] if file_name.lower().endswith('.zip') \
+            else os.path.basename(file_name)
+        zipfile = importlib.import_module('zipfile')
+        with zipfile.ZipFile(file_name, 'w', zipfile.ZIP_DEFLATED) as archive:
+            with io.TextIOWrapper(archive.open(member, 'w')) as f:
+                yield f
+    elif compression in _stream_openers:
+        with importlib.import_module(_stream_openers[compression]).open(file_name, 'wt') as f:
+            yield f
+    else:
+        raise ValueError('Unsupported compression "{}", use one of: {}'.format(compression, ', '.join(compressions)))
+    logger.debug('wrote %s file with %s compression', file_name, compression)
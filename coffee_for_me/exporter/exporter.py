@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 from coffee_for_me.functions.db_funcs import *
-import json
-import csv
+from coffee_for_me.exporter.writers import JsonWriter, JsonLinesWriter, XmlWriter, CsvWriter
+from coffee_for_me.exporter.compression import open_export_file
+from contextlib import ExitStack
+import os
+import queue
+import threading
 
 logger = logging.getLogger('main.argparsing.exporter.exporter.Exporter')
 
@@ -11,104 +15,226 @@ class Exporter:
     Exporter class holds methods to export data to different formats.
     """
 
+    chunk_size = 1000  # number of rows fetched from database and written at once
+
+    # export format to writer class and its options
+    formats = {
+        'json': (JsonWriter, {}),
+        'jsonl': (JsonLinesWriter, {}),
+        'xml': (XmlWriter, {}),
+        'csv': (CsvWriter, {'header': ["ID", "Name", 'Number of Sales', 'Total Amount ($)']}),
+    }
+
+    @staticmethod
+    def stream_records(file_name, writer_class, chunk_size=None, compression=None, **writer_options):
+        """
+        Gets salespeople records from database chunk by chunk and streams them to file with writer.
+
+        Parameters:
+            file_name (str): name of the file. Pass employee_filename function.
+            writer_class (type): writer class from exporter.writers module, e.g. JsonWriter.
+            chunk_size (int): number of rows fetched from database and written at once.
+            compression (str): 'gz', 'bz2', 'xz', 'zip' or None. Detected by file extension if None.
+            writer_options (dict): writer class constructor keyword arguments.
+
+        Returns:
+            int: number of bytes written to disk.
+        """
+        with open_export_file(file_name, compression) as f, db_connection() as conn:
+            cur = conn.execute(export_query)
+            writer = writer_class(f, table_name, [key[0] for key in cur.description], **writer_options)
+            writer.begin()
+            for rows in iter(lambda: cur.fetchmany(chunk_size or Exporter.chunk_size), []):
+                writer.write_rows(rows)
+            writer.end()
+            logger.debug('stored %s sales records to %s file', writer.rows_written, file_name)
+        return os.path.getsize(file_name)
+
     @staticmethod
-    def export_as_json(file_name):
+    def export_as_json(file_name, lines=False, chunk_size=None, compression=None):
         """
         Gets salespeople records from database and
-        Exports them to json file using json module.
+        Streams them to json file chunk by chunk, so memory usage doesn't depend on table size.
 
         Parameters:
             file_name (str): name of the file. Pass employee_filename function.
+            lines (bool): write JSON Lines (NDJSON) file, one json object per row, if True.
+            chunk_size (int): number of rows fetched from database and written at once.
+            compression (str): 'gz', 'bz2', 'xz', 'zip' or None. Detected by file extension if None.
 
         Returns:
-            str: json file content.
+            int: number of bytes written to disk.
 
         Raises:
             IOError: If file not found or path is incorrect.
             TypeError: If trying to pass NoneType instead of file.
         """
         try:
-            with open(file_name, "w") as f:
-                conn = create_connection()
-                cur = conn.cursor()
-                result = cur.execute('SELECT * FROM ' + table_name)
-                items = [dict(zip([key[0] for key in cur.description], row)) for row in result]
-                json_records = (json.dumps({table_name: items}))
-                logger.debug('json records to export: {}'.format(json_records))
-                f.write(json_records)
-                conn.close()
-                return json_records
+            return Exporter.stream_records(file_name, JsonLinesWriter if lines else JsonWriter, chunk_size, compression)
         except IOError as e:
-            logger.error('File {} not found or path is incorrect... {}'.format(file_name, e))
+            logger.error('File %s not found or path is incorrect... %s', file_name, e)
         except TypeError as e:
-            logger.error('Trying to pass NoneType {} instead of file... {}'.format(file_name, e))
+            logger.error('Trying to pass NoneType %s instead of file... %s', file_name, e)
 
     @staticmethod
-    def export_as_xml(file_name):
+    def export_as_xml(file_name, row_tag='row', column_tags=None, chunk_size=None, compression=None):
         """
-        Gets salespeople records from database and writes them to xml file.
+        Gets salespeople records from database and
+        Streams them to xml file chunk by chunk with escaped values.
+        File is not read back, use read_records() function to read it lazily.
 
         Parameters:
             file_name (str): name of the file. Pass employee_filename function.
+            row_tag (str): row element name.
+            column_tags (dict): column name to element name mapping, e.g. {'name': 'seller', 'amount': 'total'}.
+                                Only mapped columns are written. All columns are written by default.
+            chunk_size (int): number of rows fetched from database and written at once.
+            compression (str): 'gz', 'bz2', 'xz', 'zip' or None. Detected by file extension if None.
 
         Returns:
-            str: xml file content.
+            int: number of bytes written to disk.
 
         Raises:
             IOError: If file not found or path is incorrect.
             TypeError: If trying to pass NoneType instead of file.
+            ValueError: If row_tag or column_tags are not valid xml element names or columns.
         """
         try:
-            with open(file_name, 'w') as f:
-                f.write('<?xml version="1.0" ?>\n')
-                f.write('<employees>\n')
-                for row in view_db_records():
-                    f.write('  <row>\n')
-                    f.write('    <id>{}</id>\n'.format(row[0]))
-                    f.write('    <name>{}</name>\n'.format(row[1]))
-                    f.write('    <sales>{}</sales>\n'.format(row[2]))
-                    f.write('    <amount>{}</amount>\n'.format(row[3]))
-                    f.write('  </row>\n')
-                f.write('</employees>\n')
-                logger.debug('stored sales records to xml {} file'.format(file_name))
-            with open(file_name, 'r') as file:
-                content = file.read()
-            return content
+            return Exporter.stream_records(file_name, XmlWriter, chunk_size, compression,
+                                           row_tag=row_tag, column_tags=column_tags)
         except IOError as e:
-            logger.error('File {} not found or path is incorrect... {}'.format(file_name, e))
+            logger.error('File %s not found or path is incorrect... %s', file_name, e)
         except TypeError as e:
-            logger.error('Trying to pass NoneType {} instead of file... {}'.format(file_name, e))
+            logger.error('Trying to pass NoneType %s instead of file... %s', file_name, e)
 
     @staticmethod
-    def export_as_csv(file_name):
+    def export_as_csv(file_name, chunk_size=None, compression=None):
         """
-        Gets salespeople records from database and writes them to csv file.
+        Gets salespeople records from database and
+        Streams them to csv file chunk by chunk.
+        File is not read back, use read_records() function to read it lazily.
 
         Parameters:
             file_name (str): name of the file.  Pass employee_filename function.
+            chunk_size (int): number of rows fetched from database and written at once.
+            compression (str): 'gz', 'bz2', 'xz', 'zip' or None. Detected by file extension if None.
 
         Returns:
-            _io.TextIOWrapper: file object.
+            int: number of bytes written to disk.
 
         Raises:
             IOError: If file not found or path is incorrect.
             TypeError: If trying to pass NoneType instead of file.
         """
-        conn = create_connection()
-        cur = conn.cursor()
-        cur.execute('SELECT * FROM ' + table_name)
         try:
-            with open(file_name, 'w') as f:
-                writer = csv.writer(f)
-                writer.writerow(["ID", "Name", 'Number of Sales', 'Total Amount ($)'])
-                for row in cur:
-                    writer.writerow(row)
-                logger.debug('stored sales records to csv {} file'.format(file_name))
-            with open(file_name, 'r') as file:
-                content = file.read()
-            conn.close()
-            return content
+            return Exporter.stream_records(file_name, CsvWriter, chunk_size, compression,
+                                           **Exporter.formats['csv'][1])
         except IOError as e:
-            logger.error('File {} not found or path is incorrect... {}'.format(file_name, e))
+            logger.error('File %s not found or path is incorrect... %s', file_name, e)
         except TypeError as e:
-            logger.error('Trying to pass NoneType {} instead of file... {}'.format(file_name, e))
+            logger.error('Trying to pass NoneType %s instead of file... %s', file_name, e)
+
+    @staticmethod
+    def export_all(file_names, chunk_size=None, compression=None, parallel=False):
+        """
+        Gets salespeople records from database once and
+        Streams every chunk of rows to several files in different formats.
+        Usage example: Exporter.export_all({'json': 'records.json', 'csv': 'records.csv'})
+
+        Parameters:
+            file_names (dict): export format ('json', 'jsonl', 'xml' or 'csv') to name of the file.
+            chunk_size (int): number of rows fetched from database and written at once.
+            compression (str): 'gz', 'bz2', 'xz', 'zip' or None. Detected by file extensions if None.
+            parallel (bool): write every format in its own thread if True, e.g. to compress files in parallel.
+
+        Returns:
+            dict: export format to number of bytes written to disk.
+
+        Raises:
+            ValueError: If export format is not supported.
+        """
+        with db_connection() as conn:
+            cur = conn.execute(export_query)
+            chunks = iter(lambda: cur.fetchmany(chunk_size or Exporter.chunk_size), [])
+            Exporter.write_all(file_names, [key[0] for key in cur.description], chunks, compression, parallel)
+        return {export_format: os.path.getsize(file_name) for export_format, file_name in file_names.items()}
+
+    @staticmethod
+    def write_all(file_names, columns, chunks, compression=None, parallel=False):
+        """
+        Streams every chunk of rows to several files in different formats.
+        Is used by export_all() and by sales stores keeping records outside of database.
+
+        Parameters:
+            file_names (dict): export format ('json', 'jsonl', 'xml' or 'csv') to name of the file.
+            columns (list): column names of the rows.
+            chunks (iterable): chunks (lists) of rows.
+            compression (str): 'gz', 'bz2', 'xz', 'zip' or None. Detected by file extensions if None.
+            parallel (bool): write every format in its own thread if True, e.g. to compress files in parallel.
+
+        Raises:
+            ValueError: If export format is not supported.
+        """
+        unknown_formats = set(file_names) - set(Exporter.formats)
+        if unknown_formats:
+            raise ValueError('Unsupported export format(s): {}'.format(', '.join(sorted(unknown_formats))))
+        with ExitStack() as stack:
+            writers = []
+            for export_format, file_name in file_names.items():
+                writer_class, writer_options = Exporter.formats[export_format]
+                f = stack.enter_context(open_export_file(file_name, compression))
+                writers.append(writer_class(f, table_name, columns, **writer_options))
+            if parallel:
+                Exporter._write_in_threads(writers, chunks)
+            else:
+                for writer in writers:
+                    writer.begin()
+                for rows in chunks:
+                    for writer in writers:
+                        writer.write_rows(rows)
+                for writer in writers:
+                    writer.end()
+            logger.debug('stored sales records to %s files in one pass', ', '.join(file_names.values()))
+
+    @staticmethod
+    def _write_in_threads(writers, chunks):
+        """
+        Writes chunks of rows with every writer in its own thread.
+        Chunks are passed through bounded queues, so a slow writer doesn't make chunks pile up in memory.
+
+        Parameters:
+            writers (list): writers from exporter.writers module.
+            chunks (iterator): chunks of database rows.
+
+        Raises:
+            Exception: the first exception raised by a writer thread.
+        """
+        errors = []
+
+        def write(writer, chunks_queue):
+            try:
+                writer.begin()
+                for rows in iter(chunks_queue.get, None):
+                    writer.write_rows(rows)
+                writer.end()
+            except Exception as e:
+                errors.append(e)
+                for _ in iter(chunks_queue.get, None):  # draining queue, so the reader is not blocked
+                    pass
+
+        queues = [queue.Queue(maxsize=4) for _ in writers]
+        threads = [threading.Thread(target=write, args=(writer, chunks_queue), daemon=True)
+                   for writer, chunks_queue in zip(writers, queues)]
+        for thread in threads:
+            thread.start()
+        try:
+            for rows in chunks:
+                for chunks_queue in queues:
+                    chunks_queue.put(rows)
+        finally:
+            for chunks_queue in queues:
+                chunks_queue.put(None)
+            for thread in threads:
+                thread.join()
+        if errors:
+            raise errors[0]
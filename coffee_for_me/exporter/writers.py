@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+import csv
+import json
+import logging
+import re
+
+logger = logging.getLogger('main.argparsing.exporter.writers')
+
+# xml element name: letter or underscore followed by letters, digits, '_', '-' or '.'
+xml_name = re.compile(r'[^\W\d][\w.-]*\Z')
+
+
+def escape(value):
+    """
+    Escapes '&', '<' and '>' in xml element text, the same as xml.sax.saxutils.escape().
+    xml.sax.saxutils is not imported, it pulls urllib and email packages in and slows down the app start.
+
+    Parameters:
+        value (str): element text.
+
+    Returns:
+        str: escaped element text.
+    """
+    return value.replace('&', '&amp;').replace('>', '&gt;').replace('<', '&lt;')
+
+
+class JsonWriter:
+    """
+    JsonWriter class streams database rows to json file chunk by chunk: {"table": [{"column": value}, ...]}.
+    Only one chunk of rows is kept in memory, output is the same as json.dumps() of all rows.
+
+    Attributes:
+        f (_io.TextIOWrapper): file object opened for writing.
+        root (str): json root key, e.g. table name.
+        columns (list): column names used as json keys.
+    """
+
+    def __init__(self, f, root, columns):
+        """
+        The constructor for JsonWriter class.
+
+        Attributes:
+            f (_io.TextIOWrapper): file object opened for writing.
+            root (str): json root key, e.g. table name.
+            columns (list): column names used as json keys.
+        """
+        self.f = f
+        self.root = root
+        self.columns = columns
+        self.rows_written = 0
+
+    def begin(self):
+        """Writes json opening part."""
+        self.f.write('{' + json.dumps(self.root) + ': [')
+
+    def write_rows(self, rows):
+        """
+        Writes chunk of rows as json objects.
+
+        Parameters:
+            rows (list): database rows, e.g. returned by cursor.fetchmany()
+        """
+        items = [json.dumps(dict(zip(self.columns, row))) for row in rows]
+        if items:
+            self.f.write((', ' if self.rows_written else '') + ', '.join(items))
+            self.rows_written += len(items)
+
+    def end(self):
+        """Writes json closing part."""
+        self.f.write(']}')
+        logger.debug('wrote %s json records', self.rows_written)
+
+
+class JsonLinesWriter(JsonWriter):
+    """
+    JsonLinesWriter class streams database rows to JSON Lines (NDJSON) file: one json object per line.
+    Inherits JsonWriter class.
+    """
+
+    def begin(self):
+        """JSON Lines file has no opening part."""
+
+    def write_rows(self, rows):
+        """
+        Writes chunk of rows as json objects, one per line.
+
+        Parameters:
+            rows (list): database rows, e.g. returned by cursor.fetchmany()
+        """
+        self.f.write(''.join(json.dumps(dict(zip(self.columns, row))) + '\n' for row in rows))
+        self.rows_written += len(rows)
+
+    def end(self):
+        """JSON Lines file has no closing part."""
+        logger.debug('wrote %s json lines records', self.rows_written)
+
+
+class XmlWriter:
+    """
+    XmlWriter class streams database rows to xml file chunk by chunk.
+    Values are escaped, every chunk of rows is rendered to one string and written with a single write call.
+    Default layout:
+        <?xml version="1.0" ?>
+        <root>
+          <row>
+            <column>value</column>
+          </row>
+        </root>
+
+    Attributes:
+        f (_io.TextIOWrapper): file object opened for writing.
+        root (str): root element name, e.g. table name.
+        columns (list): column names of written rows.
+        row_tag (str): row element name.
+        column_tags (dict): column name to element name mapping. Columns missing in mapping are not written.
+        indent (str): indentation of one nesting level.
+    """
+
+    def __init__(self, f, root, columns, row_tag='row', column_tags=None, indent='  '):
+        """
+        The constructor for XmlWriter class.
+
+        Attributes:
+            f (_io.TextIOWrapper): file object opened for writing.
+            root (str): root element name, e.g. table name.
+            columns (list): column names of written rows.
+            row_tag (str): row element name.
+            column_tags (dict): column name to element name mapping. All columns are written by default.
+            indent (str): indentation of one nesting level.
+
+        Raises:
+            ValueError: If element name is not a valid xml name or column_tags has a column not in columns.
+        """
+        self.f = f
+        self.root = root
+        self.columns = columns
+        self.row_tag = row_tag
+        self.column_tags = column_tags or {column: column for column in columns}
+        self.indent = indent
+        self.rows_written = 0
+        unknown = [column for column in self.column_tags if column not in columns]
+        if unknown:
+            raise ValueError('Unknown columns in column_tags: {}, use some of: {}'.format(', '.join(map(str, unknown)),
+                                                                                         ', '.join(columns)))
+        invalid = [tag for tag in (root, row_tag) + tuple(self.column_tags.values())
+                   if not isinstance(tag, str) or not xml_name.match(tag)]
+        if invalid:
+            raise ValueError('Invalid xml element names: {}'.format(', '.join(map(repr, invalid))))
+        # one row is rendered with a single str.format() call of the row template
+        self._indexes = [columns.index(column) for column in self.column_tags]
+        elements = ''.join('{0}{0}<{1}>{{}}</{1}>\n'.format(indent, tag) for tag in self.column_tags.values())
+        self._row_template = '{0}<{1}>\n{2}{0}</{1}>\n'.format(indent, row_tag, elements)
+
+    def begin(self):
+        """Writes xml declaration and root element opening tag."""
+        self.f.write('<?xml version="1.0" ?>\n<{}>\n'.format(self.root))
+
+    def write_rows(self, rows):
+        """
+        Writes chunk of rows as xml elements.
+
+        Parameters:
+            rows (list): database rows, e.g. returned by cursor.fetchmany()
+        """
+        render = self._row_template.format
+        indexes = self._indexes
+        if indexes != list(range(len(self.columns))):
+            rows = [[row[index] for index in indexes] for row in rows]
+        # only strings containing markup characters need escaping, numbers are written as is
+        self.f.write(''.join([render(*[(escape(value) if '&' in value or '<' in value or '>' in value else value)
+                                       if type(value) is str else value for value in row]) for row in rows]))
+        self.rows_written += len(rows)
+
+    def end(self):
+        """Writes root element closing tag."""
+        self.f.write('</{}>\n'.format(self.root))
+        logger.debug('wrote %s xml records', self.rows_written)
+
+
+class CsvWriter:
+    """
+    CsvWriter class streams database rows to csv file chunk by chunk.
+
+    Attributes:
+        f (_io.TextIOWrapper): file object opened for writing.
+        root (str): table name, not written to csv file.
+        columns (list): column names of written rows.
+        header (list): header row. Column names are used by default.
+    """
+
+    def __init__(self, f, root, columns, header=None):
+        """
+        The constructor for CsvWriter class.
+
+        Attributes:
+            f (_io.TextIOWrapper): file object opened for writing.
+            root (str): table name, not written to csv file.
+            columns (list): column names of written rows.
+            header (list): header row. Column names are used by default.
+        """
+        self.f = f
+        self.root = root
+        self.columns = columns
+        self.header = header or columns
+        self.rows_written = 0
+        self._writer = csv.writer(f)
+
+    def begin(self):
+        """Writes header row."""
+        self._writer.writerow(self.header)
+
+    def write_rows(self, rows):
+        """
+        Writes chunk of rows as csv lines.
+
+        Parameters:
+            rows (list): database rows, e.g. returned by cursor.fetchmany()
+        """
+        self._writer.writerows(rows)
+        self.rows_written += len(rows)
+
+    def end(self):
+        """Csv file has no closing part."""
+        logger.debug('wrote %s csv records', self.rows_written)
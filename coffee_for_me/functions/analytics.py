@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+from coffee_for_me.functions.db_funcs import db_connection, begin_read, table_name, sales_table_name
+from coffee_for_me.functions.rollups import salesperson_daily_table, item_daily_table
+from coffee_for_me.functions.colors import Colors
+from coffee_for_me.functions.money import format_cents
+import logging
+import sqlite3
+
+logger = logging.getLogger('main.argparsing.functions.analytics')
+
+# time bucket to SQL expression of sale UTC timestamp ('YYYY-MM-DD HH:MM:SS.SSS') naming the bucket
+periods = {
+    'hour': "substr(s.sold_at, 1, 13) || ':00'",  # '2020-01-02 10:00'
+    'day': 'substr(s.sold_at, 1, 10)',  # '2020-01-02'
+    'week': "strftime('%Y-W%W', s.sold_at)",  # '2020-W01', weeks start on Monday
+}
+
+# time bucket to SQL expression of daily rollup day ('YYYY-MM-DD') naming the same bucket
+rollup_periods = {
+    'day': 's.day',
+    'week': "strftime('%Y-W%W', s.day)",
+}
+
+
+def use_rollups(period, start=None, end=None):
+    """bool: Check if sales can be summed up from daily rollup tables: buckets and period bounds are whole days"""
+    return period in rollup_periods and all(bound is None or len(bound) == 10 for bound in (start, end))
+
+
+def period_filter(start=None, end=None, column='s.sold_at'):
+    """
+    Creates WHERE clause selecting sales sold in [start, end) period.
+
+    Parameters:
+        start (str): period start UTC timestamp, e.g. '2020-01-01'. No lower bound by default.
+        end (str): period end UTC timestamp (excluded). No upper bound by default.
+        column (str): column compared with period bounds, e.g. 's.day' of daily rollup table.
+
+    Returns:
+        tuple: WHERE clause (empty if there are no bounds) and its parameters.
+    """
+    conditions, params = [], []
+    if start is not None:
+        conditions.append(column + ' >= ?')
+        params.append(start)
+    if end is not None:
+        conditions.append(column + ' < ?')
+        params.append(end)
+    return (' WHERE ' + ' AND '.join(conditions) if conditions else ''), params
+
+
+def salespeople_sales_by_period(period='day', start=None, end=None):
+    """
+    Selects number of sold beverages and additions and sales amount per salesperson per time bucket
+    With one GROUP BY query: over salesperson daily rollup table for days and weeks (if period bounds are days)
+    Or over covering index of sales table.
+
+    Parameters:
+        period (str): time bucket: 'hour', 'day' or 'week'.
+        start (str): period start UTC timestamp. All sales by default.
+        end (str): period end UTC timestamp (excluded).
+
+    Returns:
+        list: (salesperson name, bucket, beverages, additions, amount in cents) rows ordered by name and bucket.
+
+    Raises:
+        ValueError: If period is not supported.
+        sqlite3.Error: If error when trying to select from sales table.
+    """
+    if period not in periods:
+        raise ValueError('Unsupported period "{}", use one of: {}'.format(period, ', '.join(periods)))
+    if use_rollups(period, start, end):
+        source = salesperson_daily_table
+        where, params = period_filter(start, end, 's.day')
+        select = ('SELECT s.employee_id, ' + rollup_periods[period] + ' AS bucket, SUM(s.beverages) AS beverages,'
+                  ' SUM(s.additions) AS additions, SUM(s.amount_cents) AS amount FROM ' + source + ' s')
+    else:
+        source = sales_table_name
+        where, params = period_filter(start, end)
+        select = ('SELECT s.employee_id, ' + periods[period] + " AS bucket, SUM(s.kind = 'beverage') AS beverages,"
+                  " SUM(s.kind = 'addition') AS additions, SUM(s.price_cents) AS amount FROM " + source + ' s')
+    query = ('SELECT e.name, b.bucket, b.beverages, b.additions, b.amount FROM (' + select + where +
+             ' GROUP BY s.employee_id, bucket) b JOIN ' + table_name + ' e ON e.id = b.employee_id'
+             ' ORDER BY e.name, b.bucket')
+    try:
+        with db_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        logger.debug('selected %s salespeople sales by %s from %s table', len(rows), period, source)
+        return rows
+    except sqlite3.Error as e:
+        logger.error('Error when selecting salespeople sales by %s from %s table... %s', period, source, e)
+
+
+def items_sales(start=None, end=None):
+    """
+    Selects number of sales and sales amount per sold beverage and addition, best sellers first.
+    Item daily rollup table is read if period bounds are days, sales table otherwise.
+
+    Parameters:
+        start (str): period start UTC timestamp. All sales by default.
+        end (str): period end UTC timestamp (excluded).
+
+    Returns:
+        list: (kind, item, number of sales, amount in cents) rows.
+
+    Raises:
+        sqlite3.Error: If error when trying to select from sales table.
+    """
+    if use_rollups('day', start, end):
+        source = item_daily_table
+        where, params = period_filter(start, end, 's.day')
+        select = 'SELECT s.kind, s.item, SUM(s.sales) AS number, SUM(s.amount_cents) AS amount FROM ' + source + ' s'
+    else:
+        source = sales_table_name
+        where, params = period_filter(start, end)
+        select = 'SELECT s.kind, s.item, COUNT(*) AS number, SUM(s.price_cents) AS amount FROM ' + source + ' s'
+    query = select + where + ' GROUP BY s.kind, s.item ORDER BY number DESC, amount DESC, s.item'
+    try:
+        with db_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        logger.debug('selected %s items sales from %s table', len(rows), source)
+        return rows
+    except sqlite3.Error as e:
+        logger.error('Error when selecting items sales from %s table... %s', source, e)
+
+
+def attach_rate(beverages, additions):
+    """
+    Calculates attach rate: share of sold beverages sold with an addition.
+    Every sale has one beverage and at most one addition, so it is additions per beverage.
+
+    Parameters:
+        beverages (int): number of sold beverages.
+        additions (int): number of sold additions.
+
+    Returns:
+        float: attach rate from 0.0 to 1.0, 0.0 if no beverages were sold.
+    """
+    return round(additions / beverages, 4) if beverages else 0.0
+
+
+def summarize(sales_rows, item_rows, period='day', top=5):
+    """
+    Sums up salespeople sales by period and items sales into analytics report in one pass over every list.
+
+    Parameters:
+        sales_rows (list): rows returned by salespeople_sales_by_period() function.
+        item_rows (list): rows returned by items_sales() function.
+        period (str): time bucket of sales_rows: 'hour', 'day' or 'week'.
+        top (int): number of best selling beverages and additions.
+
+    Returns:
+        dict: analytics report, see sales_analytics() function.
+    """
+    revenue, salespeople = {}, {}
+    for name, bucket, beverages, additions, amount in sales_rows:
+        bucket_totals = revenue.setdefault(bucket, [0, 0, 0])
+        person = salespeople.setdefault(name, {'name': name, 'beverages': 0, 'additions': 0, 'amount_cents': 0,
+                                               'trend': []})
+        bucket_totals[0] += beverages
+        bucket_totals[1] += additions
+        bucket_totals[2] += amount
+        person['beverages'] += beverages
+        person['additions'] += additions
+        person['amount_cents'] += amount
+        person['trend'].append({'period': bucket, 'beverages': beverages, 'additions': additions,
+                                'amount_cents': amount})
+    for person in salespeople.values():
+        person['attach_rate'] = attach_rate(person['beverages'], person['additions'])
+    top_items = {'beverage': [], 'addition': []}
+    for kind, item, number, amount in item_rows:
+        if len(top_items[kind]) < top:
+            top_items[kind].append({'item': item, 'sales': number, 'amount_cents': amount})
+    beverages = sum(totals[0] for totals in revenue.values())
+    additions = sum(totals[1] for totals in revenue.values())
+    return {
+        'period': period,
+        'revenue': [{'period': bucket, 'beverages': totals[0], 'additions': totals[1], 'amount_cents': totals[2]}
+                    for bucket, totals in sorted(revenue.items())],
+        'top_beverages': top_items['beverage'],
+        'top_additions': top_items['addition'],
+        'attach_rate': attach_rate(beverages, additions),
+        'salespeople': sorted(salespeople.values(), key=lambda person: person['amount_cents'], reverse=True),
+    }
+
+
+def sales_analytics(period='day', start=None, end=None, top=5):
+    """
+    Computes sales analytics from sales table or its daily rollups: revenue per time bucket, top beverages
+    And additions, attach rate of additions to beverages and per-salesperson trends.
+    Both queries run in one read transaction, so they read the same snapshot of database.
+    Usage example: sales_analytics('week', '2020-01-01', '2020-04-01', top=3)
+
+    Parameters:
+        period (str): time bucket: 'hour', 'day' or 'week'.
+        start (str): period start UTC timestamp, e.g. '2020-01-01'. All sales by default.
+        end (str): period end UTC timestamp (excluded).
+        top (int): number of best selling beverages and additions.
+
+    Returns:
+        dict: {'period': str, 'revenue': [{'period', 'beverages', 'additions', 'amount_cents'}, ...],
+               'top_beverages': [{'item', 'sales', 'amount_cents'}, ...], 'top_additions': [...],
+               'attach_rate': float, 'salespeople': [{'name', 'beverages', 'additions', 'amount_cents',
+               'attach_rate', 'trend': [{'period', 'beverages', 'additions', 'amount_cents'}, ...]}, ...]}
+               Salespeople are ordered by amount, best sellers first.
+
+    Raises:
+        ValueError: If period is not supported.
+    """
+    try:
+        with db_connection() as conn:  # nested db functions share the connection and the read transaction
+            begin_read(conn)
+            sales_rows = salespeople_sales_by_period(period, start, end)
+            item_rows = items_sales(start, end)
+    except sqlite3.Error as e:  # already logged by the failed query
+        logger.debug('sales analytics are not available... %s', e)
+        sales_rows = item_rows = None
+    return summarize(sales_rows or [], item_rows or [], period, top)
+
+
+def show_sales_analytics(analytics):
+    """
+    Printing sales analytics report to Manager.
+
+    Parameters:
+        analytics (dict): report returned by sales_analytics() function.
+    """
+    def header(title):
+        print(Colors.GREEN + title + Colors.RESET)
+
+    header('Revenue by {}'.format(analytics['period']))
+    print('{:<20}\t|\t{:<10}\t|\t{:<10}\t|\t{}'.format('Period', 'Beverages', 'Additions', 'Amount ($)'))
+    for row in analytics['revenue']:
+        print('{:<20}\t|\t{:<10}\t|\t{:<10}\t|\t{}'.format(row['period'], row['beverages'], row['additions'],
+                                                          format_cents(row['amount_cents'])))
+    for title, items in (('Top beverages', analytics['top_beverages']), ('Top additions', analytics['top_additions'])):
+        header('\n' + title)
+        for number, row in enumerate(items, start=1):
+            print('{}. {:<20}\t{} sales\t{}$'.format(number, row['item'], row['sales'],
+                                                    format_cents(row['amount_cents'])))
+    header('\nAttach rate: {:.1%} of beverages are sold with an addition'.format(analytics['attach_rate']))
+    header('\nSalespeople trends')
+    for person in analytics['salespeople']:
+        trend = ', '.join('{}: {}$'.format(row['period'], format_cents(row['amount_cents']))
+                          for row in person['trend'])
+        print('{:<20}\t{}$\tattach rate {:.1%}\t{}'.format(person['name'], format_cents(person['amount_cents']),
+                                                          person['attach_rate'], trend))
+    print()
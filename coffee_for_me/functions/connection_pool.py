@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+from contextlib import contextmanager
+import atexit
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger('main.argparsing.functions.connection_pool')
+
+# pragmas applied once to every new connection
+default_pragmas = (('foreign_keys', 'ON'),)
+
+# pragmas applied on top of default ones when WAL mode is enabled with enable_wal() function
+wal_pragmas = (('journal_mode', 'WAL'), ('synchronous', 'NORMAL'))
+
+# settings used for new connection pools, can be changed with configure_pools() function
+pool_settings = {'size': 4, 'lifetime': 600.0, 'pragmas': default_pragmas, 'retries': 8, 'retry_delay': 0.02}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def apply_pragmas(conn, pragmas):
+    """
+    Applies pragmas to sqlite3 connection.
+
+    Parameters:
+        conn (sqlite3.Connection): connection to database.
+        pragmas (tuple): pairs of pragma name and value, e.g. (('foreign_keys', 'ON'),)
+
+    Returns:
+        sqlite3.Connection: connection to database.
+    """
+    for pragma, value in pragmas:
+        conn.execute('PRAGMA {}={}'.format(pragma, value))
+    return conn
+
+
+def is_busy_error(error):
+    """
+    Checks if sqlite3 error is raised because database is locked by another connection (SQLITE_BUSY/SQLITE_LOCKED).
+
+    Parameters:
+        error (sqlite3.Error): raised sqlite3 error.
+
+    Returns:
+        bool: True if database is busy, False if not.
+    """
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ('locked' in message or 'busy' in message)
+
+
+class ConnectionPool:
+    """
+    ConnectionPool class keeps opened sqlite3 connections to one database file and reuses them.
+    Pragmas are applied once when a connection is opened.
+    Idle connections older than lifetime or opened to a removed/replaced database file are closed.
+    Connections released after the pool was closed are closed too.
+
+    Attributes:
+        db_path (str): database file path.
+        size (int): maximum number of idle connections kept open.
+        lifetime (float): number of seconds a connection is reused for.
+        pragmas (tuple): pairs of pragma name and value applied to every new connection.
+        retries (int): number of times transaction() method retries transaction if database is busy.
+        retry_delay (float): number of seconds to wait before the first retry, doubled for every next one.
+    """
+
+    def __init__(self, db_path, size=4, lifetime=600.0, pragmas=default_pragmas, retries=8, retry_delay=0.02):
+        """
+        The constructor for ConnectionPool class.
+
+        Attributes:
+            db_path (str): database file path.
+            size (int): maximum number of idle connections kept open.
+            lifetime (float): number of seconds a connection is reused for.
+            pragmas (tuple): pairs of pragma name and value applied to every new connection.
+            retries (int): number of times transaction() method retries transaction if database is busy.
+            retry_delay (float): number of seconds to wait before the first retry, doubled for every next one.
+        """
+        self.db_path = db_path
+        self.size = size
+        self.lifetime = lifetime
+        self.pragmas = pragmas
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._idle = []
+        self._opened = {}
+        self._closed = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _file_id(self):
+        """tuple: Get device and inode of database file or None if file does not exist"""
+        try:
+            stat = os.stat(self.db_path)
+            return stat.st_dev, stat.st_ino
+        except OSError:
+            return None
+
+    def _open(self):
+        """
+        Opens new connection to database file and applies pragmas.
+
+        Returns:
+            sqlite3.Connection: connection to database.
+        """
+        conn = apply_pragmas(sqlite3.connect(self.db_path, check_same_thread=False), self.pragmas)
+        self._opened[id(conn)] = (time.monotonic(), self._file_id())
+        logger.debug('opened pooled connection to %s', self.db_path)
+        return conn
+
+    def _close(self, conn):
+        self._opened.pop(id(conn), None)
+        conn.close()
+        logger.debug('closed pooled connection to %s', self.db_path)
+
+    def _is_usable(self, conn):
+        """bool: Get True if connection is not expired and database file was not removed or replaced"""
+        opened_at, file_id = self._opened[id(conn)]
+        return time.monotonic() - opened_at < self.lifetime and file_id == self._file_id()
+
+    def acquire(self):
+        """
+        Gets idle connection from pool or opens a new one.
+
+        Returns:
+            sqlite3.Connection: connection to database.
+        """
+        with self._lock:
+            while self._idle:
+                conn = self._idle.pop()
+                if self._is_usable(conn):
+                    return conn
+                self._close(conn)
+            return self._open()
+
+    def release(self, conn):
+        """
+        Returns connection to pool. Connection is closed if pool is closed or full or connection is not usable.
+
+        Parameters:
+            conn (sqlite3.Connection): connection returned by acquire() method.
+        """
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size and self._is_usable(conn):
+                self._idle.append(conn)
+            else:
+                self._close(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager holding one transaction on a pooled connection.
+        Commits on exit or rolls back if an exception was raised.
+        Nested usage in the same thread reuses the connection and the outermost block commits.
+        If an exception was raised in a nested block, its writes may be partial, so the outermost block
+        Rolls back and re-raises it, even if the exception was caught in between (e.g. logged by a db function).
+
+        Yields:
+            sqlite3.Connection: connection to database.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            try:
+                yield conn
+            except Exception as e:
+                self._local.error = e
+                raise
+            return
+        conn = self.acquire()
+        self._local.conn = conn
+        self._local.error = None
+        try:
+            with conn:
+                yield conn
+                if self._local.error is not None:  # nested block failed and the exception was caught
+                    raise self._local.error
+        finally:
+            if conn.in_transaction:  # failed commit leaves transaction open
+                conn.rollback()
+            self._local.conn = None
+            self._local.error = None
+            self.release(conn)
+
+    def transaction(self, func, *args):
+        """
+        Runs func(conn, *args) in one transaction on a pooled connection.
+        If database is busy (locked by another process) the whole transaction is rolled back and retried
+        With exponential backoff and jitter. Nested calls run in the outer transaction, which is retried instead.
+
+        Parameters:
+            func (function): function taking sqlite3.Connection as the first argument.
+            args (tuple): other func arguments.
+
+        Returns:
+            object: func return value.
+
+        Raises:
+            sqlite3.OperationalError: If database is still busy after all retries.
+        """
+        if getattr(self._local, 'conn', None) is not None:
+            with self.connection() as conn:
+                return func(conn, *args)
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            try:
+                with self.connection() as conn:
+                    return func(conn, *args)
+            except sqlite3.OperationalError as e:
+                if attempt == self.retries or not is_busy_error(e):
+                    raise
+                logger.warning('%s is busy, retrying transaction in %.3fs... %s', self.db_path, delay, e)
+                time.sleep(delay * (1 + random.random()))
+                delay *= 2
+
+    def close(self):
+        """Closes all idle connections. Connections in use are closed when they are released."""
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                self._close(self._idle.pop())
+            if self._opened:
+                logger.debug('%s pooled connections to %s are in use, closing them on release',
+                             len(self._opened), self.db_path)
+
+
+def get_pool(db_path):
+    """
+    Returns process-wide connection pool for database file. Pool is created on first use.
+
+    Parameters:
+        db_path (str): database file path.
+
+    Returns:
+        ConnectionPool: connection pool for database file.
+    """
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = _pools[db_path] = ConnectionPool(db_path, **pool_settings)
+        return pool
+
+
+def configure_pools(**settings):
+    """
+    Changes settings of connection pools. Already opened pools are closed, their connections in use
+    Are closed when released, so they are not reused with old settings.
+
+    Parameters:
+        settings (dict): size (int), lifetime (float), pragmas (tuple), retries (int) and/or retry_delay (float).
+    """
+    pool_settings.update(settings)
+    close_pools()
+    logger.info('connection pools configured: %s', pool_settings)
+
+
+def enable_wal(busy_timeout=5000):
+    """
+    Switches new connections to WAL journal mode, so readers and writers don't block each other,
+    And sets how long a connection waits for a lock before database is reported busy.
+    WAL mode is persistent: once enabled, database file stays in WAL mode for all processes.
+
+    Parameters:
+        busy_timeout (int): number of milliseconds to wait for a database lock.
+    """
+    configure_pools(pragmas=default_pragmas + wal_pragmas + (('busy_timeout', int(busy_timeout)),))
+
+
+def set_synchronous(synchronous):
+    """
+    Sets how often sqlite3 syncs database file to disk on commit for new connections, on top of other pragmas.
+    'FULL' - on every commit, 'NORMAL' - at WAL checkpoints in WAL mode, 'OFF' - never, leaving it to OS.
+    With 'OFF' committed transactions survive the app crash, but may be lost on OS crash or power failure.
+
+    Parameters:
+        synchronous (str): 'FULL', 'NORMAL' or 'OFF'.
+    """
+    pragmas = tuple(pragma for pragma in pool_settings['pragmas'] if pragma[0] != 'synchronous')
+    configure_pools(pragmas=pragmas + (('synchronous', synchronous),))
+
+
+def close_pools():
+    """Closes all idle connections of all connection pools."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+atexit.register(close_pools)
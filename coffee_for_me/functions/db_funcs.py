@@ -1,16 +1,89 @@
 #!/usr/bin/env python3
+from coffee_for_me.functions.connection_pool import get_pool, apply_pragmas, pool_settings, enable_wal
+from coffee_for_me.functions.migrations import migrate
+from coffee_for_me.functions.rollups import add_to_rollups, rebuild_rollups, item_daily_table
+from datetime import datetime, timedelta, timezone
 import sqlite3
 import logging
+import re
 
 db_name = 'employees.db'
 table_name = 'employees'
+sales_table_name = 'sales'
+
+# salespeople records with amounts converted from cents to dollars, used for exports
+export_query = 'SELECT id, name, sales, amount / 100.0 AS amount FROM ' + table_name
+
+# columns salespeople records can be sorted by, see view_db_records_page()
+record_columns = ('id', 'name', 'sales', 'amount')
 
 logger = logging.getLogger('main.argparsing.functions.db_funcs')
 
+# ISO 8601 date and time: 'YYYY-MM-DD[( |T)HH:MM[:SS[.ffffff]]][Z|+HH:MM|-HHMM]'
+timestamp_pattern = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6})\d*)?)?)?'
+                               r'(Z|[+-]\d{2}:?\d{2})?\Z')
+
+
+def current_timestamp():
+    """str: Get current UTC time as sale timestamp: 'YYYY-MM-DD HH:MM:SS.SSS'"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+
 
-def create_connection():
+def parse_timestamp(value):
     """
-    Creates connection to sqlite3 database.
+    Converts ISO 8601 date and time to sale timestamp: UTC 'YYYY-MM-DD HH:MM:SS.SSS'.
+    Sales are compared and grouped by timestamp strings, so every stored sold_at must have this format.
+    Time without UTC offset is UTC, e.g. '2020-01-02T12:00:00+02:00' -> '2020-01-02 10:00:00.000',
+    '2020-01-02' -> '2020-01-02 00:00:00.000'.
+
+    Parameters:
+        value (str): date and time.
+
+    Returns:
+        str: UTC timestamp.
+
+    Raises:
+        ValueError: If value is not a valid ISO 8601 date and time.
+    """
+    match = timestamp_pattern.match(value.strip()) if isinstance(value, str) else None
+    if match is None:
+        raise ValueError('"{}" is not a valid date and time, use YYYY-MM-DD HH:MM:SS.SSS'.format(value))
+    *parts, fraction, offset = match.groups()
+    try:
+        moment = datetime(*(int(part or 0) for part in parts), int((fraction or '0').ljust(6, '0')))
+    except ValueError as e:
+        raise ValueError('"{}" is not a valid date and time... {}'.format(value, e))
+    if offset and offset != 'Z':
+        minutes = int(offset[1:3]) * 60 + int(offset[-2:])
+        moment -= timedelta(minutes=minutes if offset[0] == '+' else -minutes)
+    return '{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}.{:03d}'.format(moment.year, moment.month, moment.day,
+                                                                    moment.hour, moment.minute, moment.second,
+                                                                    moment.microsecond // 1000)
+
+
+def timestamp_to_datetime(value):
+    """
+    Converts sale timestamp (or any ISO 8601 date and time accepted by parse_timestamp()) to UTC datetime.
+
+    Parameters:
+        value (str): date and time, e.g. '2020-01-02 10:00:00.000'.
+
+    Returns:
+        datetime: timezone aware UTC date and time.
+
+    Raises:
+        ValueError: If value is not a valid ISO 8601 date and time.
+    """
+    return datetime.strptime(parse_timestamp(value), '%Y-%m-%d %H:%M:%S.%f').replace(tzinfo=timezone.utc)
+
+
+def create_connection(check_same_thread=True):
+    """
+    Creates new (not pooled) connection to sqlite3 database with pragmas applied.
+    Use db_connection() function to get pooled connection.
+
+    Parameters:
+        check_same_thread (bool): if False, the connection can be used by other threads (one at a time).
 
     Returns:
         sqlite3.Connection: connection to database.
@@ -19,33 +92,84 @@ def create_connection():
         sqlite3.Error: If error when trying to create connection.
     """
     try:
-        conn = sqlite3.connect(db_name)
-        logger.debug('created connection to {}'.format(db_name))
+        conn = apply_pragmas(sqlite3.connect(db_name, check_same_thread=check_same_thread), pool_settings['pragmas'])
+        logger.debug('created connection to %s', db_name)
         return conn
     except sqlite3.Error as e:
-        logger.error('could not create connection... {}'.format(e))
+        logger.error('could not create connection... %s', e)
     return None
 
 
+def data_version(conn):
+    """
+    Gets database data version seen by the connection (PRAGMA data_version).
+    It changes every time another connection, of this or another process, commits changes to database.
+
+    Parameters:
+        conn (sqlite3.Connection): connection to database, which is not used for writing.
+
+    Returns:
+        int: data version.
+    """
+    return conn.execute('PRAGMA data_version').fetchone()[0]
+
+
+def db_connection():
+    """
+    Returns context manager holding one transaction on a pooled connection to sqlite3 database.
+    Nested db_connection() blocks in the same thread share the connection and the transaction,
+    E.g. wrap several db functions calls into 'with db_connection():' to commit them once.
+
+    Returns:
+        contextlib._GeneratorContextManager: context manager yielding sqlite3.Connection.
+    """
+    return get_pool(db_name).connection()
+
+
+def begin_read(conn):
+    """
+    Starts transaction on connection if it is not in one, so the following SELECT statements read one snapshot
+    Of database (sqlite3 module doesn't start transactions for SELECT statements). It ends when the block commits.
+
+    Parameters:
+        conn (sqlite3.Connection): connection returned by db_connection().
+    """
+    if not conn.in_transaction:
+        conn.execute('BEGIN')
+
+
+def db_transaction(func, *args):
+    """
+    Runs func(conn, *args) in one transaction on a pooled connection to sqlite3 database.
+    Transaction is rolled back and retried with backoff if database is locked by another process.
+
+    Parameters:
+        func (function): function taking sqlite3.Connection as the first argument.
+        args (tuple): other func arguments.
+
+    Returns:
+        object: func return value.
+    """
+    return get_pool(db_name).transaction(func, *args)
+
+
 def create_table():
     """
-    Creates sqlite3 database table if it doesn't exist already.
+    Creates sqlite3 database tables and indexes if they don't exist already
+    By applying missing schema migrations. Call it once at the app start.
+
+    Returns:
+        int: database schema version.
 
     Raises:
-        sqlite3.Error: If error when trying to create db table.
+        sqlite3.Error: If error when trying to migrate db schema.
     """
-    conn = create_connection()
     try:
-        cur = conn.cursor()
-        cur.execute(
-            'CREATE TABLE IF NOT EXISTS ' + table_name +
-            ' (id INTEGER PRIMARY KEY, name text, sales integer, amount integer)')
-        conn.commit()
-        logger.debug('created {} if not exists already'.format(table_name))
+        version = db_transaction(migrate)
+        logger.debug('database schema version is %s', version)
+        return version
     except sqlite3.Error as e:
-        logger.error('could not create table {}... {}'.format(table_name, e))
-    finally:
-        conn.close()
+        logger.error('could not create table %s... %s', table_name, e)
 
 
 def is_employee_in_db(name):
@@ -62,21 +186,17 @@ def is_employee_in_db(name):
     Raises:
         sqlite3.Error: If error when trying to fetch salesperson from table.
     """
-    conn = create_connection()
     try:
-        cur = conn.cursor()
-        cur.execute('SELECT * FROM ' + table_name + ' WHERE name=?', (name,))
-        row = cur.fetchall()
-        if name in [i[1] for i in row]:
-            logger.debug('{} is found in {} table'.format(name, table_name))
+        with db_connection() as conn:
+            row = conn.execute('SELECT 1 FROM ' + table_name + ' WHERE name=? LIMIT 1', (name,)).fetchone()
+        if row:
+            logger.debug('%s is found in %s table', name, table_name)
             return True
         else:
-            logger.debug('{} is not found in {} table'.format(name, table_name))
+            logger.debug('%s is not found in %s table', name, table_name)
             return False
     except sqlite3.Error as e:
-        logger.error('error when fetching employee from table... {}'.format(e))
-    finally:
-        conn.close()
+        logger.error('error when fetching employee from table... %s', e)
 
 
 def insert_db_record(name, sales, amount):
@@ -87,22 +207,18 @@ def insert_db_record(name, sales, amount):
     Parameters:
         name (str): Salesperson's full name.
         sales (int): Salesperson's number of sales. Call Salesperson.count_sales()
-        amount (float): Salesperson's sales total amount. Call Salesperson.total_sales_amount()()
+        amount (int): Salesperson's sales total amount in cents. Call Salesperson.total_sales_amount()
 
     Raises:
         sqlite3.Error: If error when trying to insert salesperson record into table.
     """
-    conn = create_connection()
     try:
-        cur = conn.cursor()
         # NULL will be replaced by id
-        cur.execute('INSERT INTO ' + table_name + ' VALUES (NULL,?,?,?)', (name, sales, amount))
-        conn.commit()
-        logger.debug('{} was added to {} table'.format(name, table_name))
+        db_transaction(lambda conn: conn.execute('INSERT INTO ' + table_name + ' VALUES (NULL,?,?,?)',
+                                                 (name, sales, amount)))
+        logger.debug('%s was added to %s table', name, table_name)
     except sqlite3.Error as e:
-        logger.error('error when inserting employee {} into {} table... {}'.format(name, table_name, e))
-    finally:
-        conn.close()
+        logger.error('error when inserting employee %s into %s table... %s', name, table_name, e)
 
 
 def update_db_record(name, sales, amount):
@@ -113,23 +229,199 @@ def update_db_record(name, sales, amount):
     Parameters:
         name (str): Salesperson's full name.
         sales (int): Salesperson's number of sales. Call Salesperson.count_sales()
-        amount (float): Salesperson's sales total amount. Call Salesperson.total_sales_amount()()
+        amount (int): Salesperson's sales total amount in cents. Call Salesperson.total_sales_amount()
 
     Raises:
         sqlite3.Error: If error when trying to update salesperson record in table.
     """
-    conn = create_connection()
     try:
-        cur = conn.cursor()
-        cur.execute('UPDATE ' + table_name + ' SET amount=?, sales=? WHERE name=?', (amount, sales, name))
-        conn.commit()
-        logger.debug('{} record was updated in {} table with {} sales and {} amount'.
-                     format(name, table_name, sales, amount))
+        db_transaction(lambda conn: conn.execute('UPDATE ' + table_name + ' SET amount=?, sales=? WHERE name=?',
+                                                 (amount, sales, name)))
+        logger.debug('%s record was updated in %s table with %s sales and %s amount', name, table_name, sales, amount)
+    except sqlite3.Error as e:
+        logger.error('error updating %s record in %s table with %s sales and %s amount... %s',
+                     name, table_name, sales, amount, e)
+
+
+def record_sale(name, sales, amount, items=(), sold_at=None):
+    """
+    Records salesperson's sale in database in one transaction.
+    Inserts salesperson record if there is no one yet, otherwise adds sales and amount to the existing record
+    With one statement. Sale line items are stored to sales table with the same timestamp.
+
+    Parameters:
+        name (str): Salesperson's full name.
+        sales (int): number of sold beverages and ingredients in the sale.
+        amount (int): sale amount in cents.
+        items (list): sale line items: (kind, item, price in cents) tuples. Use parse_sale_record() function.
+        sold_at (str): sale UTC timestamp, 'YYYY-MM-DD HH:MM:SS.SSS'. Current time is used by default.
+
+    Returns:
+        bool: True if sale was recorded, False if not.
+
+    Raises:
+        sqlite3.Error: If error when trying to upsert salesperson record or insert sale line items.
+    """
+    sold_at = sold_at or current_timestamp()
+    try:
+        db_transaction(upsert_sale, name, sales, amount, items, sold_at)
+        logger.debug('%s sale with %s sales and %s amount was recorded in %s table', name, sales, amount, table_name)
+        return True
     except sqlite3.Error as e:
-        logger.error('error updating {} record in {} table with {} sales and {} amount... {}'.
-                     format(name, table_name, sales, amount, e))
-    finally:
-        conn.close()
+        logger.error('error recording %s sale with %s sales and %s amount in %s table... %s',
+                     name, sales, amount, table_name, e)
+    return False
+
+
+def upsert_sale(conn, name, sales, amount, items, sold_at):
+    """
+    Adds sale to salesperson record (inserting it if needed), stores sale line items and adds them to daily rollups.
+    Use record_sale() function, which runs it in a transaction.
+
+    Parameters:
+        conn (sqlite3.Connection): connection to database.
+        name (str): Salesperson's full name.
+        sales (int): number of sold beverages and ingredients in the sale.
+        amount (int): sale amount in cents.
+        items (list): sale line items: (kind, item, price in cents) tuples.
+        sold_at (str): sale UTC timestamp, 'YYYY-MM-DD HH:MM:SS.SSS'.
+    """
+    conn.execute('INSERT INTO ' + table_name + ' (name, sales, amount) VALUES (?,?,?)'
+                 ' ON CONFLICT(name) DO UPDATE SET sales = sales + excluded.sales,'
+                 ' amount = amount + excluded.amount', (name, sales, amount))
+    if items:
+        employee_id = conn.execute('SELECT id FROM ' + table_name + ' WHERE name=?', (name,)).fetchone()[0]
+        conn.executemany('INSERT INTO ' + sales_table_name +
+                         ' (employee_id, sold_at, kind, item, price_cents) VALUES (?,?,?,?,?)',
+                         [(employee_id, sold_at, kind, item, price) for kind, item, price in items])
+        add_to_rollups(conn, [(employee_id, items, sold_at)])
+
+
+def record_sales_batch(sales):
+    """
+    Records batch of sales in database in one transaction. Sales are summed up per salesperson first,
+    So every salesperson record is upserted once and all sale line items are inserted with one executemany() call.
+
+    Parameters:
+        sales (list): (name, items, sold_at) tuples: Salesperson's full name, sale line items
+            ((kind, item, price in cents) tuples) and sale UTC timestamp or None for current time.
+
+    Returns:
+        bool: True if sales were recorded, False if not.
+
+    Raises:
+        sqlite3.Error: If error when trying to upsert salespeople records or insert sale line items.
+    """
+    now = current_timestamp()
+    try:
+        db_transaction(upsert_sales_batch, [(name, items, sold_at or now) for name, items, sold_at in sales])
+        logger.debug('batch of %s sales was recorded in %s table', len(sales), table_name)
+        return True
+    except sqlite3.Error as e:
+        logger.error('error recording batch of %s sales in %s table... %s', len(sales), table_name, e)
+    return False
+
+
+def upsert_sales_batch(conn, sales):
+    """
+    Adds batch of sales to salespeople records (inserting them if needed), stores sale line items
+    And adds them to daily rollups. Use record_sales_batch() function, which runs it in a transaction.
+
+    Parameters:
+        conn (sqlite3.Connection): connection to database.
+        sales (list): (name, items, sold_at) tuples, sold_at is required.
+    """
+    totals = {}
+    for name, items, _ in sales:
+        total = totals.setdefault(name, [0, 0])
+        total[0] += len(items)
+        total[1] += sum(price for _, _, price in items)
+    conn.executemany('INSERT INTO ' + table_name + ' (name, sales, amount) VALUES (?,?,?)'
+                     ' ON CONFLICT(name) DO UPDATE SET sales = sales + excluded.sales,'
+                     ' amount = amount + excluded.amount',
+                     [(name, number, cents) for name, (number, cents) in totals.items()])
+    ids = {}
+    for name in totals:
+        ids[name] = conn.execute('SELECT id FROM ' + table_name + ' WHERE name=?', (name,)).fetchone()[0]
+    conn.executemany('INSERT INTO ' + sales_table_name +
+                     ' (employee_id, sold_at, kind, item, price_cents) VALUES (?,?,?,?,?)',
+                     [(ids[name], sold_at, kind, item, price)
+                      for name, items, sold_at in sales for kind, item, price in items])
+    add_to_rollups(conn, [(ids[name], items, sold_at) for name, items, sold_at in sales])
+
+
+def view_item_sales(item=None):
+    """
+    Selects number of sales and sales amount per sold beverage and ingredient from daily rollup of sales table.
+
+    Parameters:
+        item (str): beverage or ingredient name to select. All items are selected by default.
+
+    Returns:
+        list: List of (kind, item, number of sales, amount in cents) rows.
+
+    Raises:
+        sqlite3.Error: If error when trying to select from item daily rollup table.
+    """
+    query = 'SELECT kind, item, SUM(sales), SUM(amount_cents) FROM ' + item_daily_table
+    try:
+        with db_connection() as conn:
+            if item is None:
+                rows = conn.execute(query + ' GROUP BY item, kind ORDER BY item').fetchall()
+            else:
+                rows = conn.execute(query + ' WHERE item=? GROUP BY item, kind', (item,)).fetchall()
+        logger.debug('selected %s item sales from %s table', item or 'all', item_daily_table)
+        return rows
+    except sqlite3.Error as e:
+        logger.error('Error when selecting item sales from %s table... %s', item_daily_table, e)
+
+
+def rebuild_rollup_tables():
+    """
+    Rebuilds daily rollup tables (sales per salesperson per day and per item per day) from sales table
+    In one transaction. Rollups are kept up to date when sales are recorded, rebuild them if sales table
+    Was changed another way.
+
+    Returns:
+        int: number of salesperson daily rows or None if rollups were not rebuilt.
+
+    Raises:
+        sqlite3.Error: If error when trying to rebuild rollup tables.
+    """
+    try:
+        return db_transaction(rebuild_rollups)
+    except sqlite3.Error as e:
+        logger.error('error rebuilding daily rollup tables... %s', e)
+
+
+def view_sales_in_period(start, end, name=None):
+    """
+    Selects sale line items sold in [start, end) period, optionally for one salesperson only.
+    Usage example: view_sales_in_period('2020-01-01', '2020-02-01', 'Tony Ynot')
+
+    Parameters:
+        start (str): period start UTC timestamp, e.g. '2020-01-01' or '2020-01-01 12:00:00'.
+        end (str): period end UTC timestamp (excluded).
+        name (str): Salesperson's full name. All salespeople sales are selected by default.
+
+    Returns:
+        list: List of (salesperson name, sold_at, kind, item, price in cents) rows ordered by sold_at.
+
+    Raises:
+        sqlite3.Error: If error when trying to select from sales table.
+    """
+    query = ('SELECT e.name, s.sold_at, s.kind, s.item, s.price_cents FROM ' + sales_table_name + ' s'
+             ' JOIN ' + table_name + ' e ON e.id = s.employee_id WHERE s.sold_at >= ? AND s.sold_at < ?')
+    try:
+        with db_connection() as conn:
+            if name is None:
+                rows = conn.execute(query + ' ORDER BY s.sold_at, s.id', (start, end)).fetchall()
+            else:
+                rows = conn.execute(query + ' AND e.name=? ORDER BY s.sold_at, s.id', (start, end, name)).fetchall()
+        logger.debug('selected sales from %s to %s from %s table', start, end, sales_table_name)
+        return rows
+    except sqlite3.Error as e:
+        logger.error('Error when selecting sales in period from %s table... %s', sales_table_name, e)
 
 
 def view_db_records():
@@ -137,22 +429,58 @@ def view_db_records():
     Selects all salespeople records from table.
 
     Returns:
-        list: List of all salespeople records from table.
+        list: List of all salespeople records from table: (id, name, sales, amount in cents) rows.
 
     Raises:
         sqlite3.Error: If error when trying to select salespeople from table.
     """
-    conn = create_connection()
     try:
-        cur = conn.cursor()
-        cur.execute('SELECT * FROM ' + table_name)
-        rows = cur.fetchall()
-        logger.debug('selected all salespeople records from {} table'.format(table_name))
+        with db_connection() as conn:
+            rows = conn.execute('SELECT * FROM ' + table_name).fetchall()
+        logger.debug('selected all salespeople records from %s table', table_name)
         return rows
     except sqlite3.Error as e:
-        logger.error('Error when viewing employee records in {} table... {}'.format(table_name, e))
-    finally:
-        conn.close()
+        logger.error('Error when viewing employee records in %s table... %s', table_name, e)
+
+
+def view_db_records_page(order_by='id', descending=False, limit=None, offset=0):
+    """
+    Selects one page of salespeople records sorted by database. Totals of all salespeople records are computed
+    By the same query (window functions), so records are read once.
+    Usage example: view_db_records_page('amount', descending=True, limit=10) selects top 10 salespeople.
+
+    Parameters:
+        order_by (str): column to sort by: 'id', 'name', 'sales' or 'amount'. Ties are sorted by id.
+        descending (bool): sort in descending order if True.
+        limit (int): maximum number of records on the page. All records by default.
+        offset (int): number of records before the page.
+
+    Returns:
+        tuple: page rows ((id, name, sales, amount in cents) tuples) and totals of all salespeople records:
+            {'salespeople': int, 'sales': int, 'amount_cents': int}. None if records could not be selected.
+
+    Raises:
+        ValueError: If records can't be sorted by the column.
+        sqlite3.Error: If error when trying to select salespeople from table.
+    """
+    if order_by not in record_columns:
+        raise ValueError('Unsupported sort column "{}", use one of: {}'.format(order_by, ', '.join(record_columns)))
+    order = order_by + (' DESC' if descending else '') + ('' if order_by == 'id' else ', id')
+    query = ('SELECT id, name, sales, amount, COUNT(*) OVER (), SUM(sales) OVER (), SUM(amount) OVER () FROM '
+             + table_name + ' ORDER BY ' + order + ' LIMIT ? OFFSET ?')
+    try:
+        with db_connection() as conn:
+            begin_read(conn)  # fallback totals query reads the same snapshot
+            rows = conn.execute(query, (-1 if limit is None else limit, offset)).fetchall()
+            if rows:
+                totals = rows[0][4:]
+            else:  # page after the last one
+                totals = conn.execute('SELECT COUNT(*), SUM(sales), SUM(amount) FROM ' + table_name).fetchone()
+        logger.debug('selected %s salespeople records from %s table sorted by %s', len(rows), table_name, order)
+        return ([row[:4] for row in rows],
+                {'salespeople': totals[0], 'sales': totals[1] or 0, 'amount_cents': totals[2] or 0})
+    except sqlite3.Error as e:
+        logger.error('Error when viewing page of employee records in %s table... %s', table_name, e)
 
 
 def is_table_empty():
@@ -166,18 +494,14 @@ def is_table_empty():
     Raises:
         sqlite3.Error: sqlite3.Error: If error when trying to select salespeople from table.
     """
-    conn = create_connection()
     try:
-        cur = conn.cursor()
-        cur.execute('SELECT * FROM ' + table_name)
-        rows = cur.fetchall()
-        logger.debug('selected all salespeople records from {} table'.format(table_name))
-        if not rows:
+        with db_connection() as conn:
+            row = conn.execute('SELECT 1 FROM ' + table_name + ' LIMIT 1').fetchone()
+        logger.debug('checked if there are salespeople records in %s table', table_name)
+        if not row:
             print('There are no sales records. Ask your salespeople to sell something...\n')
-            logger.info('there are no sales records in {} table yet'.format(table_name))
+            logger.info('there are no sales records in %s table yet', table_name)
             return True
     except sqlite3.Error as e:
-        logger.error('unable to select from {}...'.format(table_name, e))
-    finally:
-        conn.close()
+        logger.error('unable to select from %s... %s', table_name, e)
     return False
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 from coffee_for_me.functions.colors import Colors
+from coffee_for_me.functions.money import price_to_cents, format_cents
 import re
 import logging
 import os
@@ -49,11 +50,10 @@ def employee_filename(subfolder, fullname, file_ending):
     try:
         file_path = os.path.join(subfolder, file_name)
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        logger.debug('{} file created'.format(file_path))
+        logger.debug('%s file created', file_path)
         return file_path
     except FileExistsError as e:
-        logger.error('Target subfolder "{}" exists, but it is not a directory (maybe a file)... {}'
-                     .format(subfolder, e))
+        logger.error('Target subfolder "%s" exists, but it is not a directory (maybe a file)... %s', subfolder, e)
 
 
 def get_item_to_sell(item_name, available_items):
@@ -71,22 +71,22 @@ def get_item_to_sell(item_name, available_items):
     for item in available_items:
         print(Colors.GREEN + item + Colors.RESET)
     item_to_sell = input('Enter ' + item_name + ' name: \n')
-    logger.debug('salesperson wants to sell {}'.format(item_to_sell))
+    logger.debug('salesperson wants to sell %s', item_to_sell)
     return item_to_sell
 
 
 def enter_price(item):
     """
-    Returns beverage or ingredient price from user input. User input validation:
+    Returns beverage or ingredient price in cents from user input. User input validation:
     Price should be greater than zero.
     Price should be only positive integer or float.
-    The following prices can be accepted, e.g: 4, 4.0, 4.3, 4.39, 4.45687
+    The following prices can be accepted, e.g: 4, 4.0, 4.3, 4.39, 4.45687 (rounded half up to 446 cents)
 
     Parameters:
         item (str): 'beverage' or 'ingredient' string.
 
     Returns:
-        str: beverage or addition price.
+        int: beverage or addition price in cents. Use format_cents() function to print it.
 
     Raises:
         ValueError: If price is not a number.
@@ -94,100 +94,130 @@ def enter_price(item):
     while True:
         user_price = input('Enter ' + item + ' price: \n')
         try:
-            item_price = float(user_price)
+            item_price = price_to_cents(user_price)
             if item_price < 0:
                 print('You can enter only positive integers or floats.\nTry Again!')
                 continue
             break
         except ValueError:
             print('"{}" is not a number. You can enter only positive integers or floats\nTry again!'.format(user_price))
-    logger.debug('salesperson wants to set price "{}"'.format(str(item_price)))
-    return str(item_price)
+    logger.debug('salesperson wants to set price "%s" cents', item_price)
+    return item_price
 
 
 def beverage_to_file(file_name, beverage_record='Default beverage'):
     """
-    Writes beverage record to file in 'append' mode
+    Writes beverage record to file in 'append' mode.
+    File is not read back, use read_records() function to read records lazily.
 
     Parameters:
         file_name (str): pass Salesperson.employee_filename() function.
         beverage_record (str): pass Salesperson.add_beverage() method. 'Default beverage' is default value.
 
+    Returns:
+        str: written text.
+
     Raises:
         IOError: If file not found or path is incorrect.
         TypeError: If trying to pass NoneType instead of file.
     """
     try:
+        content = beverage_record + '\n'
         with open(file_name, 'a') as f:
-            f.write(beverage_record + '\n')
-            logger.debug('wrote beverage "{}" to {} file'.format(beverage_record, file_name))
-        with open(file_name, 'r') as file:
-            content = file.read()
+            f.write(content)
+            logger.debug('wrote beverage "%s" to %s file', beverage_record, file_name)
         return content
     except IOError as e:
-        logger.error('File {} not found or path is incorrect... {}'.format(file_name, e))
+        logger.error('File %s not found or path is incorrect... %s', file_name, e)
     except TypeError as e:
-        logger.error('Trying to pass NoneType {} instead of file... {}'.format(file_name, e))
+        logger.error('Trying to pass NoneType %s instead of file... %s', file_name, e)
 
 
 def beverage_addition_to_file(file_name, beverage_record='Default beverage', addition_record='Default addition'):
     """
     Writes beverage and ingredient record to file in 'append' mode.
+    File is not read back, use read_records() function to read records lazily.
 
     Parameters:
         file_name (str): pass Salesperson.employee_filename() function.
         beverage_record (str): pass Salesperson.add_beverage() method. 'Default beverage' is default value.
         addition_record (str): pass Salesperson.beverage_addition_to_file() method. 'Default addition' is default value.
 
+    Returns:
+        str: written text.
+
     Raises:
         IOError: If file not found or path is incorrect.
         TypeError: If trying to pass NoneType instead of file.
     """
     try:
+        content = beverage_record + '\n' + addition_record + '\n'
         with open(file_name, 'a') as f:
-            f.write(beverage_record + '\n')
-            f.write(addition_record + '\n')
-            logger.debug('wrote beverage "{}" and addition {} to {} file'.
-                         format(beverage_record, addition_record, file_name))
-        with open(file_name, 'r') as file:
-            content = file.read()
+            f.write(content)
+            logger.debug('wrote beverage "%s" and addition %s to %s file', beverage_record, addition_record, file_name)
         return content
     except IOError as e:
-        logger.error('File {} not found or path is incorrect... {}'.format(file_name, e))
+        logger.error('File %s not found or path is incorrect... %s', file_name, e)
     except TypeError as e:
-        logger.error('Trying to pass NoneType {} instead of file... {}'.format(file_name, e))
+        logger.error('Trying to pass NoneType %s instead of file... %s', file_name, e)
+
+
+def read_records(file_name, offset=0):
+    """
+    Lazily reads records from file line by line, starting at byte offset.
+    Usage example: for record in read_records('salesperson_records/Jim Mij_records.txt'): print(record)
+
+    Parameters:
+        file_name (str): pass Salesperson.employee_filename() function.
+        offset (int): byte offset to start reading from, e.g. file size before the last write.
+
+    Yields:
+        str: record without trailing new line.
+
+    Raises:
+        IOError: If file not found or path is incorrect.
+    """
+    with open(file_name, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            yield line.decode().rstrip('\n')
 
 
-def show_sales_table(employees):
+def show_sales_table(employees, totals=None):
     """
     Printing formatted table with salespeople records to Manager.
 
     Parameters:
-        employees (list): list of salespeople returned by view_db_records() function.
+        employees (list): list of salespeople returned by view_db_records() function, amounts are in cents.
+        totals (dict): totals of all salespeople records, e.g. computed by database for a page of records:
+            {'sales': int, 'amount_cents': int}. Summed up from employees by default.
 
     Raises:
         TypeError: If cannot iterate over empty/non-existing salespeople list.
     """
     try:
-        sales_sum = sum([pair[2] for pair in employees])
-        amount_sum = round(sum([pair[3] for pair in employees]), 2)
-        logger.debug('number of sales sum: {}, total amount sum: {}'.format(str(sales_sum), str(amount_sum)))
+        if totals is None:
+            sales_sum = sum(pair[2] for pair in employees)
+            amount_sum = sum(pair[3] for pair in employees)
+        else:
+            sales_sum, amount_sum = totals['sales'], totals['amount_cents']
+        logger.debug('number of sales sum: %s, total amount sum: %s', sales_sum, amount_sum)
         seller_name = Colors.GREEN + 'Seller Name' + Colors.RESET
         num_of_sales = Colors.GREEN + 'Number Of Sales' + Colors.RESET
         total_val = Colors.GREEN + 'Total Value ($)' + Colors.RESET
         # printing sales records in formatted table
         print('{:<39}\t|\t{:<5}\t|\t{}'.format(seller_name, num_of_sales, total_val))
         for _, name, sales, amount in employees:
-            print('{:<30}\t|\t{:<15}\t|\t{}'.format(name, sales, amount))
-        print('{:<30}\t|\t{:<15}\t|\t{}\t\n'.format('Total:', sales_sum, amount_sum))
+            print('{:<30}\t|\t{:<15}\t|\t{}'.format(name, sales, format_cents(amount)))
+        print('{:<30}\t|\t{:<15}\t|\t{}\t\n'.format('Total:', sales_sum, format_cents(amount_sum)))
     except TypeError as e:
-        logger.info('Cannot iterate over empty/non-existing employees list... {}'.format(e))
+        logger.info('Cannot iterate over empty/non-existing employees list... %s', e)
 
 
 def match_price(total_price_list, regexp, line):
     """
-    Appends prices to list by provided regexp. Can be used in:
-    Salesperson.total_sales_amount() method to calculate total price.
+    Appends price found in line by provided regexp to the list.
+    Sale records are parsed by records_parser module, which is faster for records files.
 
     Parameters:
         total_price_list (list): empty list.
@@ -200,5 +230,5 @@ def match_price(total_price_list, regexp, line):
     result = re.findall(regexp, line)
     price = float(result[0])
     total_price_list.append(price)
-    logger.debug('total price list: {}'.format(str(total_price_list)))
+    logger.debug('price %s added to total price list', price)
     return total_price_list
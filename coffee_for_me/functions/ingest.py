@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+from coffee_for_me.employees.employee import Employee
+from coffee_for_me.functions.db_funcs import parse_timestamp
+from coffee_for_me.functions.money import price_to_cents
+from coffee_for_me.functions.journal import record_line
+from coffee_for_me.store.sqlite_store import SqliteStore
+from functools import lru_cache
+from itertools import islice
+import csv
+import json
+import logging
+import sys
+
+logger = logging.getLogger('main.argparsing.functions.ingest')
+
+# columns of csv file (keys of json lines) with sales, addition and sold_at are optional
+sale_fields = ('salesperson', 'beverage', 'beverage_price', 'addition', 'addition_price', 'sold_at')
+
+
+def read_sales(stream, input_format='csv'):
+    """
+    Lazily reads sales from csv file with header or JSON Lines file, one sale per row/line.
+    Usage example of csv file:
+        salesperson,beverage,beverage_price,addition,addition_price,sold_at
+        Tony,tea,4.0,sugar,1.5,2020-01-02 10:00:00.000
+        Liza,soda,3,,,
+
+    Parameters:
+        stream (_io.TextIOWrapper): opened file or sys.stdin.
+        input_format (str): 'csv' or 'jsonl'.
+
+    Yields:
+        dict: sale with sale_fields keys. ValueError instead of sale if json line is not a valid json object,
+            so ingest_sales() rejects it the same as invalid sale and goes on with the next lines.
+
+    Raises:
+        ValueError: If input format is not supported.
+    """
+    if input_format == 'csv':
+        yield from csv.DictReader(stream)
+    elif input_format == 'jsonl':
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                sale = json.loads(line)
+            except ValueError as e:
+                yield ValueError('line {} is not valid json: {}'.format(line_number, e))
+                continue
+            yield sale if isinstance(sale, dict) else ValueError('line {} is not a json object'.format(line_number))
+    else:
+        raise ValueError('Unsupported input format "{}", use csv or jsonl'.format(input_format))
+
+
+def _item_price(sale, field):
+    """int: Get validated non-negative price in cents of sale field"""
+    try:
+        price = price_to_cents(sale.get(field))
+    except ValueError:
+        raise ValueError('"{}" is not a valid {}'.format(sale.get(field), field))
+    if price < 0:
+        raise ValueError('{} should not be negative'.format(field))
+    return price
+
+
+@lru_cache(maxsize=1024)
+def _fullname(name):
+    """str: Get salesperson's fullname, the same as Employee.fullname"""
+    return Employee(name, 'Salesperson').fullname
+
+
+def _can_be_sold(item, available_items):
+    """bool: Check if item (lower case) is in available items, lower case available items are checked first"""
+    return item in available_items or item in (x.lower() for x in available_items)
+
+
+def validate_sale(sale, available_beverages, available_additions):
+    """
+    Validates sale against available beverages and ingredients passed via command line arguments.
+
+    Parameters:
+        sale (dict): sale returned by read_sales() function.
+        available_beverages (list): Available beverages to sell.
+        available_additions (list): Available ingredients to sell.
+
+    Returns:
+        tuple: salesperson's fullname, sale line items ((kind, item, price in cents) tuples)
+            And sold_at converted to UTC 'YYYY-MM-DD HH:MM:SS.SSS' or None.
+
+    Raises:
+        ValueError: If salesperson is missing, item can't be sold, price is not a valid positive number
+            Or sold_at is not a valid date and time.
+    """
+    name = (sale.get('salesperson') or '').strip()
+    if not name:
+        raise ValueError('salesperson is missing')
+    beverage = (sale.get('beverage') or '').strip().lower()
+    if not _can_be_sold(beverage, available_beverages):
+        raise ValueError('beverage "{}" can not be sold'.format(beverage))
+    items = [('beverage', beverage, _item_price(sale, 'beverage_price'))]
+    addition = (sale.get('addition') or '').strip().lower()
+    if addition:
+        if not _can_be_sold(addition, available_additions):
+            raise ValueError('addition "{}" can not be sold'.format(addition))
+        items.append(('addition', addition, _item_price(sale, 'addition_price')))
+    sold_at = sale.get('sold_at')
+    return _fullname(name), items, parse_timestamp(sold_at) if sold_at else None
+
+
+def sale_records(items):
+    """
+    Creates salesperson's records file lines for sale line items, the same as Salesperson.add_beverage() does.
+
+    Parameters:
+        items (list): sale line items: (kind, item, price in cents) tuples.
+
+    Returns:
+        list: sale records, e.g. ['Beverage: tea. Price: 4.0$']
+    """
+    return [record_line(kind, item, price) for kind, item, price in items]
+
+
+def ingest_sales(sales, available_beverages, available_additions, batch_size=10000, store=None):
+    """
+    Validates sales and records them with sales store in batches: recorded in database in one transaction per batch
+    And appended to salespeople records files (or journals). Invalid sales are logged and skipped.
+    If database is not available, the failed batch and the following sales are not recorded, so they can be
+    Ingested again. Records files which could not be written are logged, their sales are recorded in database.
+
+    Parameters:
+        sales (iterable): sales returned by read_sales() function.
+        available_beverages (list): Available beverages to sell.
+        available_additions (list): Available ingredients to sell.
+        batch_size (int): number of sales recorded in one transaction.
+        store (SalesStore): store the sales are recorded to. SqliteStore with text records files by default.
+
+    Returns:
+        tuple: number of ingested sales and number of rejected sales.
+
+    Raises:
+        IOError: If database is not available.
+    """
+    store = store or SqliteStore()
+    ingested = rejected = 0
+    available_beverages = {x.lower() for x in available_beverages}
+    available_additions = {x.lower() for x in available_additions}
+    numbered_sales = enumerate(sales, start=1)
+    while True:
+        chunk = list(islice(numbered_sales, batch_size))
+        if not chunk:
+            break
+        batch = []
+        for number, sale in chunk:
+            try:
+                if isinstance(sale, ValueError):  # line read_sales() could not parse
+                    raise sale
+                batch.append(validate_sale(sale, available_beverages, available_additions))
+            except (ValueError, AttributeError) as e:
+                rejected += 1
+                logger.error('sale #%s %s is rejected... %s', number, sale, e)
+                print('Sale #{} is rejected: {}'.format(number, e), file=sys.stderr)
+        if batch:
+            records = [(fullname, sale_records(items), sold_at) for fullname, items, sold_at in batch]
+            if not store.record_sales(records):
+                logger.error('records files of batch of %s sales were not written completely', len(batch))
+                print('Records files of {} sales were not written completely, see coffee_for_me.log'.format(
+                    len(batch)), file=sys.stderr)
+            ingested += len(batch)
+            logger.info('ingested batch of %s sales', len(batch))
+    return ingested, rejected
+
+
+def ingest_file(file_name, available_beverages, available_additions, input_format=None, batch_size=10000,
+                store=None):
+    """
+    Ingests sales from csv or JSON Lines file or from standard input if file name is '-'.
+
+    Parameters:
+        file_name (str): name of the file or '-' for stdin.
+        available_beverages (list): Available beverages to sell.
+        available_additions (list): Available ingredients to sell.
+        input_format (str): 'csv' or 'jsonl'. Detected by file extension if None, stdin is csv by default.
+        batch_size (int): number of sales recorded in one transaction.
+        store (SalesStore): store the sales are recorded to. SqliteStore with text records files by default.
+
+    Returns:
+        tuple: number of ingested sales and number of rejected sales.
+    """
+    if input_format is None:
+        input_format = 'jsonl' if file_name.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+    if file_name == '-':
+        return ingest_sales(read_sales(sys.stdin, input_format), available_beverages, available_additions,
+                            batch_size, store)
+    with open(file_name, newline='') as f:
+        return ingest_sales(read_sales(f, input_format), available_beverages, available_additions, batch_size,
+                            store)
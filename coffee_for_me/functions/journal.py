@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+from coffee_for_me.functions.records_parser import read_sale_items
+from coffee_for_me.functions.money import format_cents
+from datetime import datetime, timezone
+import logging
+import mmap
+import os
+import struct
+import sys
+
+try:
+    import fcntl
+except ImportError:  # Windows: items file is reloaded before a new code is assigned, but not locked
+    fcntl = None
+
+logger = logging.getLogger('main.argparsing.functions.journal')
+
+# one sale line item: UTC timestamp in microseconds, kind (0 - beverage, 1 - addition), item code, price in cents
+record_struct = struct.Struct('<4q')
+record_fields = record_struct.size // 8  # number of 8 byte integers in one record
+kinds = ('beverage', 'addition')
+
+# journal records can be read as one flat array of 8 byte integers without copying on little endian machines
+_zero_copy = sys.byteorder == 'little'
+
+
+class SalesJournal:
+    """
+    SalesJournal class stores salesperson's sale line items in append-only binary journal file.
+    Every line item is a fixed-width record, so totals are summed up from memory-mapped file without parsing text.
+    Item names are stored once in items file next to the journal (one name per line, line number is the item code).
+    Items file is locked and reloaded before a new item is appended, so processes writing the same journal
+    Assign the same codes.
+
+    Attributes:
+        journal_file (str): journal file path, e.g. 'salesperson_records/Tony Ynot_journal.bin'.
+        items_file (str): item names file path: journal file path with '.items' extension.
+    """
+
+    def __init__(self, journal_file):
+        """
+        The constructor for SalesJournal class.
+
+        Attributes:
+            journal_file (str): journal file path. Pass employee_filename function.
+        """
+        self.journal_file = journal_file
+        self.items_file = os.path.splitext(journal_file)[0] + '.items'
+        self._items = None
+        self._codes = None
+
+    @property
+    def items(self):
+        """list: Get item names, index of the name is the item code"""
+        if self._items is None:
+            try:
+                with open(self.items_file, newline='\n') as f:
+                    self._load_items(f)
+            except FileNotFoundError:
+                self._items, self._codes = [], {}
+        return self._items
+
+    def _load_items(self, f):
+        """Reads item names from opened items file, names are separated by '\\n' only"""
+        f.seek(0)
+        self._items = f.read().split('\n')[:-1]
+        self._codes = {item: code for code, item in enumerate(self._items)}
+
+    def item_code(self, item):
+        """
+        Gets item code, new item name is appended to items file.
+        Items file is locked and reloaded first, the item may have been added by another process.
+
+        Parameters:
+            item (str): item name, e.g. 'tea'.
+
+        Returns:
+            int: item code.
+
+        Raises:
+            ValueError: If item name contains a line break.
+        """
+        if '\n' in item or '\r' in item:
+            raise ValueError('Item name {!r} should not contain line breaks'.format(item))
+        self.items  # loading item names on first use
+        if item not in self._codes:
+            with open(self.items_file, 'a+', newline='\n') as f:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # released when the file is closed
+                self._load_items(f)
+                if item not in self._codes:
+                    f.write(item + '\n')
+                    self._codes[item] = len(self._items)
+                    self._items.append(item)
+        return self._codes[item]
+
+    def append(self, items, sold_at=None):
+        """
+        Appends sale line items to journal with one write call.
+
+        Parameters:
+            items (list): sale line items: (kind, item, price in cents) tuples. Use parse_sale_record() function.
+            sold_at (datetime): sale time. Current UTC time is used by default.
+
+        Returns:
+            int: number of written bytes.
+        """
+        return self.append_sales([(items, sold_at)])
+
+    def append_sales(self, sales):
+        """
+        Appends line items of several sales to journal with one write call, every sale keeps its own time.
+
+        Parameters:
+            sales (list): (items, sold_at) tuples: sale line items ((kind, item, price in cents) tuples)
+                And sale time (datetime) or None for current UTC time.
+
+        Returns:
+            int: number of written bytes.
+        """
+        now = datetime.now(timezone.utc)
+        data = b''.join(record_struct.pack(int((sold_at or now).timestamp() * 1000000), kinds.index(kind),
+                                           self.item_code(item), price)
+                        for items, sold_at in sales for kind, item, price in items)
+        with open(self.journal_file, 'ab') as f:
+            f.write(data)
+        logger.debug('appended %s sale line items to %s journal', len(data) // record_struct.size, self.journal_file)
+        return len(data)
+
+    def totals(self):
+        """
+        Sums up journal records from memory-mapped journal file.
+        Prices and kinds are summed up through memoryview slices, no records are copied or unpacked.
+
+        Returns:
+            dict: number of sold beverages and additions and total amount in cents:
+                {'beverages': int, 'additions': int, 'amount_cents': int}
+        """
+        totals = {'beverages': 0, 'additions': 0, 'amount_cents': 0}
+        size = os.path.getsize(self.journal_file) if os.path.exists(self.journal_file) else 0
+        size -= size % record_struct.size  # partly written record at the end is ignored
+        if not size:
+            return totals
+        with open(self.journal_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if _zero_copy:
+                with memoryview(mm) as view, view[:size].cast('q') as values:
+                    records = len(values) // record_fields
+                    totals['additions'] = sum(values[1::record_fields])
+                    totals['amount_cents'] = sum(values[3::record_fields])
+            else:
+                records = size // record_struct.size
+                for _, kind, _, price in record_struct.iter_unpack(mm[:size]):
+                    totals['additions'] += kind
+                    totals['amount_cents'] += price
+        totals['beverages'] = records - totals['additions']
+        logger.debug('summed up %s records of %s journal', records, self.journal_file)
+        return totals
+
+    def records(self):
+        """
+        Lazily reads journal records.
+
+        Yields:
+            tuple: sold_at (datetime), kind ('beverage' or 'addition'), item name and price in cents.
+        """
+        if not os.path.exists(self.journal_file) or os.path.getsize(self.journal_file) < record_struct.size:
+            return
+        self._items = None  # reloading item names, other processes may have added items
+        items = self.items
+        with open(self.journal_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm) - len(mm) % record_struct.size
+            for timestamp, kind, code, price in record_struct.iter_unpack(mm[:size]):
+                yield (datetime.fromtimestamp(timestamp / 1000000, timezone.utc), kinds[kind], items[code],
+                       price)
+
+
+def record_line(kind, item, price):
+    """
+    Formats journal record as a records file line, e.g. 'Beverage: tea. Price: 4.0$'
+
+    Parameters:
+        kind (str): 'beverage' or 'addition'.
+        item (str): item name.
+        price (int): price in cents.
+
+    Returns:
+        str: sale record.
+    """
+    return '{}: {}. Price: {}$'.format(kind.capitalize(), item, format_cents(price))
+
+
+def convert_records_file(records_file, journal_file):
+    """
+    Converts salesperson's text records file to binary journal. Records file is not changed.
+    Text records have no sale time, so they get the conversion time.
+
+    Parameters:
+        records_file (str): salesperson's records file.
+        journal_file (str): journal file, records are appended to it if it exists.
+
+    Returns:
+        int: number of converted records.
+
+    Raises:
+        IOError: If records file not found or path is incorrect.
+    """
+    journal = SalesJournal(journal_file)
+    items = []
+    converted = 0
+    for item in read_sale_items(records_file):
+        items.append(item)
+        if len(items) == 10000:
+            converted += len(items)
+            journal.append(items)
+            items = []
+    if items:
+        converted += len(items)
+        journal.append(items)
+    logger.info('converted %s records from %s to %s journal', converted, records_file, journal_file)
+    return converted
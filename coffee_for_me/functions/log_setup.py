@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import atexit
+import logging
+import queue
+
+log_format = '%(asctime)s - %(name)s - %(funcName)s - %(levelname)s - %(message)s'
+
+# log file is rotated when it grows over max_bytes, backup_count old files are kept: coffee_for_me.log.1, ...
+log_settings = {'file_name': 'coffee_for_me.log', 'level': logging.INFO, 'max_bytes': 5 * 1024 * 1024,
+                'backup_count': 3}
+
+_listener = None
+_queue_handler = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    DeferredQueueHandler class puts log records to the queue as they are.
+    Inherits logging.handlers.QueueHandler, which formats the message in the logging thread.
+    Message is formatted from its '%' arguments by the writer thread, so don't log objects changed after the call.
+    """
+
+    def prepare(self, record):
+        """
+        Returns log record unchanged, formatting is left to the writer thread.
+
+        Parameters:
+            record (LogRecord): log record.
+
+        Returns:
+            LogRecord: the same log record.
+        """
+        return record
+
+
+def setup_logging(file_name=None, level=None, max_bytes=None, backup_count=None):
+    """
+    Creates 'main' logger, which only puts log records to a queue.
+    Records are formatted and written to rotating log file by a background thread, so logging doesn't slow sales down.
+    Log file is opened on the first logged message. Queued records are written at exit, see stop_logging().
+
+    Parameters:
+        file_name (str): log file name. log_settings are used for all not passed parameters.
+        level (int): logging level, e.g. logging.INFO.
+        max_bytes (int): log file size to rotate it at, 0 - never rotate.
+        backup_count (int): number of rotated log files to keep.
+
+    Returns:
+        Logger: 'main' logger.
+    """
+    global _listener, _queue_handler
+    stop_logging()
+    level = log_settings['level'] if level is None else level
+    # creating rotating File Handler used by the writer thread
+    file_handler = RotatingFileHandler(file_name or log_settings['file_name'], delay=True,
+                                       maxBytes=log_settings['max_bytes'] if max_bytes is None else max_bytes,
+                                       backupCount=log_settings['backup_count'] if backup_count is None
+                                       else backup_count)
+    file_handler.setLevel(level)
+    file_handler.setFormatter(logging.Formatter(log_format))
+    # creating logger writing to the queue
+    log_queue = queue.Queue()
+    _queue_handler = DeferredQueueHandler(log_queue)
+    logger = logging.getLogger('main')
+    logger.setLevel(level)
+    logger.addHandler(_queue_handler)
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    return logger
+
+
+def stop_logging():
+    """
+    Writes all queued log records, stops the writer thread and closes log file.
+    Is called at exit, does nothing if logging was not set up.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    logging.getLogger('main').removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = _queue_handler = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+from coffee_for_me.functions.rollups import rebuild_rollups
+import logging
+
+logger = logging.getLogger('main.argparsing.functions.migrations')
+
+
+def merge_duplicated_names(conn):
+    """
+    Merges duplicated salesperson rows (possible before unique index on name existed) into the first row
+    Keeping the biggest number of sales and amount, as rows stored salesperson's totals.
+
+    Parameters:
+        conn (sqlite3.Connection): connection to database.
+    """
+    conn.execute(
+        'UPDATE employees SET'
+        ' sales = (SELECT MAX(sales) FROM employees e WHERE e.name = employees.name),'
+        ' amount = (SELECT MAX(amount) FROM employees e WHERE e.name = employees.name)'
+        ' WHERE id IN (SELECT MIN(id) FROM employees GROUP BY name HAVING COUNT(*) > 1)')
+    conn.execute('DELETE FROM employees WHERE id NOT IN (SELECT MIN(id) FROM employees GROUP BY name)')
+
+
+# Ordered schema migration steps: (description, list of SQL statements and/or functions taking connection).
+# Step number N migrates database from version N - 1 to version N. Only append new steps to the end.
+migrations = [
+    ('create employees table',
+     ['CREATE TABLE IF NOT EXISTS employees (id INTEGER PRIMARY KEY, name text, sales integer, amount integer)']),
+    ('unique salesperson name',
+     [merge_duplicated_names,
+      'CREATE UNIQUE INDEX IF NOT EXISTS employees_name_idx ON employees (name)']),
+    ('sales line items table',
+     ['CREATE TABLE IF NOT EXISTS sales (id INTEGER PRIMARY KEY,'
+      ' employee_id INTEGER NOT NULL REFERENCES employees (id), sold_at text NOT NULL,'
+      ' kind text NOT NULL, item text NOT NULL, price_cents integer NOT NULL)',
+      'CREATE INDEX IF NOT EXISTS sales_employee_sold_at_idx ON sales (employee_id, sold_at)',
+      'CREATE INDEX IF NOT EXISTS sales_item_idx ON sales (item)']),
+    ('salespeople amounts in cents',
+     ['UPDATE employees SET amount = CAST(ROUND(amount * 100) AS INTEGER)']),
+    ('covering indexes for sales analytics',
+     ['DROP INDEX IF EXISTS sales_employee_sold_at_idx',  # prefix of the covering index below
+      'CREATE INDEX IF NOT EXISTS sales_employee_sold_at_cover_idx ON sales (employee_id, sold_at, kind, price_cents)',
+      'CREATE INDEX IF NOT EXISTS sales_sold_at_cover_idx ON sales (sold_at, employee_id, kind, item, price_cents)',
+      'CREATE INDEX IF NOT EXISTS sales_kind_item_cover_idx ON sales (kind, item, price_cents)']),
+    ('daily rollup tables',
+     ['CREATE TABLE IF NOT EXISTS salesperson_daily (employee_id INTEGER NOT NULL REFERENCES employees (id),'
+      ' day text NOT NULL, beverages integer NOT NULL, additions integer NOT NULL, amount_cents integer NOT NULL,'
+      ' PRIMARY KEY (employee_id, day)) WITHOUT ROWID',
+      'CREATE TABLE IF NOT EXISTS item_daily (day text NOT NULL, kind text NOT NULL, item text NOT NULL,'
+      ' sales integer NOT NULL, amount_cents integer NOT NULL, PRIMARY KEY (day, kind, item)) WITHOUT ROWID',
+      rebuild_rollups]),
+]
+
+
+def schema_version(conn):
+    """
+    Gets database schema version stored in database file header (PRAGMA user_version).
+
+    Parameters:
+        conn (sqlite3.Connection): connection to database.
+
+    Returns:
+        int: database schema version, 0 for new or not versioned database.
+    """
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def latest_version():
+    """int: Get schema version the database is migrated to by migrate() function"""
+    return len(migrations)
+
+
+def migrate(conn):
+    """
+    Applies missing schema migration steps in order and stores new schema version.
+    All steps are applied in one transaction holding database write lock, so concurrent
+    Processes can't migrate database twice and failed migration leaves database untouched.
+    Commit is left to the caller, e.g. db_connection() context manager.
+
+    Parameters:
+        conn (sqlite3.Connection): connection to database.
+
+    Returns:
+        int: database schema version after migration.
+
+    Raises:
+        sqlite3.Error: If migration step failed.
+    """
+    if schema_version(conn) >= latest_version():
+        return schema_version(conn)
+    if not conn.in_transaction:
+        conn.execute('BEGIN IMMEDIATE')
+    version = schema_version(conn)  # could have been migrated while waiting for the lock
+    for number, (description, steps) in enumerate(migrations[version:], start=version + 1):
+        for step in steps:
+            if callable(step):
+                step(conn)
+            else:
+                conn.execute(step)
+        conn.execute('PRAGMA user_version = {:d}'.format(number))
+        logger.info('migrated database to version %s: %s', number, description)
+        version = number
+    return version
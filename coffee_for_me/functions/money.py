@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+
+def price_to_cents(price):
+    """
+    Converts price to integer number of cents rounding half up, e.g. '4.0' -> 400, '4.456' -> 446.
+    Only plain decimal prices are accepted and converted with integer arithmetic,
+    Exponent notation (e.g. '1e3'), 'inf' and 'nan' are rejected.
+
+    Parameters:
+        price (str): price entered by salesperson or stored in sale record. int and float are accepted too.
+
+    Returns:
+        int: price in cents.
+
+    Raises:
+        ValueError: If price is not a number.
+    """
+    text = price.strip() if type(price) is str else str(price)
+    dollars, _, fraction = text.partition('.')
+    sign = dollars[:1]
+    if sign == '-' or sign == '+':
+        dollars = dollars[1:]
+    if (dollars or fraction) and (not dollars or dollars.isdecimal()) and (not fraction or fraction.isdecimal()):
+        cents = int(dollars or 0) * 100 + int((fraction + '00')[:2])
+        if fraction[2:3] >= '5':
+            cents += 1
+        return -cents if sign == '-' else cents
+    raise ValueError('"{}" is not a price'.format(price))
+
+
+def format_cents(cents):
+    """
+    Formats price in cents as dollars the way sale records always stored them, e.g. 400 -> '4.0', 458 -> '4.58'.
+
+    Parameters:
+        cents (int): price in cents.
+
+    Returns:
+        str: price in dollars with at least one fraction digit.
+    """
+    dollars, rest = divmod(abs(cents), 100)
+    return '{}{}.{}'.format('-' if cents < 0 else '', dollars, '{:02d}'.format(rest).rstrip('0') or '0')
+
+
+def cents_to_dollars(cents):
+    """
+    Converts price in cents to dollars for json/xml/csv exports, e.g. 458 -> 4.58.
+
+    Parameters:
+        cents (int): price in cents.
+
+    Returns:
+        float: price in dollars.
+    """
+    return cents / 100
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+from coffee_for_me.functions.functions import read_records
+from coffee_for_me.functions.money import price_to_cents
+from functools import lru_cache
+import logging
+import re
+
+logger = logging.getLogger('main.argparsing.functions.records_parser')
+
+# sale record created by Salesperson.add_beverage() or add_ingredient(), e.g. 'Beverage: tea. Price: 4.0$'
+record_pattern = re.compile(r'(Beverage|Addition): (.*)\. Price: ([-+]?\d*\.?\d+)\$')
+kinds = {'Beverage': 'beverage', 'Addition': 'addition'}
+
+# the same prices repeat in records files, so they are converted to cents once
+_price_to_cents = lru_cache(maxsize=1024)(price_to_cents)
+
+
+def parse_sale_record(record):
+    """
+    Parses sale record created by Salesperson.add_beverage() or Salesperson.add_ingredient() methods.
+    Usage example: parse_sale_record('Beverage: tea. Price: 4.0$') returns ('beverage', 'tea', 400)
+
+    Parameters:
+        record (str): beverage or ingredient sale record.
+
+    Returns:
+        tuple: item kind ('beverage' or 'addition'), item name and price in cents.
+
+    Raises:
+        ValueError: If record is not a beverage or ingredient sale record.
+    """
+    match = record_pattern.match(record)
+    if not match:
+        raise ValueError('"{}" is not a sale record'.format(record))
+    kind, item, price = match.groups()
+    return kinds[kind], item, _price_to_cents(price)
+
+
+def parse_records(records):
+    """
+    Lazily parses sale records, lines which are not sale records are logged and skipped.
+    Usage example: for kind, item, price in parse_records(read_records(records_file)): ...
+
+    Parameters:
+        records (iterable): sale records, e.g. read_records() generator.
+
+    Yields:
+        tuple: item kind ('beverage' or 'addition'), item name and price in cents.
+    """
+    match = record_pattern.match
+    for record in records:
+        found = match(record)
+        if found is None:
+            logger.error('Not a sale record in %s line', record)
+            continue
+        kind, item, price = found.groups()
+        yield kinds[kind], item, _price_to_cents(price)
+
+
+def read_sale_items(records_file, offset=0):
+    """
+    Lazily reads and parses salesperson's records file line by line.
+
+    Parameters:
+        records_file (str): salesperson's records file. Pass employee_filename function.
+        offset (int): byte offset to start reading from.
+
+    Returns:
+        generator: (kind, item, price in cents) tuples, see parse_records().
+
+    Raises:
+        IOError: If records file not found or path is incorrect. Raised on the first item.
+    """
+    return parse_records(read_records(records_file, offset))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+import logging
+
+logger = logging.getLogger('main.argparsing.functions.rollups')
+
+# daily rollup tables: sales summed up per salesperson per day and per item per day,
+# so reports over a long history read one row per day instead of every sale line item
+salesperson_daily_table = 'salesperson_daily'
+item_daily_table = 'item_daily'
+
+
+def add_to_rollups(conn, sales):
+    """
+    Adds sales to daily rollup tables. Sales are summed up per salesperson per day and per item per day first,
+    So every rollup row is upserted once. Call it in the transaction storing sale line items.
+
+    Parameters:
+        conn (sqlite3.Connection): connection to database.
+        sales (list): (employee_id, items, sold_at) tuples: salesperson id in employees table,
+            sale line items ((kind, item, price in cents) tuples) and sale UTC timestamp.
+    """
+    salespeople, items = {}, {}
+    for employee_id, sale_items, sold_at in sales:
+        day = sold_at[:10]
+        totals = salespeople.setdefault((employee_id, day), [0, 0, 0])
+        for kind, item, price in sale_items:
+            totals[0 if kind == 'beverage' else 1] += 1
+            totals[2] += price
+            item_totals = items.setdefault((day, kind, item), [0, 0])
+            item_totals[0] += 1
+            item_totals[1] += price
+    conn.executemany('INSERT INTO ' + salesperson_daily_table +
+                     ' (employee_id, day, beverages, additions, amount_cents) VALUES (?,?,?,?,?)'
+                     ' ON CONFLICT(employee_id, day) DO UPDATE SET beverages = beverages + excluded.beverages,'
+                     ' additions = additions + excluded.additions, amount_cents = amount_cents + excluded.amount_cents',
+                     [key + tuple(totals) for key, totals in salespeople.items()])
+    conn.executemany('INSERT INTO ' + item_daily_table + ' (day, kind, item, sales, amount_cents) VALUES (?,?,?,?,?)'
+                     ' ON CONFLICT(day, kind, item) DO UPDATE SET sales = sales + excluded.sales,'
+                     ' amount_cents = amount_cents + excluded.amount_cents',
+                     [key + tuple(totals) for key, totals in items.items()])
+
+
+def rebuild_rollups(conn):
+    """
+    Rebuilds daily rollup tables from sales table with two INSERT ... SELECT ... GROUP BY statements.
+    Used by database migration and rebuild-rollups command, e.g. after sales were edited by hand.
+
+    Parameters:
+        conn (sqlite3.Connection): connection to database.
+
+    Returns:
+        int: number of salesperson daily rows.
+    """
+    conn.execute('DELETE FROM ' + salesperson_daily_table)
+    conn.execute('DELETE FROM ' + item_daily_table)
+    rows = conn.execute('INSERT INTO ' + salesperson_daily_table +
+                        ' (employee_id, day, beverages, additions, amount_cents)'
+                        " SELECT employee_id, substr(sold_at, 1, 10) AS day, SUM(kind = 'beverage'),"
+                        " SUM(kind = 'addition'), SUM(price_cents) FROM sales GROUP BY employee_id, day").rowcount
+    conn.execute('INSERT INTO ' + item_daily_table + ' (day, kind, item, sales, amount_cents)'
+                 ' SELECT substr(sold_at, 1, 10) AS day, kind, item, COUNT(*), SUM(price_cents) FROM sales'
+                 ' GROUP BY day, kind, item')
+    logger.info('rebuilt daily rollup tables, %s salesperson daily rows', rows)
+    return rows
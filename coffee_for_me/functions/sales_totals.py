@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+from coffee_for_me.functions.records_parser import parse_records
+import json
+import logging
+import os
+
+logger = logging.getLogger('main.argparsing.functions.sales_totals')
+
+
+def empty_totals():
+    """
+    Returns running totals for salesperson without any sales.
+    'size' and 'mtime' keep the state of the records file the totals were calculated for.
+
+    Returns:
+        dict: sales, beverages, additions, amount_cents, size and mtime keys set to zero.
+    """
+    return {'sales': 0, 'beverages': 0, 'additions': 0, 'amount_cents': 0, 'size': 0, 'mtime': 0}
+
+
+def add_items_to_totals(totals, items):
+    """
+    Adds parsed sale line items to running totals. Prices are summed up in integer cents, so totals are exact.
+
+    Parameters:
+        totals (dict): running totals returned by load_totals() or empty_totals() functions.
+        items (iterable): (kind, item, price in cents) tuples, e.g. records_parser.parse_records() generator.
+
+    Returns:
+        dict: updated running totals.
+    """
+    for kind, _, price in items:
+        if kind == 'beverage':
+            totals['beverages'] += 1
+            totals['sales'] += 1
+        else:
+            totals['additions'] += 1
+        totals['amount_cents'] += price
+    return totals
+
+
+def add_records_to_totals(totals, records):
+    """
+    Adds beverage and ingredient sale records to running totals without reading records file.
+
+    Parameters:
+        totals (dict): running totals returned by load_totals() or empty_totals() functions.
+        records (list): sale records, e.g. ['Beverage: tea. Price: 4.0$', 'Addition: sugar. Price: 1.5$']
+
+    Returns:
+        dict: updated running totals.
+    """
+    return add_items_to_totals(totals, parse_records(records))
+
+
+def rebuild_totals(records_file):
+    """
+    Calculates running totals by reading the whole salesperson's records file.
+    Is used only when running totals are missing or stale.
+
+    Parameters:
+        records_file (str): salesperson's records file. Pass employee_filename function.
+
+    Returns:
+        dict: running totals for records file.
+
+    Raises:
+        IOError: If records file not found or path is incorrect.
+    """
+    totals = empty_totals()
+    try:
+        with open(records_file, 'rb') as f:
+            add_items_to_totals(totals, parse_records(line.decode().rstrip('\n') for line in f))
+            totals['size'] = f.tell()
+            totals['mtime'] = os.fstat(f.fileno()).st_mtime_ns
+        logger.info('rebuilt running totals from %s file: %s', records_file, totals)
+    except IOError as e:
+        logger.error('File %s not found or path is incorrect... %s', records_file, e)
+    return totals
+
+
+def save_totals(totals_file, totals):
+    """
+    Stores running totals to json file next to salesperson's records file.
+    File is replaced atomically, so readers never see half-written totals.
+
+    Parameters:
+        totals_file (str): running totals file. Pass employee_filename function.
+        totals (dict): running totals to store.
+
+    Raises:
+        IOError: If file not found or path is incorrect.
+    """
+    tmp_file = totals_file + '.tmp'
+    try:
+        with open(tmp_file, 'w') as f:
+            json.dump(totals, f)
+        os.replace(tmp_file, totals_file)
+        logger.debug('stored running totals to %s file', totals_file)
+    except IOError as e:
+        logger.error('File %s not found or path is incorrect... %s', totals_file, e)
+
+
+def load_totals(totals_file, records_file):
+    """
+    Loads running totals for salesperson's records file.
+    Totals are verified against records file size and modification time
+    And rebuilt (and stored) only if they are missing or stale.
+
+    Parameters:
+        totals_file (str): running totals file. Pass employee_filename function.
+        records_file (str): salesperson's records file. Pass employee_filename function.
+
+    Returns:
+        dict: running totals for records file.
+
+    Raises:
+        IOError: If running totals file cannot be read.
+        ValueError: If running totals file is corrupted.
+    """
+    try:
+        stat = os.stat(records_file)
+    except FileNotFoundError:
+        logger.debug('no records file %s yet', records_file)
+        return empty_totals()
+    try:
+        with open(totals_file, 'r') as f:
+            totals = json.load(f)
+        # totals stored before amounts were kept in cents have no amount_cents and are rebuilt
+        if totals.get('size') == stat.st_size and totals.get('mtime') == stat.st_mtime_ns and 'amount_cents' in totals:
+            logger.debug('running totals %s are up to date', totals_file)
+            return totals
+        logger.info('running totals %s are stale', totals_file)
+    except (IOError, ValueError) as e:
+        logger.info('running totals %s are missing or corrupted... %s', totals_file, e)
+    totals = rebuild_totals(records_file)
+    save_totals(totals_file, totals)
+    return totals
+
+
+def update_totals(totals_file, records_file, totals, records):
+    """
+    Adds just written sale records to running totals and stores them.
+    Pass totals loaded before the records were appended to records file.
+
+    Parameters:
+        totals_file (str): running totals file. Pass employee_filename function.
+        records_file (str): salesperson's records file the records were appended to.
+        totals (dict): running totals loaded by load_totals() before appending records.
+        records (list): appended sale records.
+
+    Returns:
+        dict: updated running totals.
+    """
+    add_records_to_totals(totals, records)
+    stat = os.stat(records_file)
+    totals['size'] = stat.st_size
+    totals['mtime'] = stat.st_mtime_ns
+    save_totals(totals_file, totals)
+    return totals
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+from coffee_for_me.exporter.exporter import Exporter
+from coffee_for_me.exporter.writers import JsonWriter, CsvWriter
+from coffee_for_me.functions.money import cents_to_dollars
+from coffee_for_me.server.sales_server import parse_address
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+import hashlib
+import io
+import logging
+import threading
+
+logger = logging.getLogger('main.argparsing.server.report_server')
+
+# report server address used by 'serve-reports' command
+default_report_address = '127.0.0.1:8080'
+
+sales_columns = ['id', 'name', 'sales', 'amount']
+totals_columns = ['salespeople', 'sales', 'amount']
+
+# content type of every report format
+content_types = {'json': 'application/json', 'csv': 'text/csv; charset=utf-8'}
+
+
+def sales_rows(store):
+    """list: Get salespeople records with amounts in dollars: (id, name, sales, amount) rows"""
+    return [(number, fullname, sales, cents_to_dollars(cents))
+            for number, fullname, sales, cents in store.sales_table()]
+
+
+def totals_rows(store):
+    """list: Get one row with number of salespeople, total number of sales and total amount in dollars"""
+    rows = store.sales_table()
+    return [(len(rows), sum(row[2] for row in rows), cents_to_dollars(sum(row[3] for row in rows)))]
+
+
+# report name to function computing its rows from the store, table root and columns
+reports = {
+    'sales': (sales_rows, 'employees', sales_columns),
+    'totals': (totals_rows, 'totals', totals_columns),
+}
+
+
+def render(rows, root, columns, report_format):
+    """
+    Renders report rows the same way they are exported to files by Manager.
+
+    Parameters:
+        rows (list): report rows.
+        root (str): json root key.
+        columns (list): column names.
+        report_format (str): 'json' or 'csv'.
+
+    Returns:
+        bytes: rendered report.
+    """
+    f = io.StringIO()
+    if report_format == 'csv':
+        header = Exporter.formats['csv'][1]['header'] if root == 'employees' else None  # the same as exported csv
+        writer = CsvWriter(f, root, columns, header=header)
+    else:
+        writer = JsonWriter(f, root, columns)
+    writer.begin()
+    writer.write_rows(rows)
+    writer.end()
+    return f.getvalue().encode()
+
+
+class ReportCache:
+    """
+    ReportCache class keeps rendered reports in memory until the store data version changes,
+    So dashboards polling the report server don't query the database on every request.
+    Stores which can't tell their data version (e.g. remote store) are queried on every request.
+
+    Attributes:
+        store (SalesStore): store the reports are computed from.
+        hits (int): number of reports served from cache.
+        misses (int): number of reports computed from the store.
+    """
+
+    def __init__(self, store):
+        """
+        The constructor for ReportCache class.
+
+        Attributes:
+            store (SalesStore): store the reports are computed from.
+        """
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._reports = {}
+        self._lock = threading.Lock()
+
+    def get(self, report, report_format):
+        """
+        Gets rendered report, it is computed only if the store was written since it was computed last time.
+
+        Parameters:
+            report (str): report name, see reports.
+            report_format (str): 'json' or 'csv'.
+
+        Returns:
+            tuple: rendered report (bytes) and its ETag (str).
+
+        Raises:
+            KeyError: If report or format is not supported.
+        """
+        if report_format not in content_types:
+            raise KeyError(report_format)
+        get_rows, root, columns = reports[report]
+        with self._lock:  # reports are computed once, other requests wait for them
+            version = self.store.data_version()
+            if version is None or version != self._version:
+                self._reports.clear()
+                self._version = version
+            key = (report, report_format)
+            if key in self._reports:
+                self.hits += 1
+                return self._reports[key]
+            self.misses += 1
+            body = render(get_rows(self.store), root, columns, report_format)
+            cached = body, '"{}"'.format(hashlib.sha1(body).hexdigest())
+            if version is not None:
+                self._reports[key] = cached
+            logger.debug('computed %s %s report for data version %s', report, report_format, version)
+            return cached
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """
+    ReportRequestHandler class serves read-only GET requests: /sales.json, /sales.csv, /totals.json, /totals.csv
+    (/sales and /totals are served as json). Responses have ETag, so pollers can send If-None-Match and get
+    304 Not Modified while sales are not changed.
+    """
+
+    server_version = 'CoffeeForMeReports'
+
+    def do_GET(self):
+        self._send_report(with_body=True)
+
+    def do_HEAD(self):
+        self._send_report(with_body=False)
+
+    def _send_report(self, with_body):
+        report, _, report_format = self.path.split('?', 1)[0].strip('/').partition('.')
+        try:
+            body, etag = self.server.cache.get(report, report_format or 'json')
+        except KeyError:
+            self.send_error(404, 'Available reports: /sales.json, /sales.csv, /totals.json, /totals.csv')
+            return
+        except Exception as e:
+            logger.error('could not compute %s report... %s', self.path, e)
+            self.send_error(503, 'Sales records are not available')
+            return
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_types[report_format or 'json'])
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug('%s - %s', self.address_string(), format % args)
+
+
+class ReportServer(ThreadingMixIn, HTTPServer):
+    """
+    ReportServer class is a read-only HTTP server of salespeople records and totals, every request in its own thread.
+
+    Attributes:
+        cache (ReportCache): reports cache of the store the reports are computed from.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, store, address=default_report_address):
+        """
+        The constructor for ReportServer class, the server is listening once it is created.
+
+        Attributes:
+            store (SalesStore): store the reports are computed from.
+            address (str): 'HOST:PORT' to listen on, port 0 - any free port.
+        """
+        host, port = parse_address(address)
+        if port is None:
+            raise ValueError('Report server address should be HOST:PORT, not "{}"'.format(address))
+        super().__init__((host, port), ReportRequestHandler)
+        self.cache = ReportCache(store)
+
+
+def run_report_server(store, address=default_report_address):
+    """
+    Runs report server until it is stopped with Ctrl+C. Nothing is written, so the server can be killed anytime.
+
+    Parameters:
+        store (SalesStore): store the reports are computed from.
+        address (str): 'HOST:PORT' to listen on.
+    """
+    server = ReportServer(store, address)
+    print('Report server is listening on http://{}:{}/sales.json, press Ctrl+C to stop it'.format(
+        *server.server_address[:2]))
+    logger.info('report server is listening on %s', address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        store.close()
+        logger.info('report server is stopped, %s reports served from cache, %s computed',
+                    server.cache.hits, server.cache.misses)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+from coffee_for_me.functions.records_parser import parse_sale_record
+from coffee_for_me.functions.db_funcs import parse_timestamp
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
+import logging
+import os
+import signal
+
+logger = logging.getLogger('main.argparsing.server.sales_server')
+
+# sales server address used by 'serve' command and remote store: 'HOST:PORT' or unix socket path
+default_address = '127.0.0.1:8765'
+
+# requests served by reading from the store, see SalesStore methods with the same names
+read_operations = ('salesperson_totals', 'salesperson_records', 'sales_table', 'sales_page', 'sales_analytics')
+
+# maximum length of one request line in bytes, e.g. record_sales request of a big buffered batch
+max_request_size = 4 * 1024 * 1024
+
+
+def parse_address(address):
+    """
+    Parses sales server address.
+    Usage example: parse_address('127.0.0.1:8765') returns ('127.0.0.1', 8765), parse_address('/tmp/sales.sock')
+    Returns ('/tmp/sales.sock', None)
+
+    Parameters:
+        address (str): 'HOST:PORT' or unix socket path.
+
+    Returns:
+        tuple: host and port number or unix socket path and None.
+    """
+    host, _, port = address.rpartition(':')
+    if host and port.isdigit():
+        return host, int(port)
+    return address, None
+
+
+def encode_message(message):
+    """bytes: Get message encoded as one JSON Lines line"""
+    return (json.dumps(message) + '\n').encode()
+
+
+def validate_sale(sale):
+    """
+    Validates sale sent by client before it is queued, so an invalid sale can't fail the batch of other sales.
+
+    Parameters:
+        sale (list): [fullname, sale_records] or [fullname, sale_records, sold_at] sent by client.
+
+    Returns:
+        tuple: fullname, sale records and sold_at converted to UTC 'YYYY-MM-DD HH:MM:SS.SSS' or None.
+
+    Raises:
+        ValueError: If salesperson's name, sale records or sold_at are not valid.
+    """
+    if not isinstance(sale, (list, tuple)) or len(sale) not in (2, 3):
+        raise ValueError('Sale should be [fullname, records, sold_at] list, not {!r}'.format(sale))
+    fullname, sale_records, sold_at = (tuple(sale) + (None,))[:3]
+    if (not isinstance(fullname, str) or not fullname.strip() or not fullname.isprintable()
+            or any(char in fullname for char in '/\\')):  # fullname is a part of records file name
+        raise ValueError('{!r} is not a valid salesperson name'.format(fullname))
+    if not isinstance(sale_records, list) or not sale_records or not all(isinstance(x, str) for x in sale_records):
+        raise ValueError('Sale records should be a non-empty list of strings, not {!r}'.format(sale_records))
+    for record in sale_records:
+        parse_sale_record(record)
+    return fullname, sale_records, None if sold_at is None else parse_timestamp(sold_at)
+
+
+class SalesServer:
+    """
+    SalesServer class owns sales store (e.g. employees.db and salespeople records files) and serves many tills at once.
+    Clients send JSON Lines requests: {"id": 1, "op": "record_sale", "fullname": "Tony Ynot", "records": [...]}
+    And get one response line per request: {"id": 1, "result": true} or {"id": 1, "error": "...", "type": "IOError"}.
+    Sales of all clients are queued and stored in batches, one store.record_sales() call (one transaction) per batch.
+    Sales are validated before they are queued. If a batch fails anyway, its sales are stored one by one,
+    So a sale fails only its own request. A sale is confirmed only after it was stored. Store is used by one thread.
+
+    Attributes:
+        store (SalesStore): store the sales are stored to.
+        batch_size (int): maximum number of sales stored at once.
+        request_limit (int): maximum length of one request line in bytes, longer requests close the connection.
+    """
+
+    def __init__(self, store, batch_size=1000, request_limit=max_request_size):
+        """
+        The constructor for SalesServer class.
+
+        Attributes:
+            store (SalesStore): store the sales are stored to, e.g. SqliteStore.
+            batch_size (int): maximum number of sales stored at once.
+            request_limit (int): maximum length of one request line in bytes.
+        """
+        self.store = store
+        self.batch_size = batch_size
+        self.request_limit = request_limit
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._server = None
+        self._queue = None
+        self._writer_task = None
+        self._clients = set()
+
+    def _run(self, func, *args):
+        """Runs blocking store call in the store thread."""
+        return asyncio.get_event_loop().run_in_executor(self._executor, func, *args)
+
+    async def start(self, address=default_address):
+        """
+        Prepares the store and starts listening on TCP or unix socket.
+
+        Parameters:
+            address (str): 'HOST:PORT' or unix socket path.
+        """
+        await self._run(self.store.setup)
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.ensure_future(self._write_batches())
+        host, port = parse_address(address)
+        if port is None:
+            if os.path.exists(host):
+                os.remove(host)  # socket file left by a killed server
+            self._server = await asyncio.start_unix_server(self.handle_client, host, limit=self.request_limit)
+        else:
+            self._server = await asyncio.start_server(self.handle_client, host, port, limit=self.request_limit)
+        logger.info('sales server is listening on %s', address)
+
+    async def stop(self):
+        """Stops listening, stores queued sales and closes the store."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for writer in list(self._clients):
+            writer.close()
+        if self._writer_task is not None:
+            await self._queue.join()
+            self._writer_task.cancel()
+        await self._run(self.store.close)
+        self._executor.shutdown()
+        logger.info('sales server is stopped')
+
+    async def _write_batches(self):
+        """
+        Stores queued sales in batches. While a batch is being stored, new sales are queued
+        And stored with the next batch, so the busier the server is, the bigger the batches are.
+        If the batch fails, its sales are stored one by one, so one sale can't fail the others. The store raises
+        Only if nothing was stored (see SalesStore.record_sale()), so the sales are not stored twice.
+        """
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                stored = await self._run(self.store.record_sales, [sale for sale, _ in batch])
+                results = [(stored, None)] * len(batch)
+                logger.debug('stored batch of %s sales', len(batch))
+            except Exception as e:
+                logger.error('could not store batch of %s sales, storing them one by one... %s', len(batch), e)
+                results = [await self._store_sale(sale) for sale, _ in batch] if len(batch) > 1 else [(None, e)]
+            for (_, future), (stored, error) in zip(batch, results):
+                if future.done():  # request was cancelled, e.g. client disconnected
+                    pass
+                elif error is None:
+                    future.set_result(stored)
+                else:
+                    future.set_exception(error)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _store_sale(self, sale):
+        """tuple: Store one sale, get store.record_sales() result and None or None and raised exception"""
+        try:
+            return await self._run(self.store.record_sales, [sale]), None
+        except Exception as e:
+            logger.error('could not store sale of %s... %s', sale[0], e)
+            return None, e
+
+    async def record_sales(self, sales):
+        """
+        Validates sales and queues them to be stored with the next batch.
+
+        Parameters:
+            sales (list): (fullname, sale_records, sold_at) tuples.
+
+        Returns:
+            bool: True if all sales were stored completely, False if not.
+
+        Raises:
+            ValueError: If any sale is not valid, no sales are queued then. See validate_sale().
+        """
+        if not isinstance(sales, list):
+            raise ValueError('Sales should be a list, not {!r}'.format(sales))
+        sales = [validate_sale(sale) for sale in sales]
+        futures = []
+        for sale in sales:
+            future = asyncio.get_event_loop().create_future()
+            self._queue.put_nowait((sale, future))
+            futures.append(future)
+        return all(await asyncio.gather(*futures))
+
+    async def handle_request(self, request):
+        """
+        Runs request operation.
+
+        Parameters:
+            request (dict): request with 'op' key and operation parameters.
+
+        Returns:
+            object: operation result, which can be encoded as json.
+
+        Raises:
+            ValueError: If operation is not supported or its parameters are not valid.
+            IOError: If salesperson has no records.
+        """
+        op = request.get('op')
+        if op == 'record_sale':
+            return await self.record_sales([(request['fullname'], request['records'], request.get('sold_at'))])
+        if op == 'record_sales':
+            return await self.record_sales(request['sales'])
+        if op == 'salesperson_totals':
+            return await self._run(self.store.salesperson_totals, request['fullname'])
+        if op == 'salesperson_records':
+            return await self._run(lambda: list(self.store.salesperson_records(request['fullname'])))
+        if op == 'sales_table':
+            return await self._run(self.store.sales_table)
+        if op == 'sales_page':
+            return await self._run(self.store.sales_page, request.get('order_by', 'id'),
+                                   request.get('descending', False), request.get('limit'), request.get('offset', 0))
+        if op == 'sales_analytics':
+            try:
+                return await self._run(self.store.sales_analytics, request.get('period', 'day'), request.get('start'),
+                                       request.get('end'), request.get('top', 5))
+            except NotImplementedError as e:
+                raise ValueError(str(e))
+        if op == 'ping':
+            return True
+        raise ValueError('Unsupported operation "{}"'.format(op))
+
+    async def handle_client(self, reader, writer):
+        """
+        Serves one client connection: reads requests line by line and writes responses in the same order.
+
+        Parameters:
+            reader (asyncio.StreamReader): client connection reader.
+            writer (asyncio.StreamWriter): client connection writer.
+        """
+        self._clients.add(writer)
+        logger.info('client %s connected', writer.get_extra_info('peername'))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError) as e:
+                    # the rest of too long line can't be told from the next requests, so the connection is closed
+                    logger.error('request of client %s is too long, closing connection... %s',
+                                 writer.get_extra_info('peername'), e)
+                    error = 'Request is longer than {} bytes'.format(self.request_limit)
+                    writer.write(encode_message({'id': None, 'error': error, 'type': 'ValueError'}))
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                request = {}
+                try:
+                    message = json.loads(line.decode())
+                    if not isinstance(message, dict):
+                        raise ValueError('Request should be a json object')
+                    request = message
+                    response = {'id': request.get('id'), 'result': await self.handle_request(request)}
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    response = {'id': request.get('id'), 'error': str(e), 'type': 'ValueError'}
+                except IOError as e:
+                    response = {'id': request.get('id'), 'error': str(e), 'type': 'IOError'}
+                writer.write(encode_message(response))
+                await writer.drain()
+        except ConnectionError as e:
+            logger.info('client connection is lost... %s', e)
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+            logger.info('client %s disconnected', writer.get_extra_info('peername'))
+
+
+def run_server(store, address=default_address, batch_size=1000):
+    """
+    Runs sales server until it is stopped with Ctrl+C or SIGTERM. Queued sales are stored before exit.
+
+    Parameters:
+        store (SalesStore): store the sales are stored to.
+        address (str): 'HOST:PORT' or unix socket path.
+        batch_size (int): maximum number of sales stored at once.
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    server = SalesServer(store, batch_size)
+    loop.run_until_complete(server.start(address))
+    try:
+        loop.add_signal_handler(signal.SIGTERM, loop.stop)
+    except (NotImplementedError, RuntimeError):  # no signal handlers on Windows
+        pass
+    print('Sales server is listening on {}, press Ctrl+C to stop it'.format(address))
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(server.stop())
+        loop.close()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+from coffee_for_me.store.sales_store import SalesStore
+from coffee_for_me.functions.db_funcs import current_timestamp
+from coffee_for_me.functions.sales_totals import add_records_to_totals, empty_totals
+from coffee_for_me.functions.connection_pool import set_synchronous
+import atexit
+import logging
+import signal
+import sys
+import threading
+
+logger = logging.getLogger('main.argparsing.store.buffered_store')
+
+# durability level passed via --durability command line argument to sqlite3 synchronous pragma:
+# 'full' - every sale is stored at once, database is synced to disk on every commit;
+# 'normal' - sales are stored in batches, sales buffered at the app crash (up to batch_size sales
+# or flush_interval milliseconds of sales) are lost;
+# 'off' - as 'normal', database is not synced to disk either, stored sales can be lost on OS crash or power failure.
+durability_levels = {'full': 'FULL', 'normal': None, 'off': 'OFF'}
+
+# not closed stores flushed at exit, including exit on SIGTERM. Stores are removed by close()
+_open_stores = set()
+
+
+def flush_open_stores():
+    """Flushes buffers of all not closed buffered stores. Is called at exit, sales which were not stored are logged."""
+    for store in list(_open_stores):
+        if not store.flush() and store._buffer:
+            logger.error('%s buffered sales were not stored: %s', len(store._buffer), store._buffer)
+
+
+def _exit_on_sigterm(signum, frame):
+    """Exits on SIGTERM like on Ctrl+C, so buffered sales are flushed by atexit handlers."""
+    logger.warning('terminated by signal %s, flushing buffered sales...', signum)
+    sys.exit(128 + signum)
+
+
+def handle_sigterm():
+    """
+    Makes the app exit normally on SIGTERM (e.g. 'kill' or system shutdown), so buffered sales are flushed.
+    Does nothing if SIGTERM is already handled or if not called from the main thread.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    if signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+        signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+
+class BufferedStore(SalesStore):
+    """
+    BufferedStore class keeps sales in memory buffer and stores them to another store in batches,
+    E.g. to SqliteStore with one records file write per salesperson and one database transaction per batch.
+    Salesperson's totals and records include buffered sales, buffer is flushed before exporting,
+    So readers always see all sales. Inherits SalesStore class.
+    Buffer is flushed when it gets batch_size sales or flush_interval milliseconds after the first buffered sale,
+    And at exit (also on SIGTERM, see setup()). Buffered sales are lost only if the app is killed or crashes.
+
+    Attributes:
+        store (SalesStore): store the sales are flushed to.
+        batch_size (int): number of buffered sales flushed at once.
+        flush_interval (int): maximum number of milliseconds a sale is kept in buffer, 0 - until batch is full.
+        durability (str): durability level: 'full', 'normal' or 'off', see durability_levels.
+    """
+
+    name = 'buffered'
+
+    def __init__(self, store=None, batch_size=100, flush_interval=1000, durability='normal', records_backend='text'):
+        """
+        The constructor for BufferedStore class.
+
+        Attributes:
+            store (SalesStore): store the sales are flushed to. SqliteStore by default.
+            batch_size (int): number of buffered sales flushed at once.
+            flush_interval (int): maximum number of milliseconds a sale is kept in buffer, 0 - until batch is full.
+            durability (str): 'full' (no buffering), 'normal' or 'off'.
+            records_backend (str): records backend of default SqliteStore: 'text' or 'journal'.
+
+        Raises:
+            ValueError: If durability level is not supported.
+        """
+        if durability not in durability_levels:
+            raise ValueError('Unsupported durability level "{}", use {}'.format(durability,
+                                                                                 ', '.join(durability_levels)))
+        if store is None:
+            from coffee_for_me.store.sqlite_store import SqliteStore
+            store = SqliteStore(records_backend)
+        self.store = store
+        self.batch_size = 1 if durability == 'full' else batch_size
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self._buffer = []
+        self._pending_totals = {}  # salesperson's full name to totals of buffered sales
+        self._timer = None
+        self._lock = threading.RLock()
+        _open_stores.add(self)
+
+    def setup(self):
+        """
+        Prepares the store the sales are flushed to and applies durability level to database connections.
+        Makes the app flush buffered sales on SIGTERM.
+        """
+        if durability_levels[self.durability]:
+            set_synchronous(durability_levels[self.durability])
+        self.store.setup()
+        handle_sigterm()
+
+    def _start_timer(self):
+        """Starts timer flushing the buffer in flush_interval milliseconds if it is not started yet."""
+        if self.flush_interval and self._timer is None:
+            self._timer = threading.Timer(self.flush_interval / 1000, self._flush_on_timer)
+            self._timer.daemon = True  # the app doesn't wait for the timer at exit, buffer is flushed by atexit
+            self._timer.start()
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._timer = None
+            if not self.flush():
+                logger.error('could not store buffered sales completely')
+
+    def record_sale(self, fullname, sale_records, sold_at=None):
+        """
+        Adds sale to buffer, buffer is flushed when it gets batch_size sales. See SalesStore.record_sale().
+        Sale time is taken when the sale is buffered, not when it is flushed.
+        """
+        with self._lock:
+            self._buffer.append((fullname, sale_records, sold_at or current_timestamp()))
+            add_records_to_totals(self._pending_totals.setdefault(fullname, empty_totals()), sale_records)
+            if len(self._buffer) >= self.batch_size:
+                return self.flush()
+            self._start_timer()
+        return True
+
+    def record_sales(self, sales):
+        """Adds sales to buffer. See SalesStore.record_sales()."""
+        return all([self.record_sale(fullname, sale_records, sold_at) for fullname, sale_records, sold_at in sales])
+
+    def flush(self):
+        """
+        Stores all buffered sales to the store at once.
+        If the store raises an error, nothing was stored (see SalesStore.record_sale()), so sales are kept in buffer
+        And flushed again later. They are kept in buffer also if the app exits while they are being stored
+        (SystemExit raised on SIGTERM), so they are flushed at exit or logged.
+        If the store returns False, sales were stored partly (e.g. to records files, but not to database)
+        And are not flushed again, which would store them twice: they are logged instead.
+
+        Returns:
+            bool: True if all sales were stored completely, False if not.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._buffer:
+                return True
+            sales, pending_totals = self._buffer, self._pending_totals
+            self._buffer, self._pending_totals = [], {}
+            stored = None
+            try:
+                stored = self.store.record_sales(sales)
+            except Exception as e:
+                self._start_timer()
+                logger.error('could not flush %s buffered sales, they are kept in buffer... %s', len(sales), e)
+                return False
+            finally:
+                if stored is None:  # the store raised, also SystemExit or KeyboardInterrupt
+                    self._buffer, self._pending_totals = sales, pending_totals
+        if stored:
+            logger.debug('flushed %s buffered sales', len(sales))
+        else:
+            logger.error('%s flushed sales were stored partly: %s', len(sales), sales)
+        return stored
+
+    def salesperson_totals(self, fullname):
+        """
+        Gets salesperson's totals from the store and adds buffered sales to them without flushing the buffer.
+        See SalesStore.salesperson_totals().
+        """
+        with self._lock:
+            totals = self.store.salesperson_totals(fullname)
+            pending = self._pending_totals.get(fullname)
+            if pending:
+                for key in ('sales', 'beverages', 'additions', 'amount_cents'):
+                    totals[key] += pending[key]
+        return totals
+
+    def salesperson_records(self, fullname):
+        """
+        Gets salesperson's records from the store followed by buffered records without flushing the buffer.
+        See SalesStore.salesperson_records().
+        """
+        with self._lock:
+            pending = [record for name, sale_records, _ in self._buffer if name == fullname for record in sale_records]
+            try:
+                records = list(self.store.salesperson_records(fullname))
+            except IOError:
+                if not pending:
+                    raise
+                records = []
+        return records + pending
+
+    def sales_table(self):
+        """Flushes buffer and gets salespeople records. See SalesStore.sales_table()."""
+        self.flush()
+        return self.store.sales_table()
+
+    def sales_page(self, order_by='id', descending=False, limit=None, offset=0):
+        """Flushes buffer and gets page of salespeople records. See SalesStore.sales_page()."""
+        self.flush()
+        return self.store.sales_page(order_by, descending, limit, offset)
+
+    def sales_analytics(self, period='day', start=None, end=None, top=5):
+        """Flushes buffer and computes sales analytics. See SalesStore.sales_analytics()."""
+        self.flush()
+        return self.store.sales_analytics(period, start, end, top)
+
+    def data_version(self):
+        """
+        Gets data version of the store the sales are flushed to and number of buffered sales,
+        Buffered sales are flushed before they are read. See SalesStore.data_version().
+        """
+        with self._lock:
+            version = self.store.data_version()
+            return None if version is None else (version, len(self._buffer))
+
+    def is_empty(self):
+        """Flushes buffer and checks if there are any salespeople records. See SalesStore.is_empty()."""
+        self.flush()
+        return self.store.is_empty()
+
+    def export(self, file_names, parallel=False):
+        """Flushes buffer and exports salespeople records. See SalesStore.export()."""
+        self.flush()
+        return self.store.export(file_names, parallel)
+
+    def close(self):
+        """Flushes buffer and closes the store the sales are flushed to. Sales which could not be stored are logged."""
+        self.flush()
+        with self._lock:
+            if self._buffer:
+                logger.error('%s buffered sales were not stored: %s', len(self._buffer), self._buffer)
+        _open_stores.discard(self)
+        self.store.close()
+
+
+atexit.register(flush_open_stores)
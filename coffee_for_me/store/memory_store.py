@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+from coffee_for_me.store.sales_store import SalesStore
+from coffee_for_me.functions.sales_totals import empty_totals, add_records_to_totals
+from coffee_for_me.functions.money import cents_to_dollars
+import logging
+import os
+import threading
+
+logger = logging.getLogger('main.argparsing.store.memory_store')
+
+
+class MemoryStore(SalesStore):
+    """
+    MemoryStore class keeps all sales records in memory, nothing is written to disk except exported files.
+    Records are lost when the app quits, use it for load tests and trying the app out. Inherits SalesStore class.
+    """
+
+    name = 'memory'
+    columns = ['id', 'name', 'sales', 'amount']
+
+    def __init__(self, records_backend=None):
+        """
+        The constructor for MemoryStore class.
+
+        Attributes:
+            records_backend (str): not used, accepted for the same constructor arguments as other stores.
+        """
+        self._records = {}  # fullname to list of sale records
+        self._totals = {}  # fullname to running totals, in the order salespeople made their first sale
+        self._version = 0  # number of stored sales
+        self._lock = threading.Lock()
+
+    def record_sale(self, fullname, sale_records, sold_at=None):
+        """Adds sale records to salesperson's records and totals. See SalesStore.record_sale()."""
+        with self._lock:
+            self._records.setdefault(fullname, []).extend(sale_records)
+            add_records_to_totals(self._totals.setdefault(fullname, empty_totals()), sale_records)
+            self._version += 1
+        logger.debug('stored %s sale records of %s in memory', len(sale_records), fullname)
+        return True
+
+    def salesperson_totals(self, fullname):
+        """Gets salesperson's running totals. See SalesStore.salesperson_totals()."""
+        with self._lock:
+            return dict(self._totals.get(fullname) or empty_totals())
+
+    def salesperson_records(self, fullname):
+        """
+        Gets salesperson's sale records. See SalesStore.salesperson_records().
+
+        Raises:
+            FileNotFoundError: If salesperson has no records, the same as for missing records file.
+        """
+        with self._lock:
+            if fullname not in self._records:
+                raise FileNotFoundError('No sales records of {}'.format(fullname))
+            return list(self._records[fullname])
+
+    def sales_table(self):
+        """
+        Gets salespeople records, ids are given in the order salespeople made their first sale.
+        Number of sales is a number of sold beverages and additions, the same as in database.
+        See SalesStore.sales_table().
+        """
+        with self._lock:
+            return [(number, fullname, totals['beverages'] + totals['additions'], totals['amount_cents'])
+                    for number, (fullname, totals) in enumerate(self._totals.items(), start=1)]
+
+    def data_version(self):
+        """Gets number of stored sales. See SalesStore.data_version()."""
+        with self._lock:
+            return self._version
+
+    def export(self, file_names, parallel=False):
+        """Exports salespeople records kept in memory, amounts are exported in dollars. See SalesStore.export()."""
+        from coffee_for_me.exporter.exporter import Exporter
+        rows = [(number, fullname, sales, cents_to_dollars(cents))
+                for number, fullname, sales, cents in self.sales_table()]
+        Exporter.write_all(file_names, self.columns, [rows], parallel=parallel)
+        return {export_format: os.path.getsize(file_name) for export_format, file_name in file_names.items()}
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+from coffee_for_me.store.sales_store import SalesStore
+from coffee_for_me.server.sales_server import default_address, parse_address, encode_message
+from coffee_for_me.functions.money import cents_to_dollars
+import itertools
+import json
+import logging
+import os
+import socket
+import threading
+
+logger = logging.getLogger('main.argparsing.store.remote_store')
+
+# error types sent by sales server to exceptions raised by remote store
+error_types = {'ValueError': ValueError, 'IOError': IOError}
+
+
+class RemoteStore(SalesStore):
+    """
+    RemoteStore class sends sales to sales server ('serve' command), which owns the database and records files,
+    So many tills can sell at the same time without opening employees.db themselves. Inherits SalesStore class.
+
+    Attributes:
+        address (str): sales server address: 'HOST:PORT' or unix socket path.
+        timeout (float): number of seconds to wait for sales server response.
+    """
+
+    name = 'remote'
+    columns = ['id', 'name', 'sales', 'amount']
+
+    def __init__(self, address=default_address, timeout=10.0, records_backend=None):
+        """
+        The constructor for RemoteStore class. Connection is opened on the first request.
+
+        Attributes:
+            address (str): sales server address: 'HOST:PORT' or unix socket path.
+            timeout (float): number of seconds to wait for sales server response.
+            records_backend (str): not used, records are stored the way sales server is configured.
+        """
+        self.address = address
+        self.timeout = timeout
+        self._socket = None
+        self._file = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        host, port = parse_address(self.address)
+        if port is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(host)
+            except OSError:
+                sock.close()
+                raise
+        else:
+            sock = socket.create_connection((host, port), self.timeout)
+        self._socket, self._file = sock, sock.makefile('rwb')
+        logger.info('connected to sales server %s', self.address)
+
+    def _disconnect(self):
+        if self._socket is not None:
+            self._file.close()
+            self._socket.close()
+        self._socket = self._file = None
+
+    def request(self, op, **params):
+        """
+        Sends request to sales server and waits for response.
+
+        Parameters:
+            op (str): operation name, e.g. 'record_sale'.
+            params (dict): operation parameters.
+
+        Returns:
+            object: operation result.
+
+        Raises:
+            IOError: If sales server is not available or salesperson has no records.
+            ValueError: If sales server rejected the request.
+        """
+        params.update(id=next(self._ids), op=op)
+        with self._lock:
+            try:
+                if self._socket is None:
+                    self._connect()
+                self._file.write(encode_message(params))
+                self._file.flush()
+                line = self._file.readline()
+            except OSError as e:
+                self._disconnect()
+                raise IOError('Sales server {} is not available... {}'.format(self.address, e))
+            if not line:
+                self._disconnect()
+                raise IOError('Sales server {} closed connection'.format(self.address))
+        response = json.loads(line.decode())
+        if 'error' in response:
+            raise error_types.get(response.get('type'), IOError)(response['error'])
+        return response['result']
+
+    def setup(self):
+        """Checks that sales server is available, database is prepared by the server."""
+        self.request('ping')
+
+    def record_sale(self, fullname, sale_records, sold_at=None):
+        """Sends sale to sales server, returns when it is stored. See SalesStore.record_sale()."""
+        return self.request('record_sale', fullname=fullname, records=sale_records, sold_at=sold_at)
+
+    def record_sales(self, sales):
+        """Sends sales to sales server in one request. See SalesStore.record_sales()."""
+        return self.request('record_sales', sales=[list(sale) for sale in sales])
+
+    def salesperson_totals(self, fullname):
+        """Gets salesperson's totals from sales server. See SalesStore.salesperson_totals()."""
+        return self.request('salesperson_totals', fullname=fullname)
+
+    def salesperson_records(self, fullname):
+        """Gets salesperson's records from sales server. See SalesStore.salesperson_records()."""
+        return self.request('salesperson_records', fullname=fullname)
+
+    def sales_table(self):
+        """Gets salespeople records from sales server. See SalesStore.sales_table()."""
+        return [tuple(row) for row in self.request('sales_table')]
+
+    def sales_page(self, order_by='id', descending=False, limit=None, offset=0):
+        """Gets page of salespeople records from sales server. See SalesStore.sales_page()."""
+        rows, totals = self.request('sales_page', order_by=order_by, descending=descending, limit=limit, offset=offset)
+        return [tuple(row) for row in rows], totals
+
+    def sales_analytics(self, period='day', start=None, end=None, top=5):
+        """Gets sales analytics from sales server. See SalesStore.sales_analytics()."""
+        return self.request('sales_analytics', period=period, start=start, end=end, top=top)
+
+    def export(self, file_names, parallel=False):
+        """
+        Exports salespeople records got from sales server to local files, amounts are exported in dollars.
+        See SalesStore.export().
+        """
+        from coffee_for_me.exporter.exporter import Exporter
+        rows = [(number, fullname, sales, cents_to_dollars(cents))
+                for number, fullname, sales, cents in self.sales_table()]
+        Exporter.write_all(file_names, self.columns, [rows], parallel=parallel)
+        return {export_format: os.path.getsize(file_name) for export_format, file_name in file_names.items()}
+
+    def close(self):
+        """Closes connection to sales server."""
+        with self._lock:
+            self._disconnect()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+import importlib
+import logging
+
+logger = logging.getLogger('main.argparsing.store.sales_store')
+
+# store name passed via --store command line argument to store class path, classes are imported on first use
+stores = {
+    'sqlite': 'coffee_for_me.store.sqlite_store.SqliteStore',
+    'memory': 'coffee_for_me.store.memory_store.MemoryStore',
+    'buffered': 'coffee_for_me.store.buffered_store.BufferedStore',
+    'remote': 'coffee_for_me.store.remote_store.RemoteStore',
+}
+
+
+# columns of sales_table() rows, salespeople records can be sorted by any of them
+sort_columns = ('id', 'name', 'sales', 'amount')
+
+
+class SalesStore:
+    """
+    SalesStore class is the interface of sales records storage used by Salesperson and Manager.
+    Subclassed by SqliteStore (records files + sqlite3 database), MemoryStore, BufferedStore and RemoteStore.
+    Sale is a list of salesperson's sale records, e.g. ['Beverage: tea. Price: 4.0$', 'Addition: sugar. Price: 1.5$']
+
+    Attributes:
+        name (str): store name used by --store command line argument.
+    """
+
+    name = None
+
+    def setup(self):
+        """Prepares the storage once at the app start, e.g. creates database tables."""
+
+    def record_sale(self, fullname, sale_records, sold_at=None):
+        """
+        Stores salesperson's sale.
+
+        Parameters:
+            fullname (str): Salesperson's full name.
+            sale_records (list): sale records.
+            sold_at (str): sale UTC timestamp, 'YYYY-MM-DD HH:MM:SS.SSS'. Current time is used by default.
+
+        Returns:
+            bool: True if sale was stored completely, False if only partly (e.g. records file could not be written).
+
+        Raises:
+            IOError: If sale could not be stored, nothing was stored then, so it can be stored again.
+        """
+        raise NotImplementedError
+
+    def record_sales(self, sales):
+        """
+        Stores several sales at once. Subclasses override it to store all sales in one transaction.
+
+        Parameters:
+            sales (list): (fullname, sale_records, sold_at) tuples, sold_at can be None.
+
+        Returns:
+            bool: True if all sales were stored completely, False if not.
+
+        Raises:
+            IOError: If sales could not be stored, see record_sale().
+        """
+        return all([self.record_sale(fullname, sale_records, sold_at) for fullname, sale_records, sold_at in sales])
+
+    def salesperson_totals(self, fullname):
+        """
+        Gets salesperson's totals.
+
+        Parameters:
+            fullname (str): Salesperson's full name.
+
+        Returns:
+            dict: number of sales, sold beverages and additions and total amount in cents:
+                {'sales': int, 'beverages': int, 'additions': int, 'amount_cents': int}
+        """
+        raise NotImplementedError
+
+    def salesperson_records(self, fullname):
+        """
+        Gets salesperson's sale records in the order they were stored.
+
+        Parameters:
+            fullname (str): Salesperson's full name.
+
+        Returns:
+            iterable: sale records, e.g. 'Beverage: tea. Price: 4.0$'
+
+        Raises:
+            IOError: If salesperson has no records file.
+        """
+        raise NotImplementedError
+
+    def sales_table(self):
+        """
+        Gets salespeople sales records.
+
+        Returns:
+            list: (id, name, sales, amount in cents) rows.
+        """
+        raise NotImplementedError
+
+    def sales_page(self, order_by='id', descending=False, limit=None, offset=0):
+        """
+        Gets one page of salespeople records sorted by column and totals of all salespeople records.
+        Sorts and sums up sales_table() rows, subclasses override it to do it in the storage.
+
+        Parameters:
+            order_by (str): column to sort by: 'id', 'name', 'sales' or 'amount'. Ties are sorted by id.
+            descending (bool): sort in descending order if True.
+            limit (int): maximum number of records on the page. All records by default.
+            offset (int): number of records before the page.
+
+        Returns:
+            tuple: page rows ((id, name, sales, amount in cents) tuples) and totals of all salespeople records:
+                {'salespeople': int, 'sales': int, 'amount_cents': int}
+
+        Raises:
+            ValueError: If records can't be sorted by the column.
+        """
+        if order_by not in sort_columns:
+            raise ValueError('Unsupported sort column "{}", use one of: {}'.format(order_by, ', '.join(sort_columns)))
+        column = sort_columns.index(order_by)
+        rows = sorted(self.sales_table())  # by id, stable sort below keeps ties sorted by id
+        rows.sort(key=lambda row: row[column], reverse=descending)
+        totals = {'salespeople': len(rows), 'sales': sum(row[2] for row in rows),
+                  'amount_cents': sum(row[3] for row in rows)}
+        return rows[offset:None if limit is None else offset + limit], totals
+
+    def sales_analytics(self, period='day', start=None, end=None, top=5):
+        """
+        Computes sales analytics: revenue per time bucket, top beverages and additions, attach rate
+        And per-salesperson trends. See analytics.sales_analytics() for the report structure.
+
+        Parameters:
+            period (str): time bucket: 'hour', 'day' or 'week'.
+            start (str): period start UTC timestamp, e.g. '2020-01-01'. All sales by default.
+            end (str): period end UTC timestamp (excluded).
+            top (int): number of best selling beverages and additions.
+
+        Returns:
+            dict: analytics report.
+
+        Raises:
+            NotImplementedError: If the store doesn't keep sale times, e.g. memory store.
+            ValueError: If period is not supported.
+        """
+        raise NotImplementedError('{} store has no sales analytics'.format(self.name))
+
+    def data_version(self):
+        """
+        Gets stored data version, which changes on every write, so readers can cache what they computed from it.
+
+        Returns:
+            object: comparable data version or None if the store can't tell, nothing should be cached then.
+        """
+        return None
+
+    def is_empty(self):
+        """
+        Checks if there are any salespeople records, prints message if there are no records.
+
+        Returns:
+            bool: True if there are no salespeople records, False if there are.
+        """
+        if self.sales_table():
+            return False
+        print('There are no sales records. Ask your salespeople to sell something...\n')
+        return True
+
+    def export(self, file_names, parallel=False):
+        """
+        Exports salespeople sales records to files in one pass.
+
+        Parameters:
+            file_names (dict): export format ('json', 'jsonl', 'xml' or 'csv') to name of the file.
+                               Compression is detected by file extension.
+            parallel (bool): write every format in its own thread if True.
+
+        Returns:
+            dict: export format to number of bytes written to disk.
+
+        Raises:
+            ValueError: If export format is not supported.
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """Writes buffered sales, if any, to the storage."""
+
+    def close(self):
+        """Writes buffered sales and releases the storage. Call it once when the app quits."""
+        self.flush()
+
+
+def get_store(name='sqlite', **options):
+    """
+    Creates sales store by name, e.g. get_store('buffered', batch_size=100)
+
+    Parameters:
+        name (str): 'sqlite', 'memory', 'buffered' or 'remote'.
+        options (dict): store class constructor keyword arguments.
+
+    Returns:
+        SalesStore: sales store.
+
+    Raises:
+        ValueError: If store is not supported.
+    """
+    if name not in stores:
+        raise ValueError('Unsupported store "{}", use one of: {}'.format(name, ', '.join(stores)))
+    module_name, class_name = stores[name].rsplit('.', 1)
+    store_class = getattr(importlib.import_module(module_name), class_name)
+    logger.debug('creating %s store with %s options', name, options)
+    return store_class(**options)
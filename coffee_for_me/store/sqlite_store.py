@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+from coffee_for_me.store.sales_store import SalesStore
+from coffee_for_me.functions.db_funcs import create_table, record_sales_batch, view_db_records, is_table_empty
+from coffee_for_me.functions.db_funcs import view_db_records_page
+from coffee_for_me.functions.db_funcs import create_connection, data_version, parse_timestamp, timestamp_to_datetime
+from coffee_for_me.functions.analytics import sales_analytics
+from coffee_for_me.functions.functions import employee_filename, read_records
+from coffee_for_me.functions.records_parser import parse_sale_record
+from coffee_for_me.functions.sales_totals import load_totals, update_totals
+from coffee_for_me.functions.journal import SalesJournal, convert_records_file, record_line
+import logging
+import os
+import threading
+
+logger = logging.getLogger('main.argparsing.store.sqlite_store')
+
+
+class SqliteStore(SalesStore):
+    """
+    SqliteStore class stores every salesperson's sale records in records file (or binary journal)
+    And salespeople totals and sale line items in sqlite3 database. Inherits SalesStore class.
+
+    Attributes:
+        records_backend (str): salesperson's sale records storage: 'text' records file or binary 'journal'.
+    """
+
+    name = 'sqlite'
+    records_backends = ('text', 'journal')
+
+    def __init__(self, records_backend='text'):
+        """
+        The constructor for SqliteStore class.
+
+        Attributes:
+            records_backend (str): 'text' records file (default) or binary 'journal'.
+                                   Existing records file is converted to journal on first use.
+
+        Raises:
+            ValueError: If records backend is not supported.
+        """
+        if records_backend not in self.records_backends:
+            raise ValueError('Unsupported records backend "{}", use text or journal'.format(records_backend))
+        self.records_backend = records_backend
+        self._journals = {}
+        self._version_conn = None  # connection used for PRAGMA data_version only
+        self._version_lock = threading.Lock()
+
+    def setup(self):
+        """Creates/migrates database schema."""
+        create_table()
+
+    @staticmethod
+    def records_file(fullname):
+        """str: Get salesperson's sales records file path"""
+        return employee_filename('salesperson_records', fullname, '_records.txt')
+
+    @staticmethod
+    def totals_file(fullname):
+        """str: Get salesperson's running totals file path stored next to sales records file"""
+        return employee_filename('salesperson_records', fullname, '_totals.json')
+
+    @staticmethod
+    def journal_file(fullname):
+        """str: Get salesperson's binary sales journal file path"""
+        return employee_filename('salesperson_records', fullname, '_journal.bin')
+
+    def journal(self, fullname):
+        """
+        Gets salesperson's sales journal, records file is converted to it if there is no journal yet.
+
+        Parameters:
+            fullname (str): Salesperson's full name.
+
+        Returns:
+            SalesJournal: salesperson's sales journal.
+        """
+        if fullname not in self._journals:
+            journal_file = self.journal_file(fullname)
+            records_file = self.records_file(fullname)
+            if not os.path.exists(journal_file) and os.path.exists(records_file):
+                converted = convert_records_file(records_file, journal_file)
+                logger.info('%s records were converted to %s journal', converted, journal_file)
+            self._journals[fullname] = SalesJournal(journal_file)
+        return self._journals[fullname]
+
+    def _write_records(self, fullname, sales):
+        """
+        Appends salesperson's sales to records file (updating running totals) or journal with sale times.
+
+        Parameters:
+            fullname (str): Salesperson's full name.
+            sales (list): (sale_records, items, sold_at) tuples, sold_at can be None.
+
+        Raises:
+            IOError: If records file can't be written.
+        """
+        if self.records_backend == 'journal':
+            self.journal(fullname).append_sales([(items, timestamp_to_datetime(sold_at) if sold_at else None)
+                                                 for _, items, sold_at in sales])
+            return
+        sale_records = [record for records, _, _ in sales for record in records]
+        records_file, totals_file = self.records_file(fullname), self.totals_file(fullname)
+        totals = load_totals(totals_file, records_file)
+        with open(records_file, 'a') as f:
+            f.write(''.join(record + '\n' for record in sale_records))
+        update_totals(totals_file, records_file, totals, sale_records)
+        logger.debug('wrote %s sale records to %s file', len(sale_records), records_file)
+
+    @staticmethod
+    def _parse_sale(sale_records, sold_at):
+        """
+        Parses sale before anything is stored, so an invalid sale fails the whole batch before it is written.
+
+        Parameters:
+            sale_records (list): sale records.
+            sold_at (str): sale UTC timestamp or None.
+
+        Returns:
+            tuple: sale line items and sold_at converted to 'YYYY-MM-DD HH:MM:SS.SSS' or None.
+
+        Raises:
+            ValueError: If sale record is not valid or contains a line break (records file or journal items file
+                Would be broken) or sold_at is not a valid date and time.
+        """
+        for record in sale_records:
+            if '\n' in record or '\r' in record:
+                raise ValueError('Sale record {!r} should not contain line breaks'.format(record))
+        return [parse_sale_record(record) for record in sale_records], parse_timestamp(sold_at) if sold_at else None
+
+    def record_sale(self, fullname, sale_records, sold_at=None):
+        """
+        Records sale in database and appends sale records to salesperson's records file or journal.
+        See SalesStore.record_sale().
+        """
+        return self.record_sales([(fullname, sale_records, sold_at)])
+
+    def record_sales(self, sales):
+        """
+        Records all sales in database in one transaction, then appends sales records to salespeople records files
+        (once per salesperson). Records files are written only after the sales were recorded in database,
+        So sales which were not stored can be stored again without duplicating records.
+        All sales are parsed first, nothing is stored if any of them is not valid.
+        Sales whose records file could not be written are recorded in database only, so they were stored partly.
+        See SalesStore.record_sales().
+
+        Raises:
+            IOError: If database is not available, nothing was stored then.
+            ValueError: If any sale is not valid, nothing was stored then. See _parse_sale().
+        """
+        batch = [(fullname,) + self._parse_sale(sale_records, sold_at) for fullname, sale_records, sold_at in sales]
+        if not record_sales_batch(batch):
+            raise IOError('Database is not available, {} sales were not stored'.format(len(batch)))
+        salespeople_sales = {}
+        for (fullname, sale_records, _), (_, items, sold_at) in zip(sales, batch):
+            salespeople_sales.setdefault(fullname, []).append((sale_records, items, sold_at))
+        written = True
+        for fullname in salespeople_sales:
+            try:
+                self._write_records(fullname, salespeople_sales[fullname])
+            except IOError as e:
+                written = False
+                logger.error('could not write %s sale records... %s', fullname, e)
+        return written
+
+    def salesperson_totals(self, fullname):
+        """Gets salesperson's totals from running totals file or journal. See SalesStore.salesperson_totals()."""
+        if self.records_backend == 'journal':
+            totals = self.journal(fullname).totals()
+            totals['sales'] = totals['beverages']
+            return totals
+        return load_totals(self.totals_file(fullname), self.records_file(fullname))
+
+    def salesperson_records(self, fullname):
+        """Lazily reads salesperson's records file or journal. See SalesStore.salesperson_records()."""
+        if self.records_backend == 'journal':
+            return (record_line(kind, item, price) for _, kind, item, price in self.journal(fullname).records())
+        return read_records(self.records_file(fullname))
+
+    def sales_table(self):
+        """Gets salespeople records from database. See SalesStore.sales_table()."""
+        return view_db_records()
+
+    def sales_page(self, order_by='id', descending=False, limit=None, offset=0):
+        """
+        Gets page of salespeople records sorted and summed up by database in one query. See SalesStore.sales_page().
+
+        Raises:
+            IOError: If database is not available.
+        """
+        page = view_db_records_page(order_by, descending, limit, offset)
+        if page is None:
+            raise IOError('Salespeople records could not be read from database')
+        return page
+
+    def sales_analytics(self, period='day', start=None, end=None, top=5):
+        """Computes sales analytics from sales table. See SalesStore.sales_analytics()."""
+        return sales_analytics(period, start, end, top)
+
+    def data_version(self):
+        """
+        Gets PRAGMA data_version of a connection kept for it, so writes of this store (made on pooled connections),
+        Other tills and the sales server are all seen. See SalesStore.data_version().
+        """
+        with self._version_lock:
+            if self._version_conn is None:
+                self._version_conn = create_connection(check_same_thread=False)
+                if self._version_conn is None:
+                    return None
+            return data_version(self._version_conn)
+
+    def is_empty(self):
+        """Checks if there are any salespeople records in database. See SalesStore.is_empty()."""
+        return is_table_empty()
+
+    def export(self, file_names, parallel=False):
+        """Exports salespeople records from database. See SalesStore.export()."""
+        from coffee_for_me.exporter.exporter import Exporter
+        return Exporter.export_all(file_names, parallel=parallel)
+
+    def close(self):
+        """Closes connection used for data version. Pooled connections are closed at exit."""
+        with self._version_lock:
+            if self._version_conn is not None:
+                self._version_conn.close()
+                self._version_conn = None
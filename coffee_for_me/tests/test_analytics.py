@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from coffee_for_me.functions.analytics import *
+from coffee_for_me.functions.db_funcs import db_name, create_table, record_sales_batch
+from coffee_for_me.functions.connection_pool import close_pools
+from io import StringIO
+from unittest.mock import patch
+import os
+
+
+class AnalyticsTest(TestCase):
+
+    def setUp(self):
+        create_table()
+        record_sales_batch([
+            ('Tony Ynot', [('beverage', 'tea', 400), ('addition', 'sugar', 150)], '2020-01-06 10:15:00.000'),
+            ('Tony Ynot', [('beverage', 'coffee', 300)], '2020-01-06 11:30:00.000'),
+            ('Liza Azil', [('beverage', 'tea', 400), ('addition', 'milk', 100)], '2020-01-07 09:00:00.000'),
+            ('Liza Azil', [('beverage', 'tea', 450)], '2020-01-13 09:00:00.000'),
+        ])
+
+    def tearDown(self):
+        close_pools()
+        if os.path.exists('employees.db'):
+            os.remove('employees.db')
+
+    def test_salespeople_sales_by_day(self):
+        self.assertEqual([('Liza Azil', '2020-01-07', 1, 1, 500), ('Liza Azil', '2020-01-13', 1, 0, 450),
+                          ('Tony Ynot', '2020-01-06', 2, 1, 850)], salespeople_sales_by_period('day'))
+
+    def test_salespeople_sales_by_hour_in_period(self):
+        self.assertEqual([('Tony Ynot', '2020-01-06 10:00', 1, 1, 550), ('Tony Ynot', '2020-01-06 11:00', 1, 0, 300)],
+                         salespeople_sales_by_period('hour', '2020-01-06', '2020-01-07'))
+
+    def test_salespeople_sales_by_week(self):
+        self.assertEqual([('Liza Azil', '2020-W01', 1, 1, 500), ('Liza Azil', '2020-W02', 1, 0, 450),
+                          ('Tony Ynot', '2020-W01', 2, 1, 850)], salespeople_sales_by_period('week'))
+
+    def test_unsupported_period(self):
+        with self.assertRaises(ValueError):
+            salespeople_sales_by_period('month')
+
+    def test_items_sales(self):
+        self.assertEqual([('beverage', 'tea', 3, 1250), ('beverage', 'coffee', 1, 300), ('addition', 'sugar', 1, 150),
+                          ('addition', 'milk', 1, 100)], items_sales())
+
+    def test_attach_rate(self):
+        self.assertEqual(0.5, attach_rate(4, 2))
+        self.assertEqual(0.0, attach_rate(0, 0))
+
+    def test_sales_analytics(self):
+        analytics = sales_analytics('week', top=1)
+        self.assertEqual([{'period': '2020-W01', 'beverages': 3, 'additions': 2, 'amount_cents': 1350},
+                          {'period': '2020-W02', 'beverages': 1, 'additions': 0, 'amount_cents': 450}],
+                         analytics['revenue'])
+        self.assertEqual([{'item': 'tea', 'sales': 3, 'amount_cents': 1250}], analytics['top_beverages'])
+        self.assertEqual([{'item': 'sugar', 'sales': 1, 'amount_cents': 150}], analytics['top_additions'])
+        self.assertEqual(0.5, analytics['attach_rate'])
+        self.assertEqual(['Liza Azil', 'Tony Ynot'], [person['name'] for person in analytics['salespeople']])
+        self.assertEqual((950, 0.5, ['2020-W01', '2020-W02']),
+                         (analytics['salespeople'][0]['amount_cents'], analytics['salespeople'][0]['attach_rate'],
+                          [row['period'] for row in analytics['salespeople'][0]['trend']]))
+
+    def test_sales_analytics_reads_one_snapshot(self):
+        def sale_between_queries(start, end):
+            conn = sqlite3.connect(db_name, timeout=0)
+            try:  # other connection can't commit while report's read transaction holds the database
+                with self.assertRaises(sqlite3.OperationalError), conn:
+                    conn.execute('INSERT INTO ' + sales_table_name + ' (employee_id, sold_at, kind, item, price_cents)'
+                                 " VALUES (1, '2020-01-06 12:00:00.000', 'beverage', 'tea', 400)")
+            finally:
+                conn.close()
+            return items(start, end)
+
+        items = items_sales
+        with patch('coffee_for_me.functions.analytics.items_sales', new=sale_between_queries):
+            self.assertEqual(0.5, sales_analytics('week')['attach_rate'])
+
+    def test_sales_analytics_no_sales_in_period(self):
+        analytics = sales_analytics('day', '2021-01-01', '2021-02-01')
+        self.assertEqual(([], [], 0.0), (analytics['revenue'], analytics['salespeople'], analytics['attach_rate']))
+
+    def test_show_sales_analytics(self):
+        with patch('sys.stdout', new=StringIO()) as actual_output:
+            show_sales_analytics(sales_analytics('day'))
+        self.assertIn('2020-01-06', actual_output.getvalue())
+        self.assertIn('Attach rate: 50.0%', actual_output.getvalue())
@@ -57,3 +57,32 @@ class ArgparserTest(TestCase):
         with self.assertRaises(SystemExit):
             self.parser.parse_args(['John', '-bev=Tea', '-add=Sugar'])
         self.assertIn('the following arguments are required: employee_position', mock_stderr.getvalue())
+
+    def test_command_parser_ingest(self):
+        args = ArgumentParser.parse_command_arguments().parse_args(['ingest', 'sales.csv', '-bev=Tea', '-add=Sugar',
+                                                                    '--batch-size', '500', '--records', 'journal'])
+        self.assertEqual(('ingest', 'sales.csv', None, ['Tea'], ['Sugar'], 500, 'journal', False),
+                         (args.command, args.file, args.input_format, args.beverage, args.addition,
+                          args.batch_size, args.records, args.wal))
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_command_parser_batch_size_not_positive(self, mock_stderr):
+        for command in (['ingest', 'sales.csv', '-bev=Tea'], ['serve']):
+            for batch_size in ('0', '-5', 'abc'):
+                with self.assertRaises(SystemExit):
+                    ArgumentParser.parse_command_arguments().parse_args(command + ['--batch-size', batch_size])
+        with self.assertRaises(SystemExit):
+            self.parser.parse_args(['John', 'Salesperson', '--store', 'buffered', '--batch-size', '0'])
+        self.assertIn("'0' is not a positive integer", mock_stderr.getvalue())
+
+    def test_command_parser_export(self):
+        args = ArgumentParser.parse_command_arguments().parse_args(['export', '--format', 'json, CSV', '--out', 'out',
+                                                                    '-z', 'gz'])
+        self.assertEqual(('export', ['json', 'csv'], 'out', 'Manager', 'gz'),
+                         (args.command, args.formats, args.out_dir, args.name, args.compress))
+
+    def test_command_parser_report(self):
+        args = ArgumentParser.parse_command_arguments().parse_args(['report', '--sort', 'amount', '--desc',
+                                                                    '--page-size', '20', '--page', '3'])
+        self.assertEqual(('report', 'amount', True, 20, 3, None),
+                         (args.command, args.order_by, args.descending, args.page_size, args.page, args.top))
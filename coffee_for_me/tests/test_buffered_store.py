@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from unittest.mock import patch
+from coffee_for_me.store.buffered_store import *
+from coffee_for_me.store.memory_store import MemoryStore
+import os
+import time
+
+
+class BufferedStoreTest(TestCase):
+
+    def setUp(self):
+        self.memory_store = MemoryStore()
+        self.store = BufferedStore(self.memory_store, batch_size=3)
+
+    def test_sales_are_buffered_until_batch_is_full(self):
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        self.assertEqual([], self.memory_store.sales_table())
+        self.store.record_sale('Liza Azil', ['Beverage: coffee. Price: 3.0$'])
+        self.assertEqual([(1, 'Tony Ynot', 2, 800), (2, 'Liza Azil', 1, 300)], self.memory_store.sales_table())
+
+    def test_batch_is_stored_at_once(self):
+        with patch.object(self.memory_store, 'record_sales', wraps=self.memory_store.record_sales) as mocked_record:
+            self.store.record_sales([('Tony Ynot', ['Beverage: tea. Price: 4.0$'], None)] * 3)
+        mocked_record.assert_called_once()
+        self.assertIsNotNone(mocked_record.call_args[0][0][0][2], '\n\nSale time should be taken when buffered')
+
+    def test_data_version_changes_on_buffered_sale(self):
+        version = self.store.data_version()
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        buffered_version = self.store.data_version()
+        self.assertNotEqual(version, buffered_version)
+        self.store.flush()
+        self.assertNotEqual(buffered_version, self.store.data_version())
+
+    def test_totals_and_records_include_buffered_sales(self):
+        self.memory_store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        self.store.record_sale('Tony Ynot', ['Beverage: coffee. Price: 3.0$', 'Addition: milk. Price: 1.0$'])
+        totals = self.store.salesperson_totals('Tony Ynot')
+        self.assertEqual((2, 1, 800), (totals['beverages'], totals['additions'], totals['amount_cents']))
+        self.assertEqual(['Beverage: tea. Price: 4.0$', 'Beverage: coffee. Price: 3.0$', 'Addition: milk. Price: 1.0$'],
+                         self.store.salesperson_records('Tony Ynot'))
+        self.assertEqual(['Addition: milk. Price: 1.0$'], self.store.salesperson_records('Tony Ynot')[-1:])
+        self.assertEqual(400, self.memory_store.salesperson_totals('Tony Ynot')['amount_cents'],
+                         '\n\nBuffer was flushed')
+
+    def test_records_of_salesperson_with_buffered_sales_only(self):
+        self.store.record_sale('Liza Azil', ['Beverage: coffee. Price: 3.0$'])
+        self.assertEqual(['Beverage: coffee. Price: 3.0$'], self.store.salesperson_records('Liza Azil'))
+
+    def test_sales_table_and_close_flush_buffer(self):
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        self.assertEqual([(1, 'Tony Ynot', 1, 400)], self.store.sales_table())
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        self.store.close()
+        self.assertEqual([(1, 'Tony Ynot', 2, 800)], self.memory_store.sales_table())
+
+    def test_sales_are_kept_in_buffer_if_flush_fails(self):
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        with patch.object(self.memory_store, 'record_sales', side_effect=IOError('server is not available')):
+            self.assertFalse(self.store.flush())
+        self.assertEqual(400, self.store.salesperson_totals('Tony Ynot')['amount_cents'])
+        self.assertTrue(self.store.flush())
+        self.assertEqual([(1, 'Tony Ynot', 1, 400)], self.memory_store.sales_table())
+
+    def test_sales_are_kept_in_buffer_on_exit_while_flushing(self):
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        with patch.object(self.memory_store, 'record_sales', side_effect=SystemExit(143)), \
+                self.assertRaises(SystemExit):
+            self.store.flush()
+        self.assertTrue(self.store.flush())
+        self.assertEqual([(1, 'Tony Ynot', 1, 400)], self.memory_store.sales_table())
+
+    def test_partly_stored_sales_are_logged(self):
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        with patch.object(self.memory_store, 'record_sales', return_value=False), \
+                self.assertLogs('main.argparsing.store.buffered_store', 'ERROR') as logs:
+            self.assertFalse(self.store.flush())
+        self.assertIn("'Tony Ynot', ['Beverage: tea. Price: 4.0$']", logs.output[0])
+        self.assertTrue(self.store.flush(), '\n\nPartly stored sales should not be flushed again')
+
+    def test_buffer_is_flushed_after_flush_interval(self):
+        store = BufferedStore(self.memory_store, batch_size=100, flush_interval=50)
+        store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        self.assertEqual([], self.memory_store.sales_table())
+        time.sleep(0.3)
+        self.assertEqual([(1, 'Tony Ynot', 1, 400)], self.memory_store.sales_table())
+        self.assertIsNone(store._timer)
+
+    def test_full_durability_stores_every_sale(self):
+        store = BufferedStore(self.memory_store, batch_size=100, durability='full')
+        store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        self.assertEqual([(1, 'Tony Ynot', 1, 400)], self.memory_store.sales_table())
+
+    def test_unsupported_durability(self):
+        with self.assertRaises(ValueError):
+            BufferedStore(self.memory_store, durability='paranoid')
+
+    def test_open_stores_are_flushed_at_exit(self):
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        flush_open_stores()
+        self.assertEqual([(1, 'Tony Ynot', 1, 400)], self.memory_store.sales_table())
+
+    def test_sigterm_exits_normally(self):
+        default_handler = signal.getsignal(signal.SIGTERM)
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            handle_sigterm()
+            with self.assertRaises(SystemExit):
+                os.kill(os.getpid(), signal.SIGTERM)
+                time.sleep(1)
+        finally:
+            signal.signal(signal.SIGTERM, default_handler)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from coffee_for_me.exporter.compression import *
+import bz2
+import gzip
+import lzma
+import os
+import zipfile
+
+
+class CompressionTest(TestCase):
+
+    def tearDown(self):
+        for f in os.listdir(os.curdir):
+            if f.startswith('test_compression'):
+                os.remove(f)
+
+    def test_compression_from_filename(self):
+        extensions = ('.gz', '.bz2', '.xz', '.ZIP', '')
+        self.assertEqual(['gz', 'bz2', 'xz', 'zip', None],
+                         [compression_from_filename('records.json' + ext) for ext in extensions])
+
+    def test_compressed_filename(self):
+        self.assertEqual('records.json.gz', compressed_filename('records.json', 'gz'))
+        self.assertEqual('records.json.gz', compressed_filename('records.json.gz', 'gz'))
+        self.assertEqual('records.json', compressed_filename('records.json'))
+
+    def test_compressed_filename_unsupported_compression(self):
+        with self.assertRaises(ValueError):
+            compressed_filename('records.json', 'rar')
+
+    def test_open_export_file_stream_compressions(self):
+        for compression, module in (('gz', gzip), ('bz2', bz2), ('xz', lzma)):
+            file_name = 'test_compression.txt.' + compression
+            with open_export_file(file_name) as f:
+                f.write('Beverage: tea. Price: 4.0$\n')
+            with module.open(file_name, 'rt') as f:
+                self.assertEqual('Beverage: tea. Price: 4.0$\n', f.read())
+
+    def test_open_export_file_zip(self):
+        with open_export_file('test_compression.txt', 'zip') as f:
+            f.write('Beverage: tea. Price: 4.0$\n')
+        with zipfile.ZipFile('test_compression.txt') as archive:
+            self.assertEqual(['test_compression.txt'], archive.namelist())
+            self.assertEqual(b'Beverage: tea. Price: 4.0$\n', archive.read('test_compression.txt'))
+        with open_export_file('test_compression.txt.zip') as f:
+            f.write('Beverage: tea. Price: 4.0$\n')
+        with zipfile.ZipFile('test_compression.txt.zip') as archive:
+            self.assertEqual(['test_compression.txt'], archive.namelist())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from coffee_for_me.exporter.exporter import Exporter
+from coffee_for_me.functions import db_funcs
+from coffee_for_me.functions.connection_pool import close_pools
+import multiprocessing
+import os
+
+writers_number = 6
+sales_number = 40
+
+
+def record_sales_worker(db_path, wal, name):
+    """Records sales_number sales for salesperson in a separate process and returns number of recorded sales."""
+    db_funcs.db_name = db_path
+    if wal:
+        db_funcs.enable_wal()
+    return sum(db_funcs.record_sale(name, 1, 1.5, [('beverage', 'tea', 150)]) for _ in range(sales_number))
+
+
+def export_worker(db_path, wal, file_name):
+    """Exports sales records to csv file in a separate process while salespeople are selling."""
+    db_funcs.db_name = db_path
+    if wal:
+        db_funcs.enable_wal()
+    for _ in range(sales_number):
+        Exporter.export_as_csv(file_name)
+    return 0
+
+
+class ConcurrentWritesTest(TestCase):
+    """Stress test: several salespeople processes and a manager process use the same database at the same time."""
+
+    def setUp(self):
+        self.default_db_name = db_funcs.db_name
+        self.db_path = 'test_concurrent.db'
+        self.export_file = 'test_concurrent.csv'
+        db_funcs.db_name = self.db_path
+        db_funcs.create_table()
+
+    def tearDown(self):
+        close_pools()
+        db_funcs.db_name = self.default_db_name
+        for f in os.listdir(os.curdir):
+            if f.startswith(('test_concurrent.db', self.export_file)):
+                os.remove(f)
+
+    def run_processes(self, wal):
+        if wal:
+            db_funcs.enable_wal()
+        names = ['Seller{}'.format(i) for i in range(writers_number)]
+        tasks = [(record_sales_worker, (self.db_path, wal, name)) for name in names]
+        tasks.append((export_worker, (self.db_path, wal, self.export_file)))
+        # spawn, so child processes don't inherit parent's open sqlite3 connections
+        with multiprocessing.get_context('spawn').Pool(len(tasks)) as pool:
+            results = [pool.apply_async(func, args) for func, args in tasks]
+            recorded = [result.get(timeout=120) for result in results]
+        self.assertEqual([sales_number] * writers_number + [0], recorded)
+        with db_funcs.db_connection() as conn:
+            rows = conn.execute('SELECT name, sales, amount FROM employees ORDER BY name').fetchall()
+            items_number = conn.execute('SELECT COUNT(*) FROM sales').fetchone()[0]
+        self.assertEqual([(name, sales_number, sales_number * 1.5) for name in names], rows)
+        self.assertEqual(writers_number * sales_number, items_number)
+
+    def test_concurrent_writes_wal_mode(self):
+        self.run_processes(wal=True)
+        with db_funcs.db_connection() as conn:
+            self.assertEqual(('wal',), conn.execute('PRAGMA journal_mode').fetchone())
+
+    def test_concurrent_writes_rollback_journal_mode(self):
+        self.run_processes(wal=False)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from coffee_for_me.functions.connection_pool import *
+import os
+
+
+class ConnectionPoolTest(TestCase):
+
+    def setUp(self):
+        self.db_path = 'test_pool.db'
+        self.pool = ConnectionPool(self.db_path, size=2, lifetime=600.0)
+        with self.pool.connection() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS items (name text)')
+
+    def tearDown(self):
+        self.pool.close()
+        close_pools()
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+
+    def test_connection_is_reused(self):
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+        self.assertIs(conn, self.pool.acquire())
+
+    def test_pool_keeps_only_size_idle_connections(self):
+        connections = [self.pool.acquire() for _ in range(3)]
+        for conn in connections:
+            self.pool.release(conn)
+        self.assertEqual(2, len(self.pool._idle))
+
+    def test_expired_connection_is_not_reused(self):
+        self.pool.lifetime = 0
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+        self.assertIsNot(conn, self.pool.acquire())
+
+    def test_connection_to_removed_db_file_is_not_reused(self):
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+        os.remove(self.db_path)
+        new_conn = self.pool.acquire()
+        self.assertIsNot(conn, new_conn)
+        self.assertEqual([], new_conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall())
+
+    def test_pragmas_applied(self):
+        with self.pool.connection() as conn:
+            self.assertEqual((1,), conn.execute('PRAGMA foreign_keys').fetchone())
+
+    def test_nested_connection_shares_transaction(self):
+        with self.pool.connection() as outer:
+            outer.execute('INSERT INTO items VALUES (?)', ('tea',))
+            with self.pool.connection() as inner:
+                self.assertIs(outer, inner)
+                inner.execute('INSERT INTO items VALUES (?)', ('coffee',))
+            self.assertTrue(outer.in_transaction, '\n\nNested block committed the transaction')
+        with self.pool.connection() as conn:
+            self.assertEqual([('tea',), ('coffee',)], conn.execute('SELECT name FROM items').fetchall())
+
+    def test_connection_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.pool.connection() as conn:
+                conn.execute('INSERT INTO items VALUES (?)', ('tea',))
+                raise RuntimeError('sale cancelled')
+        with self.pool.connection() as conn:
+            self.assertEqual([], conn.execute('SELECT name FROM items').fetchall())
+
+    def test_nested_connection_error_rolls_back_transaction(self):
+        with self.assertRaises(sqlite3.OperationalError):
+            with self.pool.connection() as outer:
+                outer.execute('INSERT INTO items VALUES (?)', ('tea',))
+                try:
+                    with self.pool.connection() as inner:
+                        inner.execute('INSERT INTO missing VALUES (?)', ('coffee',))
+                except sqlite3.Error:
+                    pass  # caught and logged the way db functions do it
+        with self.pool.connection() as conn:
+            self.assertEqual([], conn.execute('SELECT name FROM items').fetchall())
+
+    def test_connection_released_to_closed_pool_is_closed(self):
+        conn = self.pool.acquire()
+        self.pool.close()
+        self.pool.release(conn)
+        self.assertEqual([], self.pool._idle)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute('SELECT 1')
+
+    def test_get_pool_returns_same_pool(self):
+        self.assertIs(get_pool(self.db_path), get_pool(self.db_path))
+
+    def test_set_synchronous_replaces_synchronous_pragma(self):
+        pragmas = pool_settings['pragmas']
+        try:
+            configure_pools(pragmas=default_pragmas)
+            set_synchronous('OFF')
+            set_synchronous('FULL')
+            self.assertEqual(default_pragmas + (('synchronous', 'FULL'),), pool_settings['pragmas'])
+            with get_pool(self.db_path).connection() as conn:
+                self.assertEqual(2, conn.execute('PRAGMA synchronous').fetchone()[0])
+        finally:
+            configure_pools(pragmas=pragmas)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 from unittest import TestCase
 from coffee_for_me.functions.db_funcs import *
+from coffee_for_me.functions.migrations import latest_version
 import os
 
 
@@ -25,6 +26,21 @@ class DbFuncsTest(TestCase):
         self.cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='employees'")
         self.assertEqual([('employees',)], self.cur.fetchall(), '\n\nTables does not exist')
 
+    def test_create_table_returns_schema_version(self):
+        self.assertEqual(latest_version(), create_table())
+
+    def test_parse_timestamp(self):
+        self.assertEqual(['2020-01-02 00:00:00.000', '2020-01-02 10:00:00.000', '2020-01-02 10:00:05.120',
+                          '2020-01-01 23:30:00.000', '2020-01-02 03:00:00.000'],
+                         [parse_timestamp(value) for value in ('2020-01-02', '2020-01-02 10:00',
+                                                               '2020-01-02T10:00:05.12Z', '2020-01-02T01:30:00+02:00',
+                                                               '2020-01-01 22:00-0500')])
+
+    def test_parse_timestamp_invalid(self):
+        for value in ('yesterday', '2020-13-01', '2020-01-02 25:00', '02.01.2020', None):
+            with self.assertRaises(ValueError, msg=value):
+                parse_timestamp(value)
+
     def test_is_employee_in_db(self):
         insert_db_record('Jake', 7, 9)
         self.conn.commit()
@@ -46,6 +62,19 @@ class DbFuncsTest(TestCase):
         insert_db_record('Nina', 20, 30)
         self.assertEqual([(1, 'Mike', 70, 90), (2, 'Nina', 20, 30)], view_db_records())
 
+    def test_view_db_records_page(self):
+        for name, sales, amount in (('Mike', 70, 90), ('Nina', 20, 300), ('Anna', 5, 90)):
+            insert_db_record(name, sales, amount)
+        totals = {'salespeople': 3, 'sales': 95, 'amount_cents': 480}
+        self.assertEqual(([(2, 'Nina', 20, 300), (1, 'Mike', 70, 90)], totals),
+                         view_db_records_page('amount', descending=True, limit=2))
+        self.assertEqual(([(2, 'Nina', 20, 300)], totals), view_db_records_page('name', limit=1, offset=2))
+        self.assertEqual(([], totals), view_db_records_page(limit=2, offset=4))
+
+    def test_view_db_records_page_unsupported_column(self):
+        with self.assertRaises(ValueError):
+            view_db_records_page('amount; DROP TABLE employees')
+
     def test_is_table_empty_false(self):
         insert_db_record('Mike', 70, 90)
         self.assertEqual(False, is_table_empty())
@@ -53,4 +82,51 @@ class DbFuncsTest(TestCase):
     def test_is_table_empty_true(self):
         self.assertEqual(True, is_table_empty())
 
+    def test_record_sale_inserts_new_salesperson(self):
+        self.assertTrue(record_sale('Mike', 2, 550))
+        self.cur.execute('SELECT * FROM employees WHERE name="Mike"')
+        self.assertEqual([(1, 'Mike', 2, 550)], self.cur.fetchall())
+
+    def test_record_sale_adds_to_existing_salesperson(self):
+        record_sale('Mike', 2, 550)
+        record_sale('Mike', 1, 430)
+        self.cur.execute('SELECT * FROM employees WHERE name="Mike"')
+        self.assertEqual([(1, 'Mike', 3, 980)], self.cur.fetchall())
+
+    def test_name_is_unique(self):
+        insert_db_record('Mike', 7, 9)
+        insert_db_record('Mike', 1, 1)
+        self.cur.execute('SELECT * FROM employees WHERE name="Mike"')
+        self.assertEqual([(1, 'Mike', 7, 9)], self.cur.fetchall())
+
+    def test_create_table_merges_duplicated_names(self):
+        self.cur.execute('DROP INDEX employees_name_idx')
+        self.cur.execute('PRAGMA user_version = 1')
+        self.cur.executemany('INSERT INTO employees VALUES (NULL,?,?,?)',
+                             [('Mike', 2, 5), ('Nina', 1, 3), ('Mike', 4, 9)])
+        self.conn.commit()
+        create_table()
+        self.cur.execute('SELECT * FROM employees')
+        self.assertEqual([(1, 'Mike', 4, 900), (2, 'Nina', 1, 300)], self.cur.fetchall())
+
+    def test_record_sale_stores_line_items(self):
+        record_sale('Mike', 2, 550, [('beverage', 'tea', 400), ('addition', 'sugar', 150)], '2020-01-02 10:00:00.000')
+        self.cur.execute('SELECT employee_id, sold_at, kind, item, price_cents FROM sales')
+        self.assertEqual([(1, '2020-01-02 10:00:00.000', 'beverage', 'tea', 400),
+                          (1, '2020-01-02 10:00:00.000', 'addition', 'sugar', 150)], self.cur.fetchall())
+
+    def test_view_item_sales(self):
+        record_sale('Mike', 2, 550, [('beverage', 'tea', 400), ('addition', 'sugar', 150)])
+        record_sale('Nina', 1, 420, [('beverage', 'tea', 420)])
+        self.assertEqual([('addition', 'sugar', 1, 150), ('beverage', 'tea', 2, 820)], view_item_sales())
+        self.assertEqual([('beverage', 'tea', 2, 820)], view_item_sales('tea'))
 
+    def test_view_sales_in_period(self):
+        record_sale('Mike', 1, 400, [('beverage', 'tea', 400)], '2020-01-01 10:00:00.000')
+        record_sale('Nina', 1, 300, [('beverage', 'soda', 300)], '2020-01-02 10:00:00.000')
+        record_sale('Mike', 1, 200, [('beverage', 'water', 200)], '2020-01-03 10:00:00.000')
+        self.assertEqual([('Mike', '2020-01-01 10:00:00.000', 'beverage', 'tea', 400),
+                          ('Nina', '2020-01-02 10:00:00.000', 'beverage', 'soda', 300)],
+                         view_sales_in_period('2020-01-01', '2020-01-03'))
+        self.assertEqual([('Mike', '2020-01-03 10:00:00.000', 'beverage', 'water', 200)],
+                         view_sales_in_period('2020-01-02', '2020-01-04', 'Mike'))
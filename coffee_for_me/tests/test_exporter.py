@@ -2,21 +2,26 @@
 from unittest import TestCase
 from coffee_for_me.exporter.exporter import Exporter
 from coffee_for_me.functions.db_funcs import *
+from coffee_for_me.functions.functions import read_records
+from unittest.mock import patch
+import gzip
+import json
 import os
+import zipfile
 
 
 class ExporterTest(TestCase):
 
     def setUp(self):
         create_table()
-        insert_db_record('Mike', 7, 9)
-        insert_db_record('John', 2, 32)
+        insert_db_record('Mike', 7, 900)  # amounts are stored in cents and exported in dollars
+        insert_db_record('John', 2, 3200)
         self.exporter = Exporter()
         self.file_name = 'Dan Smith_records.'
 
     def tearDown(self):
         try:
-            extensions = ('.db', '.json', '.xml', '.csv')
+            extensions = ('.db', '.json', '.jsonl', '.xml', '.csv', '.gz')
             for f in os.listdir(os.curdir):
                 if f.endswith(extensions):
                     os.remove(f)
@@ -24,10 +29,24 @@ class ExporterTest(TestCase):
             print(e)
 
     def test_export_as_json(self):
-        expected_json = '{"employees": [{"id": 1, "name": "Mike", "sales": 7, "amount": 9}, ' \
-                        '{"id": 2, "name": "John", "sales": 2, "amount": 32}]}'
+        expected_json = '{"employees": [{"id": 1, "name": "Mike", "sales": 7, "amount": 9.0}, ' \
+                        '{"id": 2, "name": "John", "sales": 2, "amount": 32.0}]}'
         res = self.exporter.export_as_json(self.file_name + 'json')
-        self.assertEqual(expected_json, res)
+        with open(self.file_name + 'json') as f:
+            self.assertEqual(expected_json, f.read())
+        self.assertEqual(len(expected_json), res)
+
+    def test_export_as_json_in_chunks(self):
+        insert_db_record('Nina', 4, 12)
+        self.exporter.export_as_json(self.file_name + 'json', chunk_size=2)
+        with open(self.file_name + 'json') as f:
+            self.assertEqual(['Mike', 'John', 'Nina'], [row['name'] for row in json.load(f)['employees']])
+
+    def test_export_as_json_lines(self):
+        self.exporter.export_as_json(self.file_name + 'jsonl', lines=True, chunk_size=1)
+        self.assertEqual(['{"id": 1, "name": "Mike", "sales": 7, "amount": 9.0}',
+                          '{"id": 2, "name": "John", "sales": 2, "amount": 32.0}'],
+                         list(read_records(self.file_name + 'jsonl')))
 
     def test_export_as_xml(self):
         expected_xml = '''<?xml version="1.0" ?>
@@ -36,21 +55,90 @@ class ExporterTest(TestCase):
     <id>1</id>
     <name>Mike</name>
     <sales>7</sales>
-    <amount>9</amount>
+    <amount>9.0</amount>
   </row>
   <row>
     <id>2</id>
     <name>John</name>
     <sales>2</sales>
-    <amount>32</amount>
+    <amount>32.0</amount>
   </row>
 </employees>\n'''
         res = self.exporter.export_as_xml(self.file_name + 'xml')
-        self.assertEqual(expected_xml, res)
+        with open(self.file_name + 'xml') as f:
+            self.assertEqual(expected_xml, f.read())
+        self.assertEqual(len(expected_xml), res)
+
+    def test_export_as_xml_escapes_values(self):
+        insert_db_record('Tom & <Jerry>', 1, 2)
+        self.exporter.export_as_xml(self.file_name + 'xml', chunk_size=1)
+        with open(self.file_name + 'xml') as f:
+            self.assertIn('    <name>Tom &amp; &lt;Jerry&gt;</name>\n', f.read())
+
+    def test_export_as_xml_custom_layout(self):
+        expected_xml = '''<?xml version="1.0" ?>
+<employees>
+  <seller>
+    <name>Mike</name>
+    <total>9.0</total>
+  </seller>
+  <seller>
+    <name>John</name>
+    <total>32.0</total>
+  </seller>
+</employees>\n'''
+        self.exporter.export_as_xml(self.file_name + 'xml', row_tag='seller',
+                                    column_tags={'name': 'name', 'amount': 'total'})
+        with open(self.file_name + 'xml') as f:
+            self.assertEqual(expected_xml, f.read())
+
+    def test_export_as_xml_invalid_tags(self):
+        with self.assertRaises(ValueError):
+            self.exporter.export_as_xml(self.file_name + 'xml', row_tag='seller><script')
+        with self.assertRaises(ValueError):
+            self.exporter.export_as_xml(self.file_name + 'xml', column_tags={'name': '1st name'})
+        with self.assertRaises(ValueError):
+            self.exporter.export_as_xml(self.file_name + 'xml', column_tags={'salary': 'salary'})
 
     def test_export_as_csv(self):
-        res = self.exporter.export_as_csv(self.file_name + 'xml')
-        self.assertIn('ID,Name,Number of Sales,Total Amount ($)', res)
-        self.assertIn('1,Mike,7,9', res)
-        self.assertIn('2,John,2,32', res)
+        res = self.exporter.export_as_csv(self.file_name + 'csv')
+        records = list(read_records(self.file_name + 'csv'))
+        self.assertIn('ID,Name,Number of Sales,Total Amount ($)\r', records)
+        self.assertIn('1,Mike,7,9.0\r', records)
+        self.assertIn('2,John,2,32.0\r', records)
+        self.assertEqual(os.path.getsize(self.file_name + 'csv'), res)
+
+    def test_export_compressed_by_file_extension(self):
+        res = self.exporter.export_as_json(self.file_name + 'json.gz')
+        with gzip.open(self.file_name + 'json.gz', 'rt') as f:
+            self.assertEqual(['Mike', 'John'], [row['name'] for row in json.load(f)['employees']])
+        self.assertEqual(os.path.getsize(self.file_name + 'json.gz'), res)
+
+    def test_export_compressed_by_option(self):
+        self.exporter.export_as_csv(self.file_name + 'csv', compression='zip')
+        with zipfile.ZipFile(self.file_name + 'csv') as archive:
+            self.assertIn(b'1,Mike,7,9.0', archive.read(self.file_name + 'csv'))
+
+    def test_export_all(self):
+        file_names = {ext: self.file_name + ext for ext in ('json', 'xml', 'csv')}
+        with patch('coffee_for_me.exporter.exporter.db_connection', wraps=db_connection) as mocked_connection:
+            res = self.exporter.export_all(file_names, chunk_size=1)
+        mocked_connection.assert_called_once()  # one pass over the table
+        self.exporter.export_as_json('single.json')
+        self.exporter.export_as_xml('single.xml')
+        self.exporter.export_as_csv('single.csv')
+        for ext, file_name in file_names.items():
+            with open(file_name) as f, open('single.' + ext) as single:
+                self.assertEqual(single.read(), f.read())
+            self.assertEqual(os.path.getsize(file_name), res[ext])
+
+    def test_export_all_parallel(self):
+        file_names = {'jsonl': self.file_name + 'jsonl', 'csv': self.file_name + 'csv.gz'}
+        self.exporter.export_all(file_names, chunk_size=1, parallel=True)
+        self.assertEqual(2, len(list(read_records(file_names['jsonl']))))
+        with gzip.open(file_names['csv'], 'rt') as f:
+            self.assertIn('2,John,2,32.0', f.read())
 
+    def test_export_all_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            self.exporter.export_all({'yaml': self.file_name + 'yaml'})
@@ -53,13 +53,13 @@ class FunctionsTest(TestCase):
     def test_enter_price_int(self, mocked_input):
         mocked_input.side_effect = [4]
         price = enter_price('ingredient')
-        self.assertEqual('4.0', price)
+        self.assertEqual(400, price)
 
     @mock.patch('builtins.input', create=True)
     def test_enter_price_float(self, mocked_input):
         mocked_input.side_effect = [4.87]
         price = enter_price('ingredient')
-        self.assertEqual('4.87', price)
+        self.assertEqual(487, price)
 
     @mock.patch('builtins.input', create=True)
     def test_enter_price_str(self, mocked_input):
@@ -67,7 +67,7 @@ class FunctionsTest(TestCase):
         with patch('sys.stdout', new=StringIO()) as actual_output:
             mocked_input.side_effect = ['four', 5]
             price = enter_price('ingredient')
-        self.assertEqual('5.0', price)
+        self.assertEqual(500, price)
         self.assertIn(expected_output, actual_output.getvalue(), '\n\nStrings do not match!')
 
     @mock.patch('builtins.input', create=True)
@@ -76,22 +76,34 @@ class FunctionsTest(TestCase):
         with patch('sys.stdout', new=StringIO()) as actual_output:
             mocked_input.side_effect = [-3, 5]
             price = enter_price('beverage')
-        self.assertEqual('5.0', price)
+        self.assertEqual(500, price)
         self.assertIn(expected_output, actual_output.getvalue(), '\n\nStrings do not match!')
 
     def test_beverage_to_file(self):
         bev1 = beverage_to_file('test_records.txt', '1st beverage')
         bev2 = beverage_to_file('test_records.txt', '2nd beverage')
+        records = list(read_records('test_records.txt'))
         os.remove('test_records.txt')
         self.assertEqual('1st beverage\n', bev1)
-        self.assertEqual('1st beverage\n2nd beverage\n', bev2)
+        self.assertEqual('2nd beverage\n', bev2)
+        self.assertEqual(['1st beverage', '2nd beverage'], records)
 
     def test_beverage_addition_to_file(self):
         rec1 = beverage_addition_to_file('test_records.txt', '1st beverage', '1st addition')
         rec2 = beverage_addition_to_file('test_records.txt', '2nd beverage', '2nd addition')
+        records = list(read_records('test_records.txt'))
         os.remove('test_records.txt')
         self.assertEqual('1st beverage\n1st addition\n', rec1)
-        self.assertEqual('1st beverage\n1st addition\n2nd beverage\n2nd addition\n', rec2)
+        self.assertEqual('2nd beverage\n2nd addition\n', rec2)
+        self.assertEqual(['1st beverage', '1st addition', '2nd beverage', '2nd addition'], records)
+
+    def test_read_records_from_offset(self):
+        beverage_to_file('test_records.txt', '1st beverage')
+        offset = os.path.getsize('test_records.txt')
+        beverage_addition_to_file('test_records.txt', '2nd beverage', '2nd addition')
+        records = list(read_records('test_records.txt', offset))
+        os.remove('test_records.txt')
+        self.assertEqual(['2nd beverage', '2nd addition'], records)
 
     def test_show_sales_table(self):
         expected_output = '\x1b[32mSeller Name\x1b[0m                   \t|\t\x1b' \
@@ -100,7 +112,7 @@ class FunctionsTest(TestCase):
                           'Jack Smith                    \t|\t6              \t|\t9.67\n' \
                           'Total:                        \t|\t9              \t|\t16.47\t\n\n'
         with patch('sys.stdout', new=StringIO()) as actual_output:
-            show_sales_table([(1, 'Tony Ynot', 3, 6.8), (2, 'Jack Smith', 6, 9.67)])
+            show_sales_table([(1, 'Tony Ynot', 3, 680), (2, 'Jack Smith', 6, 967)])
         self.assertIn(expected_output, actual_output.getvalue(), '\n\nStrings do not match')
 
     def test_match_price(self):
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from unittest.mock import patch
+from io import StringIO
+from coffee_for_me.functions.ingest import *
+from coffee_for_me.functions.db_funcs import create_table, view_db_records, view_sales_in_period
+from coffee_for_me.functions.connection_pool import close_pools
+from coffee_for_me.functions.sales_totals import load_totals
+from coffee_for_me.store.sqlite_store import SqliteStore
+from coffee_for_me.argparser.argument_parser import ArgumentParser
+from coffee_for_me.__main__ import run_command
+from datetime import datetime, timezone
+import os
+import shutil
+
+
+class IngestTest(TestCase):
+
+    def setUp(self):
+        create_table()
+        self.beverages = ['Tea', 'coffee']
+        self.additions = ['sugar', 'Milk']
+        self.csv_file = 'test_ingest.csv'
+        with open(self.csv_file, 'w') as f:
+            f.write('salesperson,beverage,beverage_price,addition,addition_price,sold_at\n'
+                    'Tony,tea,4.0,sugar,1.5,2020-01-02 10:00:00.000\n'
+                    'Liza,Coffee,3,,,2020-01-02 11:00:00.000\n'
+                    'Tony,beer,5,,,\n'
+                    'Liza,tea,abc,,,\n')
+
+    def tearDown(self):
+        close_pools()
+        for f in ('employees.db', self.csv_file, 'test_ingest.jsonl'):
+            if os.path.exists(f):
+                os.remove(f)
+        shutil.rmtree('salesperson_records', ignore_errors=True)
+
+    def test_read_sales_csv(self):
+        sales = list(read_sales(StringIO('salesperson,beverage,beverage_price\nTony,tea,4\n')))
+        self.assertEqual([{'salesperson': 'Tony', 'beverage': 'tea', 'beverage_price': '4'}], sales)
+
+    def test_read_sales_jsonl(self):
+        sales = list(read_sales(StringIO('{"salesperson": "Tony", "beverage": "tea"}\n\n'), 'jsonl'))
+        self.assertEqual([{'salesperson': 'Tony', 'beverage': 'tea'}], sales)
+
+    def test_read_sales_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            list(read_sales(StringIO(''), 'xml'))
+
+    def test_validate_sale(self):
+        sale = {'salesperson': 'Tony', 'beverage': 'Tea', 'beverage_price': '4.0',
+                'addition': 'milk', 'addition_price': 1.58}
+        self.assertEqual(('Tony Ynot', [('beverage', 'tea', 400), ('addition', 'milk', 158)], None),
+                         validate_sale(sale, self.beverages, self.additions))
+
+    def test_validate_sale_converts_sold_at_to_utc(self):
+        sale = {'salesperson': 'Tony', 'beverage': 'tea', 'beverage_price': '4', 'sold_at': '2020-01-02T10:00:00Z'}
+        self.assertEqual('2020-01-02 10:00:00.000', validate_sale(sale, self.beverages, self.additions)[2])
+        sale['sold_at'] = '2020-01-02 01:30:15.123456+02:00'
+        self.assertEqual('2020-01-01 23:30:15.123', validate_sale(sale, self.beverages, self.additions)[2])
+
+    def test_validate_sale_rejects_invalid_sales(self):
+        invalid_sales = [{'beverage': 'tea', 'beverage_price': '4'},
+                         {'salesperson': 'Tony', 'beverage': 'beer', 'beverage_price': '4'},
+                         {'salesperson': 'Tony', 'beverage': 'tea', 'beverage_price': 'four'},
+                         {'salesperson': 'Tony', 'beverage': 'tea', 'beverage_price': '-4'},
+                         {'salesperson': 'Tony', 'beverage': 'tea', 'beverage_price': '4',
+                          'addition': 'salt', 'addition_price': '1'},
+                         {'salesperson': 'Tony', 'beverage': 'tea', 'beverage_price': '1e3'},
+                         {'salesperson': 'Tony', 'beverage': 'tea', 'beverage_price': '4', 'sold_at': 'yesterday'},
+                         {'salesperson': 'Tony', 'beverage': 'tea', 'beverage_price': '4', 'sold_at': '2020-02-30'},
+                         {'salesperson': 'Tony', 'beverage': 'tea', 'beverage_price': '4', 'sold_at': 1577959200}]
+        for sale in invalid_sales:
+            with self.assertRaises(ValueError, msg=sale):
+                validate_sale(sale, self.beverages, self.additions)
+
+    def test_sale_records(self):
+        self.assertEqual(['Beverage: tea. Price: 4.0$', 'Addition: milk. Price: 1.58$'],
+                         sale_records([('beverage', 'tea', 400), ('addition', 'milk', 158)]))
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_ingest_file(self, mocked_stderr):
+        self.assertEqual((2, 2), ingest_file(self.csv_file, self.beverages, self.additions, batch_size=1))
+        self.assertEqual([(1, 'Tony Ynot', 2, 550), (2, 'Liza Azil', 1, 300)], view_db_records())
+        self.assertEqual([('Tony Ynot', '2020-01-02 10:00:00.000', 'beverage', 'tea', 400),
+                          ('Tony Ynot', '2020-01-02 10:00:00.000', 'addition', 'sugar', 150),
+                          ('Liza Azil', '2020-01-02 11:00:00.000', 'beverage', 'coffee', 300)],
+                         view_sales_in_period('2020-01-01', '2020-01-03'))
+        self.assertIn('Sale #3 is rejected', mocked_stderr.getvalue())
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_ingest_file_writes_records_files(self, mocked_stderr):
+        ingest_file(self.csv_file, self.beverages, self.additions)
+        with open(os.path.join('salesperson_records', 'Tony Ynot_records.txt')) as f:
+            self.assertEqual('Beverage: tea. Price: 4.0$\nAddition: sugar. Price: 1.5$\n', f.read())
+        totals = load_totals(os.path.join('salesperson_records', 'Tony Ynot_totals.json'),
+                             os.path.join('salesperson_records', 'Tony Ynot_records.txt'))
+        self.assertEqual((1, 550), (totals['sales'], totals['amount_cents']))
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_ingest_file_database_not_available(self, mocked_stderr):
+        with patch('coffee_for_me.store.sqlite_store.record_sales_batch', side_effect=[True, False]), \
+                self.assertRaises(IOError):
+            ingest_file(self.csv_file, self.beverages, self.additions, batch_size=1)
+        self.assertTrue(os.path.exists(SqliteStore.records_file('Tony Ynot')))
+        self.assertFalse(os.path.exists(SqliteStore.records_file('Liza Azil')), '\nRecords file should not be written')
+
+    def test_ingest_file_jsonl(self):
+        with open('test_ingest.jsonl', 'w') as f:
+            f.write('{"salesperson": "Tony", "beverage": "coffee", "beverage_price": 3}\n'
+                    '{"salesperson": "Tony", "beverage": "tea", "beverage_price": "4", "addition": "milk", '
+                    '"addition_price": "1"}\n')
+        self.assertEqual((2, 0), ingest_file('test_ingest.jsonl', self.beverages, self.additions))
+        self.assertEqual([(1, 'Tony Ynot', 3, 800)], view_db_records())
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_ingest_file_jsonl_invalid_lines(self, mocked_stderr):
+        with open('test_ingest.jsonl', 'w') as f:
+            f.write('{"salesperson": "Tony", "beverage": "coffee", "beverage_price": 3}\n'
+                    '{"salesperson": "Tony", "beverage": \n'
+                    '["Tony", "tea", 4]\n'
+                    '{"salesperson": "Liza", "beverage": "tea", "beverage_price": 4}\n')
+        self.assertEqual((2, 2), ingest_file('test_ingest.jsonl', self.beverages, self.additions))
+        self.assertEqual([(1, 'Tony Ynot', 1, 300), (2, 'Liza Azil', 1, 400)], view_db_records())
+        self.assertIn('Sale #2 is rejected: line 2 is not valid json', mocked_stderr.getvalue())
+        self.assertIn('Sale #3 is rejected: line 3 is not a json object', mocked_stderr.getvalue())
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_ingest_file_journal_backend(self, mocked_stderr):
+        store = SqliteStore('journal')
+        self.assertEqual((2, 2), ingest_file(self.csv_file, self.beverages, self.additions, store=store))
+        self.assertFalse(os.path.exists(SqliteStore.records_file('Tony Ynot')), '\nRecords file should not be written')
+        self.assertEqual(550, store.salesperson_totals('Tony Ynot')['amount_cents'])
+        self.assertEqual(['Beverage: tea. Price: 4.0$', 'Addition: sugar. Price: 1.5$'],
+                         list(store.salesperson_records('Tony Ynot')))
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_ingest_command_journal_keeps_sale_times(self, mocked_stderr, mocked_stdout):
+        args = ArgumentParser.parse_command_arguments().parse_args(['ingest', self.csv_file, '-bev=Tea', '-bev=coffee',
+                                                                    '-add=sugar', '--records', 'journal'])
+        run_command(args)
+        self.assertIn('Ingested 2 sales, rejected 2', mocked_stdout.getvalue())
+        self.assertEqual([datetime(2020, 1, 2, 10, tzinfo=timezone.utc)] * 2,
+                         [sold_at for sold_at, _, _, _ in SqliteStore('journal').journal('Tony Ynot').records()])
+
+    def test_ingest_stdin(self):
+        with patch('sys.stdin', StringIO('salesperson,beverage,beverage_price\nTony,tea,4\n')):
+            self.assertEqual((1, 0), ingest_file('-', self.beverages, self.additions))
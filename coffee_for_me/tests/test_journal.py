@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from unittest.mock import patch
+from coffee_for_me.functions.journal import *
+from datetime import datetime, timezone
+import os
+
+
+class JournalTest(TestCase):
+
+    def setUp(self):
+        self.journal_file = 'test_journal.bin'
+        self.records_file = 'test_journal_records.txt'
+        self.journal = SalesJournal(self.journal_file)
+
+    def tearDown(self):
+        for f in (self.journal_file, self.journal.items_file, self.records_file):
+            if os.path.exists(f):
+                os.remove(f)
+
+    def test_append_writes_fixed_width_records(self):
+        self.assertEqual(64, self.journal.append([('beverage', 'tea', 400), ('addition', 'sugar', 150)]))
+        self.journal.append([('beverage', 'coffee', 300)])
+        self.assertEqual(3 * record_struct.size, os.path.getsize(self.journal_file))
+        with open(self.journal.items_file) as f:
+            self.assertEqual('tea\nsugar\ncoffee\n', f.read())
+
+    def test_item_codes_are_reused(self):
+        self.journal.append([('beverage', 'tea', 400)])
+        journal = SalesJournal(self.journal_file)
+        self.assertEqual(0, journal.item_code('tea'))
+        self.assertEqual(1, journal.item_code('milk'))
+        self.assertEqual(['tea', 'milk'], journal.items)
+
+    def test_item_codes_are_shared_by_journal_writers(self):
+        other = SalesJournal(self.journal_file)
+        self.assertEqual([], other.items)
+        self.assertEqual(0, self.journal.item_code('tea'))
+        self.assertEqual(1, other.item_code('coffee'))  # 'tea' was added after other loaded item names
+        self.assertEqual(0, other.item_code('tea'))
+        self.assertEqual(1, self.journal.item_code('coffee'))
+        with open(self.journal.items_file) as f:
+            self.assertEqual('tea\ncoffee\n', f.read())
+
+    def test_item_name_with_line_break(self):
+        with self.assertRaises(ValueError):
+            self.journal.item_code('tea\nmilk')
+
+    def test_records_read_items_added_by_other_writer(self):
+        self.journal.append([('beverage', 'tea', 400)])
+        SalesJournal(self.journal_file).append([('beverage', 'coffee', 300)])
+        self.assertEqual(['tea', 'coffee'], [item for _, _, item, _ in self.journal.records()])
+
+    def test_totals(self):
+        self.journal.append([('beverage', 'tea', 400), ('addition', 'sugar', 150)])
+        self.journal.append([('beverage', 'coffee', 358)])
+        self.assertEqual({'beverages': 2, 'additions': 1, 'amount_cents': 908}, self.journal.totals())
+
+    def test_totals_without_zero_copy(self):
+        self.journal.append([('beverage', 'tea', 400), ('addition', 'sugar', 150)])
+        with patch('coffee_for_me.functions.journal._zero_copy', False):
+            self.assertEqual({'beverages': 1, 'additions': 1, 'amount_cents': 550}, self.journal.totals())
+
+    def test_totals_ignore_partly_written_record(self):
+        self.journal.append([('beverage', 'tea', 400)])
+        with open(self.journal_file, 'ab') as f:
+            f.write(b'\x01\x02')
+        self.assertEqual({'beverages': 1, 'additions': 0, 'amount_cents': 400}, self.journal.totals())
+
+    def test_totals_missing_journal(self):
+        self.assertEqual({'beverages': 0, 'additions': 0, 'amount_cents': 0}, self.journal.totals())
+
+    def test_records(self):
+        sold_at = datetime(2020, 1, 2, 10, 0, 0, 123000, timezone.utc)
+        self.journal.append([('beverage', 'tea', 400), ('addition', 'sugar', 150)], sold_at)
+        self.assertEqual([(sold_at, 'beverage', 'tea', 400), (sold_at, 'addition', 'sugar', 150)],
+                         list(SalesJournal(self.journal_file).records()))
+
+    def test_record_line(self):
+        self.assertEqual('Addition: milk. Price: 1.58$', record_line('addition', 'milk', 158))
+
+    def test_convert_records_file(self):
+        with open(self.records_file, 'w') as f:
+            f.write('Beverage: tea. Price: 4.0$\nAddition: sugar. Price: 1.5$\nBeverage: water. Price: 4.3$\n')
+        self.assertEqual(3, convert_records_file(self.records_file, self.journal_file))
+        self.assertEqual({'beverages': 2, 'additions': 1, 'amount_cents': 980}, self.journal.totals())
+        self.assertEqual(['Beverage: tea. Price: 4.0$', 'Addition: sugar. Price: 1.5$', 'Beverage: water. Price: 4.3$'],
+                         [record_line(*record[1:]) for record in self.journal.records()])
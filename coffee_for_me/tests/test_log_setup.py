@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from coffee_for_me.functions.log_setup import *
+import os
+
+
+class LogSetupTest(TestCase):
+
+    def setUp(self):
+        self.log_file = 'test_log_setup.log'
+
+    def tearDown(self):
+        stop_logging()
+        for f in os.listdir(os.curdir):
+            if f.startswith(self.log_file):
+                os.remove(f)
+
+    def test_setup_logging_uses_queue_handler(self):
+        logger = setup_logging(self.log_file)
+        self.assertEqual([DeferredQueueHandler], [type(handler) for handler in logger.handlers])
+        self.assertFalse(os.path.exists(self.log_file), '\n\nLog file should be opened on the first message')
+
+    def test_log_records_are_written_by_writer_thread(self):
+        logger = setup_logging(self.log_file)
+        logging.getLogger('main.test').info('sold %s for %s$', 'tea', 4.0)
+        logging.getLogger('main.test').debug('not written %s', 'debug')
+        stop_logging()
+        with open(self.log_file) as f:
+            content = f.read()
+        self.assertIn('main.test - test_log_records_are_written_by_writer_thread - INFO - sold tea for 4.0$', content)
+        self.assertNotIn('not written', content)
+        self.assertEqual([], logger.handlers)
+
+    def test_log_file_is_rotated(self):
+        logger = setup_logging(self.log_file, max_bytes=1000, backup_count=2)
+        for i in range(100):
+            logger.info('message %s', i)
+        stop_logging()
+        self.assertEqual(['test_log_setup.log', 'test_log_setup.log.1', 'test_log_setup.log.2'],
+                         sorted(f for f in os.listdir(os.curdir) if f.startswith(self.log_file)))
+        self.assertLessEqual(os.path.getsize(self.log_file), 1000)
+
+    def test_deferred_queue_handler_does_not_format_record(self):
+        record = logging.LogRecord('main', logging.INFO, __file__, 1, 'sold %s', ('tea',), None)
+        prepared = DeferredQueueHandler(queue.Queue()).prepare(record)
+        self.assertEqual(('sold %s', ('tea',)), (prepared.msg, prepared.args))
@@ -6,6 +6,7 @@ from io import StringIO
 from unittest.mock import patch
 from unittest import mock
 import shutil
+import tempfile
 import os
 
 
@@ -18,20 +19,16 @@ class ManagerTest(TestCase):
     def setUp(self):
         create_table()
         if not is_employee_in_db('Johnny Smith') or not is_employee_in_db('Mary Brown'):
-            insert_db_record('Johnny Smith', 5, 67.8)
-            insert_db_record('Mary Brown', 2, 9)
+            insert_db_record('Johnny Smith', 5, 6780)
+            insert_db_record('Mary Brown', 2, 900)
 
     def tearDown(self):
-        # delete temp folder and files created by tests
-        try:
-            exts = ('.db', '.json', '.xml', '.csv')
-            mng_tmp_folder = os.path.join(os.path.dirname(__file__), 'manager_records')
-            shutil.rmtree(mng_tmp_folder)
-            for f in os.listdir(os.curdir):
-                if f.endswith(exts):
-                    os.remove(f)
-        except FileNotFoundError as e:
-            print(e)
+        # delete temp folder and files created by tests, exported files are in "manager_records" folder of cwd
+        shutil.rmtree('manager_records', ignore_errors=True)
+        exts = ('.db', '.json', '.xml', '.csv')
+        for f in os.listdir(os.curdir):
+            if f.endswith(exts):
+                os.remove(f)
 
     def test_mng_employee_greeting(self):
         expected_output = 'Hi \x1b[32mTony\x1b[0m! You are a manager.Hello!\n'
@@ -70,12 +67,33 @@ class ManagerTest(TestCase):
     def test_mng_view_records(self):
         expected_output = '\x1b[32mSeller Name\x1b[0m                   \t|\t\x1b[32mNumber Of Sales\x1b[0m\t|\t\x1b' \
                           '[32mTotal Value ($)\x1b[0m\nJohnny Smith                  \t|\t5              \t|\t' \
-                          '67.8\nMary Brown                    \t|\t2              \t|\t9\nTotal:' \
+                          '67.8\nMary Brown                    \t|\t2              \t|\t9.0\nTotal:' \
                           '                        \t|\t7              \t|\t76.8\t\n\n'
         with patch('sys.stdout', new=StringIO()) as actual_output:
             self.mng.view_records()
         self.assertIn(expected_output, actual_output.getvalue(), '\n\nStrings do not match')
 
+    def test_mng_view_records_top(self):
+        with patch('sys.stdout', new=StringIO()) as actual_output:
+            self.mng.view_records(top=1)
+        output = actual_output.getvalue()
+        self.assertIn('Johnny Smith', output)
+        self.assertNotIn('Mary Brown', output)
+        self.assertIn('Total:                        \t|\t7              \t|\t76.8', output)
+        self.assertIn('Showing top 1 of 2 salespeople by sales amount', output)
+
+    def test_mng_view_records_page(self):
+        with patch('sys.stdout', new=StringIO()) as actual_output:
+            self.mng.view_records('amount', page_size=1, page=2)
+        output = actual_output.getvalue()
+        self.assertIn('Johnny Smith', output)
+        self.assertNotIn('Mary Brown', output)
+        self.assertIn('Showing salespeople 2-2 of 2 (page 2 of 2)', output)
+
+    def test_mng_view_records_invalid_page(self):
+        with self.assertRaises(ValueError):
+            self.mng.view_records(page_size=10, page=0)
+
     @mock.patch('builtins.input', create=True)
     def test_mng_export_records_json(self, mocked_input):
         expected_output = os.path.join('Your choice is 1\n\n'
@@ -106,6 +124,42 @@ class ManagerTest(TestCase):
         self.assertIn(expected_output, actual_output.getvalue(), '\n\nStrings do not match')
         self.assertEqual(os.path.join('manager_records', 'Tony Ynot_records.csv'), csv_file_path)
 
+    @mock.patch('builtins.input', create=True)
+    def test_mng_export_records_not_writable(self, mocked_input):
+        with patch.object(self.mng.store, 'export', side_effect=PermissionError('Permission denied')), \
+                patch('sys.stdout', new=StringIO()) as actual_output:
+            mocked_input.side_effect = [3]
+            self.assertIsNone(self.mng.export_records())
+        self.assertIn('Tony, sales records could not be exported: Permission denied', actual_output.getvalue())
+
+    @mock.patch('builtins.input', create=True)
+    def test_mng_export_records_compressed(self, mocked_input):
+        mng = Manager('Tony', 'Manager', 'xz')
+        with patch('sys.stdout', new=StringIO()):
+            mocked_input.side_effect = [2]
+            xml_file_path = mng.export_records()
+        self.assertEqual(os.path.join('manager_records', 'Tony Ynot_records.xml.xz'), xml_file_path)
+        self.assertTrue(os.path.exists(xml_file_path), '\n\nCompressed file is not found')
+
+    @mock.patch('builtins.input', create=True)
+    def test_mng_export_records_all(self, mocked_input):
+        expected_output = 'Your choice is 5\n\n' \
+                          'Tony, your exported json, xml and csv files are in "manager_records" folder\n\n'
+        with patch('sys.stdout', new=StringIO()) as actual_output:
+            mocked_input.side_effect = [5]
+            file_paths = self.mng.export_records()
+        self.assertIn(expected_output, actual_output.getvalue(), '\n\nStrings do not match')
+        self.assertEqual([os.path.join('manager_records', 'Tony Ynot_records.' + e) for e in ('json', 'xml', 'csv')],
+                         file_paths)
+
+    @mock.patch('builtins.input', create=True)
+    def test_mng_export_records_all_not_writable(self, mocked_input):
+        with patch.object(self.mng.store, 'export', side_effect=PermissionError('Permission denied')), \
+                patch('sys.stdout', new=StringIO()) as actual_output:
+            mocked_input.side_effect = [5]
+            self.assertIsNone(self.mng.export_records())
+        self.assertIn('Tony, sales records could not be exported: Permission denied', actual_output.getvalue())
+
     @mock.patch('builtins.input', create=True)
     def test_mng_export_records_no_export(self, mocked_input):
         expected_output = 'Your choice is 4\n\nTony, you can always export sales records later.\n\n'
@@ -113,3 +167,35 @@ class ManagerTest(TestCase):
             mocked_input.side_effect = [4]
             self.mng.export_records()
         self.assertIn(expected_output, actual_output.getvalue(), '\n\nStrings do not match')
+
+    def test_mng_export_to_folder(self):
+        out_dir = os.path.join(tempfile.mkdtemp(), 'reports')
+        self.addCleanup(shutil.rmtree, os.path.dirname(out_dir))
+        file_paths = self.mng.export(['json', 'csv'], out_dir)
+        self.assertEqual([os.path.join(out_dir, 'Tony Ynot_records.' + e) for e in ('json', 'csv')], file_paths)
+        with open(file_paths[1]) as f:
+            self.assertIn('Johnny Smith', f.read())
+
+    def test_mng_export_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            self.mng.export(['json', 'pdf'])
+
+    @mock.patch('builtins.input', create=True)
+    def test_mng_view_analytics(self, mocked_input):
+        from coffee_for_me.functions.connection_pool import close_pools
+        self.addCleanup(close_pools)
+        record_sales_batch([('Mary Brown', [('beverage', 'tea', 400), ('addition', 'sugar', 150)],
+                             '2020-01-06 10:15:00.000')])
+        with patch('sys.stdout', new=StringIO()) as actual_output:
+            mocked_input.side_effect = [3]
+            analytics = self.mng.view_analytics(start='2020-01-01', end='2020-02-01')
+        self.assertEqual([{'period': '2020-W01', 'beverages': 1, 'additions': 1, 'amount_cents': 550}],
+                         analytics['revenue'])
+        self.assertIn('Revenue by week', actual_output.getvalue())
+
+    def test_mng_view_analytics_not_available(self):
+        from coffee_for_me.store.memory_store import MemoryStore
+        mng = Manager('Tony', 'Manager', store=MemoryStore())
+        with patch('sys.stdout', new=StringIO()) as actual_output:
+            self.assertIsNone(mng.view_analytics('day'))
+        self.assertIn('sales analytics are not available', actual_output.getvalue())
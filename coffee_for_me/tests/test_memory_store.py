@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from coffee_for_me.store.memory_store import MemoryStore
+import os
+
+
+class MemoryStoreTest(TestCase):
+
+    def setUp(self):
+        self.store = MemoryStore()
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$', 'Addition: sugar. Price: 1.5$'])
+        self.store.record_sales([('Liza Azil', ['Beverage: coffee. Price: 3.0$'], None),
+                                 ('Tony Ynot', ['Beverage: water. Price: 1.2$'], '2020-01-02 10:00:00.000')])
+
+    def tearDown(self):
+        for f in ('test_memory_store.json', 'test_memory_store.csv'):
+            if os.path.exists(f):
+                os.remove(f)
+
+    def test_salesperson_totals(self):
+        totals = self.store.salesperson_totals('Tony Ynot')
+        self.assertEqual((2, 1, 670), (totals['beverages'], totals['additions'], totals['amount_cents']))
+
+    def test_salesperson_totals_no_sales(self):
+        self.assertEqual(0, self.store.salesperson_totals('Mike Ekim')['amount_cents'])
+
+    def test_salesperson_records(self):
+        self.assertEqual(['Beverage: tea. Price: 4.0$', 'Addition: sugar. Price: 1.5$', 'Beverage: water. Price: 1.2$'],
+                         self.store.salesperson_records('Tony Ynot'))
+
+    def test_salesperson_records_no_sales(self):
+        with self.assertRaises(IOError):
+            self.store.salesperson_records('Mike Ekim')
+
+    def test_sales_table(self):
+        self.assertEqual([(1, 'Tony Ynot', 3, 670), (2, 'Liza Azil', 1, 300)], self.store.sales_table())
+        self.assertFalse(self.store.is_empty())
+
+    def test_data_version(self):
+        self.assertEqual(3, self.store.data_version())
+
+    def test_export(self):
+        sizes = self.store.export({'json': 'test_memory_store.json', 'csv': 'test_memory_store.csv'})
+        self.assertEqual(os.path.getsize('test_memory_store.csv'), sizes['csv'])
+        with open('test_memory_store.json') as f:
+            self.assertEqual('{"employees": [{"id": 1, "name": "Tony Ynot", "sales": 3, "amount": 6.7}, '
+                             '{"id": 2, "name": "Liza Azil", "sales": 1, "amount": 3.0}]}', f.read())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from unittest.mock import patch
+from coffee_for_me.functions.migrations import *
+import sqlite3
+import os
+
+
+class MigrationsTest(TestCase):
+
+    def setUp(self):
+        self.db_path = 'test_migrations.db'
+        self.conn = sqlite3.connect(self.db_path)
+
+    def tearDown(self):
+        self.conn.close()
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+
+    def migrate(self):
+        with self.conn:
+            return migrate(self.conn)
+
+    def test_migrate_new_database(self):
+        self.assertEqual(latest_version(), self.migrate())
+        self.assertEqual(latest_version(), schema_version(self.conn))
+        self.conn.execute("SELECT * FROM employees")
+
+    def test_migrate_is_noop_for_latest_version(self):
+        self.migrate()
+        with patch('coffee_for_me.functions.migrations.merge_duplicated_names') as mocked_step:
+            self.assertEqual(latest_version(), self.migrate())
+        mocked_step.assert_not_called()
+
+    def test_migrate_not_versioned_database(self):
+        self.conn.execute('CREATE TABLE employees (id INTEGER PRIMARY KEY, name text, sales integer, amount integer)')
+        self.conn.executemany('INSERT INTO employees VALUES (NULL,?,?,?)', [('Mike', 2, 5), ('Mike', 4, 9)])
+        self.conn.commit()
+        self.migrate()
+        self.assertEqual([(1, 'Mike', 4, 900)], self.conn.execute('SELECT * FROM employees').fetchall())
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.conn.execute('INSERT INTO employees VALUES (NULL,?,?,?)', ('Mike', 1, 1))
+
+    def test_failed_migration_is_rolled_back(self):
+        broken_migrations = migrations + [('broken step', ['CREATE TABLE sales (id INTEGER)', 'NOT SQL'])]
+        with patch('coffee_for_me.functions.migrations.migrations', broken_migrations):
+            with self.assertRaises(sqlite3.Error):
+                self.migrate()
+        self.assertEqual(0, schema_version(self.conn))
+        self.assertEqual([], self.conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall())
+
+    def test_migrate_amounts_to_cents(self):
+        with patch('coffee_for_me.functions.migrations.migrations', migrations[:3]):
+            self.migrate()
+        self.conn.executemany('INSERT INTO employees VALUES (NULL,?,?,?)', [('Mike', 3, 9.8), ('Nina', 1, 4.35)])
+        self.conn.commit()
+        self.migrate()
+        self.assertEqual([(980,), (435,)], self.conn.execute('SELECT amount FROM employees').fetchall())
+
+    def test_migrate_adds_covering_indexes(self):
+        self.migrate()
+        indexes = [row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type='index'")]
+        self.assertIn('sales_sold_at_cover_idx', indexes)
+        self.assertNotIn('sales_employee_sold_at_idx', indexes)
+
+    def test_migrate_builds_rollups_of_existing_sales(self):
+        with patch('coffee_for_me.functions.migrations.migrations', migrations[:5]):
+            self.migrate()
+        self.conn.execute("INSERT INTO employees VALUES (1, 'Mike', 2, 550)")
+        self.conn.executemany('INSERT INTO sales VALUES (NULL, 1, ?, ?, ?, ?)',
+                              [('2020-01-06 10:00:00.000', 'beverage', 'tea', 400),
+                               ('2020-01-06 10:00:00.000', 'addition', 'sugar', 150)])
+        self.conn.commit()
+        self.migrate()
+        self.assertEqual([(1, '2020-01-06', 1, 1, 550)],
+                         self.conn.execute('SELECT * FROM salesperson_daily').fetchall())
+        self.assertEqual(2, self.conn.execute('SELECT COUNT(*) FROM item_daily').fetchone()[0])
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from coffee_for_me.functions.money import *
+
+
+class MoneyTest(TestCase):
+
+    def test_price_to_cents(self):
+        prices = ('4.0', 4.87, '4.456', '0', '.5', '-1.5')
+        self.assertEqual([400, 487, 446, 0, 50, -150], [price_to_cents(price) for price in prices])
+
+    def test_price_to_cents_rounds_half_up(self):
+        self.assertEqual([446, 445, 1000], [price_to_cents(price) for price in ('4.455', '4.4549', '9.995')])
+
+    def test_price_to_cents_strips_spaces(self):
+        self.assertEqual(400, price_to_cents(' 4 '))
+
+    def test_price_to_cents_not_a_number(self):
+        for price in ('four', '', '.', '4.0.1', 'inf', 'nan', '1e3', '1E-2', 1e16):
+            with self.assertRaises(ValueError):
+                price_to_cents(price)
+
+    def test_format_cents(self):
+        self.assertEqual(['4.0', '4.5', '4.58', '0.05', '0.0', '-1.5'],
+                         [format_cents(cents) for cents in (400, 450, 458, 5, 0, -150)])
+
+    def test_format_cents_matches_legacy_records(self):
+        for price in ('4.0', '9.8', '1.58', '0.3', '12.05'):
+            self.assertEqual(str(float(price)), format_cents(price_to_cents(price)))
+
+    def test_cents_to_dollars(self):
+        self.assertEqual(6.7, cents_to_dollars(670))
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from coffee_for_me.functions.records_parser import *
+import os
+
+
+class RecordsParserTest(TestCase):
+
+    def setUp(self):
+        self.records_file = 'test_records_parser.txt'
+        with open(self.records_file, 'w') as f:
+            f.write('Beverage: tea. Price: 4.0$\nDefault beverage\nAddition: milk. Price: 1.58$\n')
+
+    def tearDown(self):
+        if os.path.exists(self.records_file):
+            os.remove(self.records_file)
+
+    def test_parse_sale_record(self):
+        self.assertEqual(('beverage', 'tea', 400), parse_sale_record('Beverage: tea. Price: 4.0$'))
+        self.assertEqual(('addition', 'milk', 158), parse_sale_record('Addition: milk. Price: 1.58$'))
+
+    def test_parse_sale_record_item_with_dots(self):
+        self.assertEqual(('beverage', 'st. tea', 400), parse_sale_record('Beverage: st. tea. Price: 4.0$'))
+
+    def test_parse_sale_record_invalid_record(self):
+        with self.assertRaises(ValueError):
+            parse_sale_record('Default beverage')
+
+    def test_parse_records_skips_invalid_records(self):
+        with self.assertLogs('main.argparsing.functions.records_parser', 'ERROR'):
+            items = list(parse_records(['Beverage: tea. Price: 4.0$', 'Default beverage']))
+        self.assertEqual([('beverage', 'tea', 400)], items)
+
+    def test_parse_records_is_lazy(self):
+        items = parse_records(iter(['Beverage: tea. Price: 4.0$', None]))
+        self.assertEqual(('beverage', 'tea', 400), next(items))
+
+    def test_read_sale_items(self):
+        self.assertEqual([('beverage', 'tea', 400), ('addition', 'milk', 158)],
+                         list(read_sale_items(self.records_file)))
+
+    def test_read_sale_items_from_offset(self):
+        self.assertEqual([('addition', 'milk', 158)], list(read_sale_items(self.records_file, 44)))
+
+    def test_read_sale_items_missing_file(self):
+        with self.assertRaises(IOError):
+            list(read_sale_items('no_such_records.txt'))
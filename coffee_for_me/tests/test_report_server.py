@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from coffee_for_me.server.report_server import ReportCache, ReportServer
+from coffee_for_me.store.memory_store import MemoryStore
+from coffee_for_me.store.remote_store import RemoteStore
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+import json
+import threading
+
+
+class ReportCacheTest(TestCase):
+
+    def setUp(self):
+        self.store = MemoryStore()
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$', 'Addition: sugar. Price: 1.5$'])
+        self.cache = ReportCache(self.store)
+
+    def test_sales_json(self):
+        body, _ = self.cache.get('sales', 'json')
+        self.assertEqual({'employees': [{'id': 1, 'name': 'Tony Ynot', 'sales': 2, 'amount': 5.5}]},
+                         json.loads(body.decode()))
+
+    def test_totals_csv(self):
+        body, _ = self.cache.get('totals', 'csv')
+        self.assertEqual(['salespeople,sales,amount', '1,2,5.5'], body.decode().splitlines())
+
+    def test_cached_until_write(self):
+        first, etag = self.cache.get('sales', 'json')
+        self.assertEqual((first, etag), self.cache.get('sales', 'json'))
+        self.assertEqual((1, 1), (self.cache.misses, self.cache.hits))
+        self.store.record_sale('Liza Azil', ['Beverage: coffee. Price: 3.0$'])
+        body, new_etag = self.cache.get('sales', 'json')
+        self.assertNotEqual(etag, new_etag)
+        self.assertIn('Liza Azil', body.decode())
+        self.assertEqual(2, self.cache.misses)
+
+    def test_not_cached_without_data_version(self):
+        store = RemoteStore()
+        store.sales_table = lambda: [(1, 'Tony Ynot', 2, 550)]
+        cache = ReportCache(store)
+        cache.get('sales', 'json')
+        cache.get('sales', 'json')
+        self.assertEqual((2, 0), (cache.misses, cache.hits))
+
+    def test_unsupported_report(self):
+        with self.assertRaises(KeyError):
+            self.cache.get('salaries', 'json')
+        with self.assertRaises(KeyError):
+            self.cache.get('sales', 'xml')
+
+
+class ReportServerTest(TestCase):
+
+    def setUp(self):
+        self.store = MemoryStore()
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        self.server = ReportServer(self.store, '127.0.0.1:0')
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05})
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_get_sales_csv(self):
+        with urlopen(self.url + '/sales.csv') as response:
+            self.assertEqual('text/csv; charset=utf-8', response.headers['Content-Type'])
+            self.assertEqual(['1', 'Tony Ynot', '1', '4.0'], response.read().decode().splitlines()[-1].split(','))
+
+    def test_get_totals_json(self):
+        with urlopen(self.url + '/totals') as response:
+            self.assertEqual({'totals': [{'salespeople': 1, 'sales': 1, 'amount': 4.0}]},
+                             json.loads(response.read().decode()))
+
+    def test_not_modified(self):
+        with urlopen(self.url + '/sales.json') as response:
+            etag = response.headers['ETag']
+        with self.assertRaises(HTTPError) as error:
+            urlopen(Request(self.url + '/sales.json', headers={'If-None-Match': etag}))
+        self.assertEqual(304, error.exception.code)
+
+    def test_not_found(self):
+        with self.assertRaises(HTTPError) as error:
+            urlopen(self.url + '/employees.db')
+        self.assertEqual(404, error.exception.code)
+
+    def test_read_only(self):
+        with self.assertRaises(HTTPError) as error:
+            urlopen(Request(self.url + '/sales.json', data=b'{}'))
+        self.assertEqual(501, error.exception.code)
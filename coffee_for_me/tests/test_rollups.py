@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from coffee_for_me.functions.rollups import *
+from coffee_for_me.functions.db_funcs import create_table, db_connection, record_sale, record_sales_batch
+from coffee_for_me.functions.db_funcs import rebuild_rollup_tables, view_item_sales
+from coffee_for_me.functions.analytics import salespeople_sales_by_period, items_sales
+from coffee_for_me.functions.connection_pool import close_pools
+import os
+
+
+class RollupsTest(TestCase):
+
+    def setUp(self):
+        create_table()
+        record_sale('Tony Ynot', 2, 550, [('beverage', 'tea', 400), ('addition', 'sugar', 150)],
+                    '2020-01-06 10:15:00.000')
+        record_sales_batch([('Tony Ynot', [('beverage', 'tea', 300)], '2020-01-06 18:00:00.000'),
+                            ('Liza Azil', [('beverage', 'coffee', 450)], '2020-01-07 09:00:00.000')])
+
+    def tearDown(self):
+        close_pools()
+        if os.path.exists('employees.db'):
+            os.remove('employees.db')
+
+    @staticmethod
+    def rollups():
+        with db_connection() as conn:
+            return (conn.execute('SELECT * FROM ' + salesperson_daily_table + ' ORDER BY employee_id, day').fetchall(),
+                    conn.execute('SELECT * FROM ' + item_daily_table + ' ORDER BY day, kind, item').fetchall())
+
+    def test_rollups_are_updated_on_write(self):
+        salespeople, items = self.rollups()
+        self.assertEqual([(1, '2020-01-06', 2, 1, 850), (2, '2020-01-07', 1, 0, 450)], salespeople)
+        self.assertEqual([('2020-01-06', 'addition', 'sugar', 1, 150), ('2020-01-06', 'beverage', 'tea', 2, 700),
+                          ('2020-01-07', 'beverage', 'coffee', 1, 450)], items)
+
+    def test_rebuild_rollups(self):
+        expected = self.rollups()
+        with db_connection() as conn:
+            conn.execute('DELETE FROM ' + item_daily_table)
+            conn.execute('UPDATE ' + salesperson_daily_table + ' SET amount_cents = 0')
+        self.assertEqual(2, rebuild_rollup_tables())
+        self.assertEqual(expected, self.rollups())
+
+    def test_reports_read_rollups(self):
+        with db_connection() as conn:
+            conn.execute('UPDATE ' + salesperson_daily_table + ' SET amount_cents = amount_cents + 1')
+            conn.execute('UPDATE ' + item_daily_table + ' SET amount_cents = amount_cents + 1')
+        self.assertEqual([('Liza Azil', '2020-01-07', 1, 0, 451), ('Tony Ynot', '2020-01-06', 2, 1, 851)],
+                         salespeople_sales_by_period('day', '2020-01-01'))
+        self.assertEqual([('beverage', 'tea', 2, 701)], view_item_sales('tea'))
+        self.assertEqual(('beverage', 'tea', 2, 701), items_sales('2020-01-01', '2020-02-01')[0])
+
+    def test_hours_are_read_from_sales(self):
+        self.assertEqual([('Liza Azil', '2020-01-07 09:00', 1, 0, 450), ('Tony Ynot', '2020-01-06 10:00', 1, 1, 550),
+                          ('Tony Ynot', '2020-01-06 18:00', 1, 0, 300)], salespeople_sales_by_period('hour'))
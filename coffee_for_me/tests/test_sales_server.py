@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from coffee_for_me.server.sales_server import SalesServer, parse_address, encode_message, validate_sale
+from coffee_for_me.store.memory_store import MemoryStore
+from coffee_for_me.store.remote_store import RemoteStore
+from unittest.mock import patch
+import asyncio
+import os
+import shutil
+import socket
+import tempfile
+import threading
+
+
+class ParseAddressTest(TestCase):
+
+    def test_tcp_address(self):
+        self.assertEqual(('127.0.0.1', 8765), parse_address('127.0.0.1:8765'))
+
+    def test_unix_socket_path(self):
+        self.assertEqual(('/tmp/sales.sock', None), parse_address('/tmp/sales.sock'))
+
+    def test_encode_message(self):
+        self.assertEqual(b'{"id": 1, "result": true}\n', encode_message({'id': 1, 'result': True}))
+
+    def test_validate_sale(self):
+        self.assertEqual(('Tony Ynot', ['Beverage: tea. Price: 4.0$'], '2020-01-02 08:00:00.000'),
+                         validate_sale(['Tony Ynot', ['Beverage: tea. Price: 4.0$'], '2020-01-02T10:00:00+02:00']))
+        self.assertEqual(('Tony Ynot', ['Beverage: tea. Price: 4.0$'], None),
+                         validate_sale(['Tony Ynot', ['Beverage: tea. Price: 4.0$']]))
+
+    def test_validate_sale_invalid(self):
+        invalid_sales = [[123, ['Beverage: tea. Price: 4.0$'], None],
+                         ['', ['Beverage: tea. Price: 4.0$'], None],
+                         ['../Tony', ['Beverage: tea. Price: 4.0$'], None],
+                         ['Tony Ynot', 'Beverage: tea. Price: 4.0$', None],
+                         ['Tony Ynot', [], None],
+                         ['Tony Ynot', ['Beverage: tea'], None],
+                         ['Tony Ynot', ['Beverage: tea. Price: 4.0$'], 'garbage'],
+                         'Tony Ynot']
+        for sale in invalid_sales:
+            with self.assertRaises(ValueError, msg=sale):
+                validate_sale(sale)
+
+
+class SalesServerTest(TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.address = os.path.join(self.folder, 'sales.sock')
+        self.memory_store = MemoryStore()
+        self.server = SalesServer(self.memory_store, batch_size=10, request_limit=4096)
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self.server.start(self.address))
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+        self.store = RemoteStore(self.address, timeout=5.0)
+
+    def tearDown(self):
+        self.store.close()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.run_until_complete(self.server.stop())
+        self.loop.close()
+        shutil.rmtree(self.folder)
+
+    def test_record_sale(self):
+        self.store.setup()
+        self.assertTrue(self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$',
+                                                             'Addition: sugar. Price: 1.5$']))
+        totals = self.store.salesperson_totals('Tony Ynot')
+        self.assertEqual((1, 1, 550), (totals['beverages'], totals['additions'], totals['amount_cents']))
+        self.assertEqual(['Beverage: tea. Price: 4.0$', 'Addition: sugar. Price: 1.5$'],
+                         self.store.salesperson_records('Tony Ynot'))
+
+    def test_record_sales(self):
+        self.assertTrue(self.store.record_sales([('Tony Ynot', ['Beverage: tea. Price: 4.0$'], None),
+                                                 ('Liza Azil', ['Beverage: coffee. Price: 3.0$'], None)]))
+        self.assertEqual([(1, 'Tony Ynot', 1, 400), (2, 'Liza Azil', 1, 300)], self.store.sales_table())
+
+    def test_many_clients(self):
+        def sell(name):
+            store = RemoteStore(self.address, timeout=5.0)
+            for _ in range(20):
+                store.record_sale(name, ['Beverage: tea. Price: 4.0$'])
+            store.close()
+
+        clients = [threading.Thread(target=sell, args=('Seller {}'.format(i),)) for i in range(5)]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        self.assertEqual(100, sum(sales for _, _, sales, _ in self.store.sales_table()))
+
+    def test_sales_page(self):
+        self.store.record_sales([('Tony Ynot', ['Beverage: tea. Price: 4.0$'], None),
+                                 ('Liza Azil', ['Beverage: coffee. Price: 5.0$'], None)])
+        self.assertEqual(([(2, 'Liza Azil', 1, 500)], {'salespeople': 2, 'sales': 2, 'amount_cents': 900}),
+                         self.store.sales_page('amount', descending=True, limit=1))
+
+    def test_invalid_record(self):
+        with self.assertRaises(ValueError):
+            self.store.record_sale('Tony Ynot', ['Beverage: tea'])
+        self.assertEqual([], self.store.sales_table())
+
+    def test_invalid_sale_fails_only_its_request(self):
+        record_sales = self.memory_store.record_sales
+
+        def fail_on_mike(sales):
+            if any(fullname == 'Mike Ekim' for fullname, _, _ in sales):
+                raise IOError('disk is full')
+            return record_sales(sales)
+
+        async def sell_at_once():
+            sales = [self.server.record_sales([(name, ['Beverage: tea. Price: 4.0$'], None)])
+                     for name in ('Tony Ynot', 'Mike Ekim', 'Liza Azil')]
+            return await asyncio.gather(*sales, return_exceptions=True)
+
+        with patch.object(self.memory_store, 'record_sales', side_effect=fail_on_mike) as mocked_record:
+            results = asyncio.run_coroutine_threadsafe(sell_at_once(), self.loop).result(5)
+        self.assertEqual(True, results[0])
+        self.assertIsInstance(results[1], IOError)
+        self.assertEqual(True, results[2])
+        self.assertEqual(4, mocked_record.call_count, '\n\nBatch should be stored once, then sale by sale')
+        self.assertEqual([(1, 'Tony Ynot', 1, 400), (2, 'Liza Azil', 1, 400)], self.store.sales_table())
+
+    def test_cancelled_request_does_not_stop_batch_writer(self):
+        async def cancel_then_sell():
+            cancelled = asyncio.ensure_future(self.server.record_sales([('Tony Ynot', ['Beverage: tea. Price: 4.0$'])]))
+            await asyncio.sleep(0)  # sale is queued
+            cancelled.cancel()
+            return await self.server.record_sales([('Liza Azil', ['Beverage: tea. Price: 4.0$'])])
+
+        self.assertTrue(asyncio.run_coroutine_threadsafe(cancel_then_sell(), self.loop).result(5))
+
+    def test_invalid_sale_fields(self):
+        with self.assertRaises(ValueError):
+            self.store.record_sale(123, ['Beverage: tea. Price: 4.0$'])
+        with self.assertRaises(ValueError):
+            self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'], 'garbage')
+        self.assertEqual([], self.store.sales_table())
+
+    def test_too_long_request_closes_connection(self):
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.settimeout(5.0)
+            sock.connect(self.address)
+            sock.sendall(b'{"op": "ping", "padding": "' + b'x' * 10000 + b'"}\n')
+            response = sock.makefile('rb').read()
+        self.assertIn(b'Request is longer than 4096 bytes', response)
+        self.assertTrue(self.store.request('ping'), '\n\nServer should serve other clients')
+
+    def test_no_records(self):
+        with self.assertRaises(IOError):
+            self.store.salesperson_records('Mike Ekim')
+
+    def test_unsupported_operation(self):
+        with self.assertRaises(ValueError):
+            self.store.request('drop_table')
+
+    def test_sales_analytics_not_available(self):
+        with self.assertRaises(ValueError):
+            self.store.sales_analytics('day')
+
+    def test_export(self):
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.5$'])
+        csv_file = os.path.join(self.folder, 'records.csv')
+        self.store.export({'csv': csv_file})
+        with open(csv_file) as f:
+            self.assertEqual(['1', 'Tony Ynot', '1', '4.5'], f.read().splitlines()[-1].split(','))
+
+
+class RemoteStoreTest(TestCase):
+
+    def test_server_not_available(self):
+        folder = tempfile.mkdtemp()
+        store = RemoteStore(os.path.join(folder, 'missing.sock'), timeout=1.0)
+        try:
+            with self.assertRaises(IOError):
+                store.setup()
+        finally:
+            store.close()
+            shutil.rmtree(folder)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from unittest.mock import patch
+from io import StringIO
+from coffee_for_me.store.sales_store import *
+from coffee_for_me.store.memory_store import MemoryStore
+from coffee_for_me.store.buffered_store import BufferedStore
+
+
+class SalesStoreTest(TestCase):
+
+    def test_get_store(self):
+        self.assertIsInstance(get_store('memory'), MemoryStore)
+        store = get_store('buffered', store=MemoryStore(), batch_size=5)
+        self.assertEqual((BufferedStore, 5), (type(store), store.batch_size))
+
+    def test_get_store_unsupported(self):
+        with self.assertRaises(ValueError):
+            get_store('redis')
+
+    def test_sales_store_interface(self):
+        with self.assertRaises(NotImplementedError):
+            SalesStore().record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+
+    def test_sales_page(self):
+        store = MemoryStore()
+        store.record_sales([('Tony Ynot', ['Beverage: tea. Price: 4.0$'], None),
+                            ('Liza Azil', ['Beverage: coffee. Price: 3.0$', 'Addition: milk. Price: 1.0$'], None),
+                            ('Mike Ekim', ['Beverage: tea. Price: 4.0$'], None)])
+        self.assertEqual(([(1, 'Tony Ynot', 1, 400), (2, 'Liza Azil', 2, 400)],
+                          {'salespeople': 3, 'sales': 4, 'amount_cents': 1200}),
+                         store.sales_page('amount', descending=True, limit=2))
+        self.assertEqual([(3, 'Mike Ekim', 1, 400)], store.sales_page('name', limit=1, offset=1)[0])
+
+    def test_is_empty_prints_message(self):
+        with patch('sys.stdout', new=StringIO()) as actual_output:
+            self.assertTrue(MemoryStore().is_empty())
+        self.assertEqual('There are no sales records. Ask your salespeople to sell something...\n\n',
+                         actual_output.getvalue())
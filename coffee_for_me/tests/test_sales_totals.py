@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from unittest.mock import patch
+from coffee_for_me.functions.sales_totals import *
+import os
+
+
+class SalesTotalsTest(TestCase):
+
+    def setUp(self):
+        self.records_file = 'test_records.txt'
+        self.totals_file = 'test_totals.json'
+        with open(self.records_file, 'w') as f:
+            f.write('Beverage: tea. Price: 4.0$\n')
+            f.write('Addition: sugar. Price: 1.5$\n')
+
+    def tearDown(self):
+        for f in (self.records_file, self.totals_file):
+            if os.path.exists(f):
+                os.remove(f)
+
+    def test_empty_totals(self):
+        self.assertEqual({'sales': 0, 'beverages': 0, 'additions': 0, 'amount_cents': 0, 'size': 0, 'mtime': 0},
+                         empty_totals())
+
+    def test_add_records_to_totals(self):
+        totals = add_records_to_totals(empty_totals(), ['Beverage: tea. Price: 4.0$', 'Addition: milk. Price: 1.58$'])
+        self.assertEqual((1, 1, 1, 558),
+                         (totals['sales'], totals['beverages'], totals['additions'], totals['amount_cents']))
+
+    def test_rebuild_totals(self):
+        totals = rebuild_totals(self.records_file)
+        self.assertEqual((1, 1, 1, 550),
+                         (totals['sales'], totals['beverages'], totals['additions'], totals['amount_cents']))
+        self.assertEqual(os.path.getsize(self.records_file), totals['size'])
+
+    def test_load_totals_missing_records_file(self):
+        self.assertEqual(empty_totals(), load_totals(self.totals_file, 'no_such_records.txt'))
+
+    def test_load_totals_missing_totals_file(self):
+        totals = load_totals(self.totals_file, self.records_file)
+        self.assertEqual(550, totals['amount_cents'])
+        self.assertTrue(os.path.exists(self.totals_file), '\n\nRunning totals were not stored')
+
+    def test_load_totals_up_to_date_totals_are_not_rebuilt(self):
+        load_totals(self.totals_file, self.records_file)
+        with patch('coffee_for_me.functions.sales_totals.rebuild_totals') as mocked_rebuild:
+            totals = load_totals(self.totals_file, self.records_file)
+        mocked_rebuild.assert_not_called()
+        self.assertEqual(550, totals['amount_cents'])
+
+    def test_load_totals_stale_totals_are_rebuilt(self):
+        load_totals(self.totals_file, self.records_file)
+        with open(self.records_file, 'a') as f:
+            f.write('Beverage: coffee. Price: 3.0$\n')
+        totals = load_totals(self.totals_file, self.records_file)
+        self.assertEqual((2, 850), (totals['beverages'], totals['amount_cents']))
+
+    def test_update_totals(self):
+        totals = load_totals(self.totals_file, self.records_file)
+        with open(self.records_file, 'a') as f:
+            f.write('Beverage: coffee. Price: 3.0$\n')
+        update_totals(self.totals_file, self.records_file, totals, ['Beverage: coffee. Price: 3.0$'])
+        with patch('coffee_for_me.functions.sales_totals.rebuild_totals') as mocked_rebuild:
+            totals = load_totals(self.totals_file, self.records_file)
+        mocked_rebuild.assert_not_called()
+        self.assertEqual((2, 3, 850),
+                         (totals['sales'], totals['beverages'] + totals['additions'], totals['amount_cents']))
+
+    def test_add_records_to_totals_is_exact(self):
+        totals = add_records_to_totals(empty_totals(), ['Beverage: tea. Price: 0.1$'] * 3)
+        self.assertEqual(30, totals['amount_cents'])
+
+    def test_load_totals_without_cents_are_rebuilt(self):
+        totals = load_totals(self.totals_file, self.records_file)
+        del totals['amount_cents']
+        totals['amount'] = 5.5
+        save_totals(self.totals_file, totals)
+        self.assertEqual(550, load_totals(self.totals_file, self.records_file)['amount_cents'])
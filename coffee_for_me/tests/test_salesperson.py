@@ -3,6 +3,7 @@ from unittest import TestCase
 from coffee_for_me.employees.salesperson import Salesperson
 from coffee_for_me.functions.db_funcs import *
 from coffee_for_me.functions.functions import *
+from coffee_for_me.functions.journal import SalesJournal
 from io import StringIO
 from unittest.mock import patch
 from unittest import mock
@@ -97,6 +98,89 @@ class SalespersonTest(TestCase):
         self.assertTrue(is_employee_in_db(self.dynamic_sp.fullname), '\nSalesperson is not found in db')
         self.assertEqual(expected_output, actual_output)
 
+    @mock.patch('builtins.input', create=True)
+    def test_sp_make_sale_updates_running_totals(self, mocked_input):
+        mocked_input.side_effect = [2, 'tea', 4, 1, 'tea', 3, 'sugar', 1.5]
+        self.dynamic_sp.make_sale(['Tea'], ['Sugar'])
+        self.dynamic_sp.make_sale(['Tea'], ['Sugar'])
+        self.assertTrue(os.path.exists(self.dynamic_sp.totals_file), '\nRunning totals file is not found')
+        self.assertEqual(3, self.dynamic_sp.count_sales())
+        self.assertEqual(850, self.dynamic_sp.total_sales_amount())
+        sales = view_sales_in_period('2000-01-01', '3000-01-01', self.dynamic_sp.fullname)
+        self.assertEqual([('beverage', 'tea', 400), ('beverage', 'tea', 300), ('addition', 'sugar', 150)],
+                         [row[2:] for row in sales])
+
+    @mock.patch('builtins.input', create=True)
+    def test_sp_make_sale_prints_totals_read_once(self, mocked_input):
+        from coffee_for_me.store.memory_store import MemoryStore
+        store = MemoryStore()
+        sp = Salesperson('Mike', 'Salesperson', ['Tea'], ['Sugar'], store=store)
+        mocked_input.side_effect = [1, 'tea', 4, 'sugar', 1.5]
+        with patch.object(store, 'salesperson_totals', wraps=store.salesperson_totals) as mocked_totals, \
+                patch('sys.stdout', new=StringIO()) as actual_output:
+            sp.make_sale(['Tea'], ['Sugar'])
+        mocked_totals.assert_called_once_with(sp.fullname)
+        self.assertIn('You sold 1 beverages and 1 additions\nYour sales total amount: 5.5$\n', actual_output.getvalue())
+
+    @mock.patch('builtins.input', create=True)
+    def test_sp_make_sale_journal_backend(self, mocked_input):
+        sp = Salesperson(SalespersonTest.generate_random_name(), 'Salesperson', ['Tea'], ['Sugar'], 'journal')
+        self.addCleanup(lambda: [os.remove(f) for f in (sp.journal_file, sp.journal_file[:-4] + '.items')])
+        mocked_input.side_effect = [2, 'tea', 4, 1, 'tea', 3, 'sugar', 1.5]
+        with patch('sys.stdout', new=StringIO()):
+            sp.make_sale(['Tea'], ['Sugar'])
+            sp.make_sale(['Tea'], ['Sugar'])
+        self.assertFalse(os.path.exists(sp.records_file), '\nRecords file should not be written')
+        self.assertEqual([('beverage', 'tea', 400), ('beverage', 'tea', 300), ('addition', 'sugar', 150)],
+                         [(kind, item, price) for _, kind, item, price in SalesJournal(sp.journal_file).records()])
+        self.assertEqual(3, sp.count_sales())
+        self.assertEqual(850, sp.total_sales_amount())
+        self.assertTrue(is_employee_in_db(sp.fullname), '\nSalesperson is not found in db')
+
+    @mock.patch('builtins.input', create=True)
+    def test_sp_make_sale_server_not_available(self, mocked_input):
+        from coffee_for_me.store.remote_store import RemoteStore
+        sp = Salesperson('Mike', 'Salesperson', ['Tea'], ['Sugar'], store=RemoteStore('missing_sales.sock', 1.0))
+        mocked_input.side_effect = [2, 'tea', 4]
+        with patch('sys.stdout', new=StringIO()) as actual_output:
+            sp.make_sale(['Tea'], ['Sugar'])
+        self.assertIn('Sale was not recorded', actual_output.getvalue())
+
+    @mock.patch('builtins.input', create=True)
+    def test_sp_make_sale_totals_not_available(self, mocked_input):
+        from coffee_for_me.store.memory_store import MemoryStore
+        store = MemoryStore()
+        sp = Salesperson('Mike', 'Salesperson', ['Tea'], ['Sugar'], store=store)
+        mocked_input.side_effect = [2, 'tea', 4]
+        with patch.object(store, 'salesperson_totals', side_effect=IOError('connection reset')), \
+                patch('sys.stdout', new=StringIO()) as actual_output:
+            sp.make_sale(['Tea'], ['Sugar'])
+        self.assertIn('Your sales totals are not available: connection reset', actual_output.getvalue())
+        self.assertEqual(['Beverage: tea. Price: 4.0$'], store.salesperson_records(sp.fullname))
+
+    @mock.patch('builtins.input', create=True)
+    def test_sp_make_sale_not_fully_recorded(self, mocked_input):
+        from coffee_for_me.store.memory_store import MemoryStore
+        store = MemoryStore()
+        sp = Salesperson('Mike', 'Salesperson', ['Tea'], ['Sugar'], store=store)
+        mocked_input.side_effect = [2, 'tea', 4]
+        with patch.object(store, 'record_sale', return_value=False), patch('sys.stdout', new=StringIO()) as output:
+            sp.make_sale(['Tea'], ['Sugar'])
+        self.assertIn('Sale was not fully recorded, your sales records may be incomplete.', output.getvalue())
+
+    def test_sp_journal_backend_converts_records_file(self):
+        sp = Salesperson('John', 'Salesperson', ['Tea'], ['Sugar'], 'journal')
+        self.addCleanup(lambda: [os.remove(f) for f in (sp.journal_file, sp.journal_file[:-4] + '.items')])
+        self.assertEqual(980, sp.total_sales_amount())
+        with patch('sys.stdout', new=StringIO()) as actual_output:
+            sp.view_records()
+        self.assertEqual('Beverage: tea. Price: 4.0$\n\nBeverage: water. Price: 4.3$\n\n'
+                         'Addition: sugar. Price: 1.5$\n\n', actual_output.getvalue())
+
+    def test_sp_unsupported_records_backend(self):
+        with self.assertRaises(ValueError):
+            Salesperson('John', 'Salesperson', ['Tea'], ['Sugar'], 'xml')
+
     @mock.patch('builtins.input', create=True)
     def test_sp_add_beverage(self, mocked_input):
         mocked_input.side_effect = ['cOfFeE', 2]
@@ -111,7 +195,7 @@ class SalespersonTest(TestCase):
 
     def test_sp_total_sales_amount(self):
         total_amount = self.sp.total_sales_amount()
-        self.assertEqual(9.8, total_amount)
+        self.assertEqual(980, total_amount)
 
     def test_sp_count_sales(self):
         sales_number = self.sp.count_sales()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+from unittest import TestCase
+from unittest.mock import patch
+from coffee_for_me.store.sqlite_store import SqliteStore
+from coffee_for_me.functions.db_funcs import view_sales_in_period
+from coffee_for_me.functions.connection_pool import close_pools
+import os
+import shutil
+
+
+class SqliteStoreTest(TestCase):
+
+    def setUp(self):
+        self.store = SqliteStore()
+        self.store.setup()
+
+    def tearDown(self):
+        self.store.close()
+        close_pools()
+        for f in ('employees.db', 'test_sqlite_store.csv'):
+            if os.path.exists(f):
+                os.remove(f)
+        shutil.rmtree('salesperson_records', ignore_errors=True)
+
+    def test_record_sale(self):
+        records = ['Beverage: tea. Price: 4.0$', 'Addition: milk. Price: 1.5$']
+        self.assertTrue(self.store.record_sale('Tony Ynot', records, '2020-01-02 10:00:00.000'))
+        with open(SqliteStore.records_file('Tony Ynot')) as f:
+            self.assertEqual('Beverage: tea. Price: 4.0$\nAddition: milk. Price: 1.5$\n', f.read())
+        self.assertEqual([(1, 'Tony Ynot', 2, 550)], self.store.sales_table())
+        self.assertEqual([('Tony Ynot', '2020-01-02 10:00:00.000', 'beverage', 'tea', 400),
+                          ('Tony Ynot', '2020-01-02 10:00:00.000', 'addition', 'milk', 150)],
+                         view_sales_in_period('2020-01-01', '2020-01-03'))
+
+    def test_record_sales_writes_records_once_per_salesperson(self):
+        self.store.record_sales([('Tony Ynot', ['Beverage: tea. Price: 4.0$'], None),
+                                 ('Liza Azil', ['Beverage: coffee. Price: 3.0$'], None),
+                                 ('Tony Ynot', ['Beverage: water. Price: 1.0$'], None)])
+        self.assertEqual(['Beverage: tea. Price: 4.0$', 'Beverage: water. Price: 1.0$'],
+                         list(self.store.salesperson_records('Tony Ynot')))
+        totals = self.store.salesperson_totals('Tony Ynot')
+        self.assertEqual((2, 500), (totals['beverages'], totals['amount_cents']))
+        self.assertEqual([(1, 'Tony Ynot', 2, 500), (2, 'Liza Azil', 1, 300)], self.store.sales_table())
+
+    def test_record_sales_partly_if_records_file_is_not_written(self):
+        os.makedirs(SqliteStore.records_file('Liza Azil'))  # records file path is a directory
+        self.assertFalse(self.store.record_sales([('Tony Ynot', ['Beverage: tea. Price: 4.0$'], None),
+                                                  ('Liza Azil', ['Beverage: coffee. Price: 3.0$'], None)]))
+        self.assertEqual(['Beverage: tea. Price: 4.0$'], list(self.store.salesperson_records('Tony Ynot')))
+        self.assertEqual([(1, 'Tony Ynot', 1, 400), (2, 'Liza Azil', 1, 300)], self.store.sales_table())
+
+    def test_record_sales_database_not_available(self):
+        with patch('coffee_for_me.store.sqlite_store.record_sales_batch', return_value=False), \
+                self.assertRaises(IOError):
+            self.store.record_sales([('Tony Ynot', ['Beverage: tea. Price: 4.0$'], None)])
+        self.assertFalse(os.path.exists(SqliteStore.records_file('Tony Ynot')), '\nRecords file should not be written')
+
+    def test_invalid_sale_fails_batch_before_anything_is_written(self):
+        store = SqliteStore('journal')
+        sale = ('Ann Nna', ['Beverage: tea. Price: 4.0$'], '2020-01-02 10:00:00.000')
+        for invalid_sale in (('Tony Ynot', ['Beverage: te\ra. Price: 4.0$'], None),
+                             ('Tony Ynot', ['Beverage: tea. Price: 4.0$'], 'garbage')):
+            with self.assertRaises(ValueError):
+                store.record_sales([sale, invalid_sale])
+        self.assertTrue(store.record_sales([sale]), '\nSale should be stored again without duplicates')
+        self.assertEqual({'sales': 1, 'beverages': 1, 'additions': 0, 'amount_cents': 400},
+                         store.salesperson_totals('Ann Nna'))
+        self.assertEqual([(1, 'Ann Nna', 1, 400)], store.sales_table())
+
+    def test_journal_records_backend(self):
+        store = SqliteStore('journal')
+        store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$', 'Addition: milk. Price: 1.5$'])
+        self.assertFalse(os.path.exists(SqliteStore.records_file('Tony Ynot')))
+        self.assertEqual({'sales': 1, 'beverages': 1, 'additions': 1, 'amount_cents': 550},
+                         store.salesperson_totals('Tony Ynot'))
+        self.assertEqual(['Beverage: tea. Price: 4.0$', 'Addition: milk. Price: 1.5$'],
+                         list(store.salesperson_records('Tony Ynot')))
+
+    def test_unsupported_records_backend(self):
+        with self.assertRaises(ValueError):
+            SqliteStore('xml')
+
+    def test_data_version_changes_on_write(self):
+        version = self.store.data_version()
+        self.assertEqual(version, self.store.data_version())
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        self.assertNotEqual(version, self.store.data_version())
+
+    def test_export(self):
+        self.store.record_sale('Tony Ynot', ['Beverage: tea. Price: 4.0$'])
+        self.store.export({'csv': 'test_sqlite_store.csv'})
+        with open('test_sqlite_store.csv') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(['Tony Ynot', '1', '4.0'], lines[-1].split(',')[1:])